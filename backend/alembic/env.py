@@ -1,3 +1,4 @@
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -19,6 +20,17 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+# monthly + default partitions of brief_runs (migration 37d63e364c59, app.services.brief_archive):
+# created at runtime, never part of the models
+_BRIEF_RUN_PARTITION = re.compile(r"brief_runs_(\d{4}_\d{2}|default)")
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    if type_ == "table" and reflected and compare_to is None and _BRIEF_RUN_PARTITION.fullmatch(name):
+        return False
+    return True
+
+
 def get_url() -> str:
     return get_settings().database_url
 
@@ -31,6 +43,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -50,6 +63,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,118 @@
+"""Partition brief_runs by created_at month and add archive columns
+
+Revision ID: 37d63e364c59
+Revises: 59f783517788
+Create Date: 2026-10-19 16:41:52.730615
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '37d63e364c59'
+down_revision: Union[str, Sequence[str], None] = '59f783517788'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# partitions created beyond the current month; later ones come from the archive job
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id, project_id, request_json, response_json, model, status, error_message, "
+    "prompt_version, input_tokens, cached_tokens, output_tokens, total_tokens, "
+    "latency_ms, estimated_cost_usd, repair_status, repair_tokens, created_at"
+)
+
+
+def _add_months(month: date, n: int) -> date:
+    y, m = divmod(month.month - 1 + n, 12)
+    return date(month.year + y, m + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # a partitioned table can't be the target of a foreign key on id alone
+    op.drop_constraint('cover_images_brief_run_id_fkey', 'cover_images', type_='foreignkey')
+    op.drop_constraint('brief_directions_brief_run_id_fkey', 'brief_directions', type_='foreignkey')
+
+    op.execute("ALTER TABLE brief_runs RENAME TO brief_runs_unpartitioned")
+    op.execute("ALTER TABLE brief_runs_unpartitioned RENAME CONSTRAINT brief_runs_pkey TO brief_runs_unpartitioned_pkey")
+    op.drop_index('ix_brief_runs_project_id', table_name='brief_runs_unpartitioned')
+    op.drop_index('ix_brief_runs_created_at', table_name='brief_runs_unpartitioned')
+
+    op.execute(
+        """
+        CREATE TABLE brief_runs (
+            LIKE brief_runs_unpartitioned INCLUDING DEFAULTS,
+            archive_segment TEXT,
+            archive_offset BIGINT,
+            archive_length INTEGER,
+            archived_at TIMESTAMP WITH TIME ZONE,
+            PRIMARY KEY (id, created_at),
+            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.alter_column('brief_runs', 'request_json', nullable=True)
+    op.alter_column('brief_runs', 'response_json', nullable=True)
+    op.create_index('ix_brief_runs_project_id', 'brief_runs', ['project_id'], unique=False)
+    op.create_index('ix_brief_runs_created_at', 'brief_runs', ['created_at'], unique=False)
+
+    # one partition per month from the oldest run through MONTHS_AHEAD, plus a catch-all
+    oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM brief_runs_unpartitioned")).scalar()
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    month = (oldest.astimezone(timezone.utc).date() if oldest else this_month).replace(day=1)
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        upper = _add_months(month, 1)
+        # explicit UTC bounds (same as app.services.brief_archive.partition_bound), not session-TimeZone dates
+        op.execute(
+            f"CREATE TABLE brief_runs_{month:%Y_%m} PARTITION OF brief_runs "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') TO ('{upper:%Y-%m-%d} 00:00:00+00')"
+        )
+        month = upper
+    op.execute("CREATE TABLE brief_runs_default PARTITION OF brief_runs DEFAULT")
+
+    op.execute(f"INSERT INTO brief_runs ({COLUMNS}) SELECT {COLUMNS} FROM brief_runs_unpartitioned")
+    op.drop_table('brief_runs_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    archived = op.get_bind().execute(sa.text("SELECT count(*) FROM brief_runs WHERE archived_at IS NOT NULL")).scalar()
+    if archived:
+        raise RuntimeError(
+            f"{archived} brief runs are archived; restore them (python -m app.services.brief_archive --restore) first"
+        )
+
+    op.execute("ALTER TABLE brief_runs RENAME TO brief_runs_partitioned")
+    op.execute("ALTER TABLE brief_runs_partitioned RENAME CONSTRAINT brief_runs_pkey TO brief_runs_partitioned_pkey")
+    op.drop_index('ix_brief_runs_project_id', table_name='brief_runs_partitioned')
+    op.drop_index('ix_brief_runs_created_at', table_name='brief_runs_partitioned')
+    op.execute(
+        """
+        CREATE TABLE brief_runs (
+            LIKE brief_runs_partitioned INCLUDING DEFAULTS,
+            PRIMARY KEY (id),
+            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
+        )
+        """
+    )
+    for column in ('archive_segment', 'archive_offset', 'archive_length', 'archived_at'):
+        op.drop_column('brief_runs', column)
+    op.execute(f"INSERT INTO brief_runs ({COLUMNS}) SELECT {COLUMNS} FROM brief_runs_partitioned")
+    op.alter_column('brief_runs', 'request_json', nullable=False)
+    op.alter_column('brief_runs', 'response_json', nullable=False)
+    op.create_index('ix_brief_runs_project_id', 'brief_runs', ['project_id'], unique=False)
+    op.create_index('ix_brief_runs_created_at', 'brief_runs', ['created_at'], unique=False)
+    op.execute("DROP TABLE brief_runs_partitioned")  # drops its partitions too
+
+    op.create_foreign_key(
+        'brief_directions_brief_run_id_fkey', 'brief_directions', 'brief_runs', ['brief_run_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'cover_images_brief_run_id_fkey', 'cover_images', 'brief_runs', ['brief_run_id'], ['id'], ondelete='SET NULL'
+    )
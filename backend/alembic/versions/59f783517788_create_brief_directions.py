@@ -0,0 +1,75 @@
+"""Create brief_directions and link cover_images to them
+
+Revision ID: 59f783517788
+Revises: d231f5844305
+Create Date: 2026-10-19 16:24:10.583102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '59f783517788'
+down_revision: Union[str, Sequence[str], None] = 'd231f5844305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIRECTION_FIELDS = ('name', 'one_liner', 'imagery', 'typography', 'color_palette', 'layout_notes', 'avoid', 'image_prompt')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'brief_directions',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('brief_run_id', sa.UUID(), nullable=False),
+        sa.Column('project_id', sa.UUID(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        *(sa.Column(f, sa.Text(), nullable=False) for f in DIRECTION_FIELDS),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['brief_run_id'], ['brief_runs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('brief_run_id', 'position', name='uq_brief_directions_run_position'),
+    )
+    op.create_index(op.f('ix_brief_directions_project_id'), 'brief_directions', ['project_id'], unique=False)
+
+    op.add_column('cover_images', sa.Column('brief_direction_id', sa.UUID(), nullable=True))
+    op.create_index(op.f('ix_cover_images_brief_direction_id'), 'cover_images', ['brief_direction_id'], unique=False)
+    op.create_foreign_key(
+        'cover_images_brief_direction_id_fkey', 'cover_images', 'brief_directions', ['brief_direction_id'], ['id'], ondelete='SET NULL'
+    )
+
+    # backfill: one row per element of each successful run's response_json.directions
+    fields = ', '.join(DIRECTION_FIELDS)
+    values = ', '.join(f"coalesce(d.value->>'{f}', '')" for f in DIRECTION_FIELDS)
+    op.execute(
+        f"""
+        INSERT INTO brief_directions (id, brief_run_id, project_id, position, {fields}, created_at)
+        SELECT gen_random_uuid(), r.id, r.project_id, d.ordinality - 1, {values}, r.created_at
+        FROM brief_runs r
+        CROSS JOIN LATERAL jsonb_array_elements(r.response_json->'directions') WITH ORDINALITY AS d(value, ordinality)
+        WHERE r.status = 'success' AND jsonb_typeof(r.response_json->'directions') = 'array'
+        """
+    )
+    # images whose direction_index points at a real direction get the foreign key
+    op.execute(
+        """
+        UPDATE cover_images c
+        SET brief_direction_id = d.id
+        FROM brief_directions d
+        WHERE d.brief_run_id = c.brief_run_id AND d.position = c.direction_index
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('cover_images_brief_direction_id_fkey', 'cover_images', type_='foreignkey')
+    op.drop_index(op.f('ix_cover_images_brief_direction_id'), table_name='cover_images')
+    op.drop_column('cover_images', 'brief_direction_id')
+    op.drop_index(op.f('ix_brief_directions_project_id'), table_name='brief_directions')
+    op.drop_table('brief_directions')
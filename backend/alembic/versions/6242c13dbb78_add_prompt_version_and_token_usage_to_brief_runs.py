@@ -0,0 +1,34 @@
+"""Add prompt version and token usage to brief_runs
+
+Revision ID: 6242c13dbb78
+Revises: 65c172ef84ff
+Create Date: 2026-10-19 11:20:05.617342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6242c13dbb78'
+down_revision: Union[str, Sequence[str], None] = '65c172ef84ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('brief_runs', sa.Column('prompt_version', sa.String(length=32), nullable=True))
+    op.add_column('brief_runs', sa.Column('input_tokens', sa.Integer(), nullable=True))
+    op.add_column('brief_runs', sa.Column('cached_tokens', sa.Integer(), nullable=True))
+    op.add_column('brief_runs', sa.Column('total_tokens', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('brief_runs', 'total_tokens')
+    op.drop_column('brief_runs', 'cached_tokens')
+    op.drop_column('brief_runs', 'input_tokens')
+    op.drop_column('brief_runs', 'prompt_version')
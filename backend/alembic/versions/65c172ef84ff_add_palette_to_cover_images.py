@@ -0,0 +1,28 @@
+"""Add palette to cover_images
+
+Revision ID: 65c172ef84ff
+Revises: 6cd082a32189
+Create Date: 2026-10-19 10:02:47.903115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '65c172ef84ff'
+down_revision: Union[str, Sequence[str], None] = '6cd082a32189'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cover_images', sa.Column('palette', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cover_images', 'palette')
@@ -0,0 +1,28 @@
+"""Add phash to cover_images
+
+Revision ID: 6cd082a32189
+Revises: 7d9ecfba01fe
+Create Date: 2026-10-19 09:12:31.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6cd082a32189'
+down_revision: Union[str, Sequence[str], None] = '7d9ecfba01fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cover_images', sa.Column('phash', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cover_images', 'phash')
@@ -0,0 +1,35 @@
+"""Add model routing columns to brief_runs and cover_images
+
+Revision ID: abc750ab0b37
+Revises: 37d63e364c59
+Create Date: 2026-10-19 17:28:06.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'abc750ab0b37'
+down_revision: Union[str, Sequence[str], None] = '37d63e364c59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # brief_runs is partitioned: columns added to the parent reach every partition
+    op.add_column('brief_runs', sa.Column('requested_model', sa.String(length=100), nullable=True))
+    op.add_column('brief_runs', sa.Column('route_reason', sa.String(length=20), nullable=True))
+    op.add_column('cover_images', sa.Column('requested_model', sa.String(length=64), nullable=True))
+    op.add_column('cover_images', sa.Column('route_reason', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cover_images', 'route_reason')
+    op.drop_column('cover_images', 'requested_model')
+    op.drop_column('brief_runs', 'route_reason')
+    op.drop_column('brief_runs', 'requested_model')
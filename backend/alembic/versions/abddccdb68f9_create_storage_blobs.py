@@ -0,0 +1,39 @@
+"""Create storage_blobs and cover_images.content_hash
+
+Revision ID: abddccdb68f9
+Revises: ca8566e9a174
+Create Date: 2026-10-19 14:58:36.104457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'abddccdb68f9'
+down_revision: Union[str, Sequence[str], None] = 'ca8566e9a174'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('storage_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('path', sa.Text(), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    op.add_column('cover_images', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_cover_images_content_hash'), 'cover_images', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cover_images_content_hash'), table_name='cover_images')
+    op.drop_column('cover_images', 'content_hash')
+    op.drop_table('storage_blobs')
@@ -0,0 +1,52 @@
+"""Add call telemetry columns
+
+Revision ID: ca8566e9a174
+Revises: db54bf952643
+Create Date: 2026-10-19 13:41:12.552804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ca8566e9a174'
+down_revision: Union[str, Sequence[str], None] = 'db54bf952643'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('brief_runs', sa.Column('output_tokens', sa.Integer(), nullable=True))
+    op.add_column('brief_runs', sa.Column('latency_ms', sa.Integer(), nullable=True))
+    op.add_column('brief_runs', sa.Column('estimated_cost_usd', sa.Numeric(precision=12, scale=6), nullable=True))
+
+    op.add_column('cover_images', sa.Column('latency_ms', sa.Integer(), nullable=True))
+    op.add_column('cover_images', sa.Column('input_tokens', sa.Integer(), nullable=True))
+    op.add_column('cover_images', sa.Column('output_tokens', sa.Integer(), nullable=True))
+    op.add_column('cover_images', sa.Column('cached_tokens', sa.Integer(), nullable=True))
+    op.add_column('cover_images', sa.Column('image_bytes', sa.Integer(), nullable=True))
+    op.add_column('cover_images', sa.Column('estimated_cost_usd', sa.Numeric(precision=12, scale=6), nullable=True))
+
+    op.create_index('ix_brief_runs_created_at', 'brief_runs', ['created_at'], unique=False)
+    op.create_index('ix_cover_images_created_at', 'cover_images', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cover_images_created_at', table_name='cover_images')
+    op.drop_index('ix_brief_runs_created_at', table_name='brief_runs')
+
+    op.drop_column('cover_images', 'estimated_cost_usd')
+    op.drop_column('cover_images', 'image_bytes')
+    op.drop_column('cover_images', 'cached_tokens')
+    op.drop_column('cover_images', 'output_tokens')
+    op.drop_column('cover_images', 'input_tokens')
+    op.drop_column('cover_images', 'latency_ms')
+
+    op.drop_column('brief_runs', 'estimated_cost_usd')
+    op.drop_column('brief_runs', 'latency_ms')
+    op.drop_column('brief_runs', 'output_tokens')
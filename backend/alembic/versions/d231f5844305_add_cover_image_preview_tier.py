@@ -0,0 +1,38 @@
+"""Add cover_images quality, tier and preview_image_id
+
+Revision ID: d231f5844305
+Revises: ae0eac4bd3b4
+Create Date: 2026-10-19 16:07:45.219384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd231f5844305'
+down_revision: Union[str, Sequence[str], None] = 'ae0eac4bd3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cover_images', sa.Column('quality', sa.String(length=20), nullable=True))
+    op.add_column('cover_images', sa.Column('tier', sa.String(length=20), nullable=True))
+    op.add_column('cover_images', sa.Column('preview_image_id', sa.UUID(), nullable=True))
+    op.create_index(op.f('ix_cover_images_preview_image_id'), 'cover_images', ['preview_image_id'], unique=False)
+    op.create_foreign_key(
+        'cover_images_preview_image_id_fkey', 'cover_images', 'cover_images', ['preview_image_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('cover_images_preview_image_id_fkey', 'cover_images', type_='foreignkey')
+    op.drop_index(op.f('ix_cover_images_preview_image_id'), table_name='cover_images')
+    op.drop_column('cover_images', 'preview_image_id')
+    op.drop_column('cover_images', 'tier')
+    op.drop_column('cover_images', 'quality')
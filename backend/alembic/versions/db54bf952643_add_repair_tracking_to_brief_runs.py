@@ -0,0 +1,30 @@
+"""Add repair tracking to brief_runs
+
+Revision ID: db54bf952643
+Revises: 6242c13dbb78
+Create Date: 2026-10-19 12:04:51.220397
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'db54bf952643'
+down_revision: Union[str, Sequence[str], None] = '6242c13dbb78'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('brief_runs', sa.Column('repair_status', sa.String(length=20), nullable=True))
+    op.add_column('brief_runs', sa.Column('repair_tokens', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('brief_runs', 'repair_tokens')
+    op.drop_column('brief_runs', 'repair_status')
@@ -0,0 +1,4 @@
+import time
+
+# `import app.main` imports this package before anything else: the zero point of app.startup.StartupTimings
+IMPORT_STARTED = time.perf_counter()
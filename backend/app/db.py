@@ -1,13 +1,48 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.settings import get_settings
 
-settings = get_settings()
+# Created on first use (or in the app lifespan hook), not at import time, so
+# importing app modules stays cheap for workers and test collection.
+_engine: Engine | None = None
+_session_factory: sessionmaker[Session] | None = None
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+def get_engine() -> Engine:
+    global _engine, _session_factory
+    if _engine is None:
+        settings = get_settings()
+        _engine = create_engine(settings.database_url, pool_pre_ping=True)
+        _session_factory = sessionmaker(bind=_engine, autoflush=False, autocommit=False)
+    return _engine
+
+
+def SessionLocal() -> Session:
+    get_engine()
+    return _session_factory()
+
+
+def prewarm_pool(connections: int) -> None:
+    """Open (and return to the pool) up to `connections` connections ahead of the first request."""
+    engine = get_engine()
+    conns = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            conns.append(conn)
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def dispose_engine() -> None:
+    global _engine, _session_factory
+    if _engine is not None:
+        _engine.dispose()
+    _engine = None
+    _session_factory = None
 
 
 def get_db():
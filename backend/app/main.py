@@ -1,15 +1,68 @@
+import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
+from app import IMPORT_STARTED
+from app.db import dispose_engine, get_engine, prewarm_pool
+from app.profiling import ProfilingMiddleware
+from app.services.deadlines import DeadlineExceeded, DeadlineMiddleware, RequestCancelled
 from app.settings import get_settings
+from app.routes.analytics import router as analytics_router
 from app.routes.cover import router as cover_router
+from app.routes.directions import router as directions_router
 from app.routes.projects import router as projects_router
+from app.startup import FirstRequestMiddleware, StartupTimings, now
+
+_timings = StartupTimings(import_started=IMPORT_STARTED)
+
+
+def _prewarm_schemas(app: FastAPI) -> None:
+    from app.schemas.cover_brief import CoverBriefDirections
+
+    app.openapi()
+    # first validation through pydantic-core builds its validators lazily
+    CoverBriefDirections.model_validate({"directions": []})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    timings: StartupTimings = app.state.startup_timings
+    timings.lifespan_started = now()
+
+    # engine (and pool) is created here instead of at import time
+    t = now()
+    get_engine()
+    timings.prewarm["engine"] = now() - t
+
+    if settings.prewarm_db_connections > 0:
+        t = now()
+        prewarm_pool(settings.prewarm_db_connections)
+        timings.prewarm["db_pool"] = now() - t
+
+    if settings.prewarm_schemas:
+        t = now()
+        _prewarm_schemas(app)
+        timings.prewarm["schemas"] = now() - t
+
+    timings.lifespan_ready = now()
+    try:
+        yield
+    finally:
+        if "app.services.print_export" in sys.modules:
+            sys.modules["app.services.print_export"].get_print_queue().shutdown()
+        if "app.services.speculative" in sys.modules:
+            sys.modules["app.services.speculative"].get_speculative_previews().shutdown()
+        dispose_engine()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
 
-    app = FastAPI(title="Cover Builder API")
+    app = FastAPI(title="Cover Builder API", lifespan=lifespan)
+    app.state.startup_timings = _timings
 
     # --- storage + static files ---
     storage_root = Path(settings.storage_dir)
@@ -19,11 +72,41 @@ def create_app() -> FastAPI:
     # --- routers ---
     app.include_router(projects_router)
     app.include_router(cover_router)
+    app.include_router(analytics_router)
+    app.include_router(directions_router)
+
+    # pure ASGI middleware: no per-request task/stream wrapping
+    app.add_middleware(FirstRequestMiddleware, timings=_timings)
+    if settings.profile_debug_token or settings.profile_sample_rate > 0:
+        app.add_middleware(
+            ProfilingMiddleware,
+            storage_root=storage_root,
+            interval_ms=settings.profile_interval_ms,
+            sample_rate=settings.profile_sample_rate,
+            debug_token=settings.profile_debug_token,
+        )
+
+    # outermost: the deadline and disconnect flag cover everything below
+    app.add_middleware(DeadlineMiddleware, max_seconds=settings.request_timeout_max_s)
+
+    @app.exception_handler(DeadlineExceeded)
+    async def deadline_exceeded(request: Request, exc: DeadlineExceeded):
+        return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+    @app.exception_handler(RequestCancelled)
+    async def request_cancelled(request: Request, exc: RequestCancelled):
+        # nobody is listening any more; 499 is the de-facto "client closed request"
+        return JSONResponse(status_code=499, content={"detail": str(exc)})
 
     @app.get("/health")
     def health():
         return {"status": "ok", "environment": settings.app_env}
 
+    @app.get("/health/startup")
+    def health_startup():
+        return _timings.as_dict(settings.startup_target_ms)
+
+    _timings.app_created = now()
     return app
 
 
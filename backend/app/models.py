@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, Numeric, String, Text, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -26,6 +26,13 @@ class Project(Base):
 
 
 class BriefRun(Base):
+    """
+    In Postgres this table is range-partitioned by created_at month, so its
+    primary key is (id, created_at) and no foreign key can point at it:
+    CoverImage.brief_run_id and BriefDirection.brief_run_id are plain columns
+    with explicit joins, kept consistent by the application.
+    """
+
     __tablename__ = "brief_runs"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -37,17 +44,90 @@ class BriefRun(Base):
         index=True,
     )
 
-    request_json: Mapped[dict] = mapped_column(JSONB, nullable=False)
-    response_json: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # NULL once the run's month is archived; read through app.services.brief_archive.load_run_json
+    request_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    response_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     model: Mapped[str] = mapped_column(String(100), nullable=False)
+    # adaptive model routing (app.services.model_routing): the default model and why `model` was used
+    # instead ("default", "pinned", "latency", "errors", "best_effort"); NULL = routing off / stub
+    requested_model: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    route_reason: Mapped[str | None] = mapped_column(String(20), nullable=True)
     status: Mapped[str] = mapped_column(String(30), nullable=False, default="success")
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # prompt template version + provider token usage (cached_tokens = prompt-cache hits)
+    prompt_version: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    input_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cached_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    output_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    total_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # wall-clock time of the model call(s), incl. any repair pass, and estimated spend
+    latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    estimated_cost_usd: Mapped[float | None] = mapped_column(Numeric(12, 6), nullable=True)
+
+    # structured-output repair pass: None = not needed, "repaired" or "failed"
+    repair_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    repair_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # cold-storage copy of request_json/response_json: segment file (relative to storage_dir) + byte range
+    archive_segment: Mapped[str | None] = mapped_column(Text, nullable=True)
+    archive_offset: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    archive_length: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
 
     project: Mapped["Project"] = relationship(back_populates="brief_runs")
-    cover_images: Mapped[list["CoverImage"]] = relationship(back_populates="brief_run")
+    cover_images: Mapped[list["CoverImage"]] = relationship(
+        back_populates="brief_run",
+        primaryjoin="BriefRun.id == foreign(CoverImage.brief_run_id)",
+    )
+    directions: Mapped[list["BriefDirection"]] = relationship(
+        back_populates="brief_run",
+        primaryjoin="BriefRun.id == foreign(BriefDirection.brief_run_id)",
+        cascade="all, delete-orphan",
+        order_by="BriefDirection.position",
+    )
+
+
+class BriefDirection(Base):
+    """One direction of a successful brief run (the rows behind response_json["directions"])."""
+
+    __tablename__ = "brief_directions"
+    __table_args__ = (UniqueConstraint("brief_run_id", "position", name="uq_brief_directions_run_position"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    brief_run_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)  # -> brief_runs.id
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # index into the run's directions list (what CoverImage.direction_index refers to)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+    one_liner: Mapped[str] = mapped_column(Text, nullable=False)
+    imagery: Mapped[str] = mapped_column(Text, nullable=False)
+    typography: Mapped[str] = mapped_column(Text, nullable=False)
+    color_palette: Mapped[str] = mapped_column(Text, nullable=False)
+    layout_notes: Mapped[str] = mapped_column(Text, nullable=False)
+    avoid: Mapped[str] = mapped_column(Text, nullable=False)
+    image_prompt: Mapped[str] = mapped_column(Text, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    brief_run: Mapped["BriefRun"] = relationship(
+        back_populates="directions", primaryjoin="BriefRun.id == foreign(BriefDirection.brief_run_id)"
+    )
+    cover_images: Mapped[list["CoverImage"]] = relationship(back_populates="brief_direction")
 
 
 class CoverImage(Base):
@@ -62,23 +142,94 @@ class CoverImage(Base):
         nullable=False,
     )
 
-    brief_run_id: Mapped[uuid.UUID | None] = mapped_column(
+    # -> brief_runs.id (no FK: brief_runs is partitioned)
+    brief_run_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), index=True, nullable=True)
+
+    direction_index: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    brief_direction_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("brief_runs.id", ondelete="SET NULL"),
+        ForeignKey("brief_directions.id", ondelete="SET NULL"),
         index=True,
         nullable=True,
     )
 
-    direction_index: Mapped[int | None] = mapped_column(Integer, nullable=True)
-
     prompt: Mapped[str] = mapped_column(Text, nullable=False)
     model: Mapped[str] = mapped_column(String(64), nullable=False)
+    requested_model: Mapped[str | None] = mapped_column(String(64), nullable=True)  # see BriefRun.route_reason
+    route_reason: Mapped[str | None] = mapped_column(String(20), nullable=True)
     size: Mapped[str] = mapped_column(String(32), nullable=False)
+    quality: Mapped[str | None] = mapped_column(String(20), nullable=True)  # None = provider default
 
-    # local storage path relative to /static mount, e.g. "images/<project>/<id>.png"
+    # "preview" (small/low quality), "speculative" (preview generated in the background after a brief),
+    # "final" (finalized from a preview), None = generated at full settings
+    tier: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    preview_image_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("cover_images.id", ondelete="SET NULL"),
+        index=True,
+        nullable=True,
+    )
+
+    # local storage path relative to /static mount, e.g. "blobs/ab/cd/<sha256>.png"
+    # (older rows: "images/<project>/<id>.png" until storage dedup migrates them)
     image_path: Mapped[str] = mapped_column(Text, nullable=False)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # sha256 of the file bytes -> storage_blobs.sha256 (None for not-yet-deduplicated rows)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+
+    # 64-bit perceptual (difference) hash of the image, for near-duplicate detection
+    phash: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    # dominant colors, heaviest first: [{"hex": "#rrggbb", "weight": 0.42}, ...]
+    palette: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+
+    # telemetry for the generation call; a call producing n images splits tokens/cost across its rows
+    latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    input_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    output_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cached_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    image_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    estimated_cost_usd: Mapped[float | None] = mapped_column(Numeric(12, 6), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
 
     project: Mapped["Project"] = relationship(back_populates="cover_images")
-    brief_run: Mapped["BriefRun | None"] = relationship(back_populates="cover_images")
+    brief_run: Mapped["BriefRun | None"] = relationship(
+        back_populates="cover_images", primaryjoin="BriefRun.id == foreign(CoverImage.brief_run_id)"
+    )
+    brief_direction: Mapped["BriefDirection | None"] = relationship(back_populates="cover_images")
+
+
+class StorageBlob(Base):
+    """Content-addressed image file shared by every CoverImage with identical bytes."""
+
+    __tablename__ = "storage_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # relative to storage_dir, e.g. "blobs/ab/cd/<sha256>.png"
+    path: Mapped[str] = mapped_column(Text, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    # incremented on save; reconciled against cover_images by storage maintenance
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class IdempotencyKey(Base):
+    """Client-supplied Idempotency-Key for a generation endpoint and the response it produced."""
+
+    __tablename__ = "idempotency_keys"
+
+    scope: Mapped[str] = mapped_column(String(50), primary_key=True)  # e.g. "cover.brief"
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    # sha256 of the request body (+ stub/real mode); a reused key with a different body is rejected
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # in_progress | completed
+    response_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,366 @@
+"""
+On-demand request profiling: a sampling profiler plus a span breakdown.
+
+A profiled request gets a sampler thread that snapshots, at a fixed interval,
+the stacks of the threads working for that request, and a span collector that
+times DB statements (SQLAlchemy cursor events) and upstream OpenAI calls. The
+profile travels with the request through a ContextVar, which Starlette copies
+into threadpool workers; code running for the request in another thread
+registers that thread for as long as it runs (request_thread()): the handler
+on the event loop, sync endpoints (ProfiledRoute) and pool-submitted work
+(in_request_thread). Other threads, including other requests' workers, are not
+sampled. The event loop is shared, so concurrent async code can still show up
+under it. Idle stacks (threads parked in threading/queue/selector waits) are
+dropped.
+
+Output, under storage_dir/profiles/<YYYYMMDD>/<HHMMSS>_<METHOD>_<path>_<id>:
+    .svg     flamegraph
+    .folded  collapsed stacks (flamegraph.pl / speedscope input)
+    .json    request info + span breakdown (python vs db vs upstream)
+The id is returned to the client in the X-Profile-Id response header.
+
+Nothing here runs unless a request is selected for profiling: without a
+debug token or sample rate the middleware isn't installed, and unselected
+requests go straight through it.
+"""
+import functools
+import hmac
+import html
+import inspect
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+from uuid import uuid4
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+
+T = TypeVar("T")
+
+PROFILES_DIR = "profiles"
+
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    interval_s: float
+    id: str = field(default_factory=lambda: uuid4().hex[:12])
+    started: float = field(default_factory=time.perf_counter)
+    ended: float | None = None
+    spans: dict[str, list[float]] = field(default_factory=dict)  # kind -> [seconds, count]
+    stacks: Counter = field(default_factory=Counter)
+    samples: int = 0
+    status_code: int | None = None
+    # ident -> open request_thread() blocks; only these threads are sampled
+    threads: Counter = field(default_factory=Counter)
+    _threads_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def enter_thread(self, ident: int) -> None:
+        with self._threads_lock:
+            self.threads[ident] += 1
+
+    def exit_thread(self, ident: int) -> None:
+        with self._threads_lock:
+            self.threads[ident] -= 1
+            if self.threads[ident] <= 0:
+                del self.threads[ident]
+
+    def thread_idents(self) -> list[int]:
+        with self._threads_lock:
+            return list(self.threads)
+
+    def add_span(self, kind: str, seconds: float) -> None:
+        total = self.spans.setdefault(kind, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+
+    def breakdown(self) -> dict:
+        wall = (self.ended or time.perf_counter()) - self.started
+        spans = {k: {"ms": round(s * 1000, 2), "count": n} for k, (s, n) in sorted(self.spans.items())}
+        accounted = sum(s for s, _ in self.spans.values())
+        return {
+            "wall_ms": round(wall * 1000, 2),
+            "spans": spans,
+            # everything not in a timed span: Python work, serialization, framework overhead
+            "other_ms": round(max(wall - accounted, 0.0) * 1000, 2),
+        }
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("request_profile", default=None)
+
+
+@contextmanager
+def span(kind: str) -> Iterator[None]:
+    """Time a block into the current request's profile (no-op when not profiling)."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(kind, time.perf_counter() - started)
+
+
+@contextmanager
+def request_thread() -> Iterator[None]:
+    """Sample the calling thread into the current request's profile while inside the block."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    ident = threading.get_ident()
+    profile.enter_thread(ident)
+    try:
+        yield
+    finally:
+        profile.exit_thread(ident)
+
+
+def in_request_thread(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    fn wrapped in request_thread(), for work the request hands to another
+    thread. Run it in a copy of the request's context (contextvars.copy_context()).
+    """
+    if getattr(fn, "_request_thread", False):
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args: Any, **kwargs: Any) -> T:
+        with request_thread():
+            return fn(*args, **kwargs)
+
+    run._request_thread = True
+    return run
+
+
+class ProfiledRoute(APIRoute):
+    """
+    APIRoute whose sync endpoints register their threadpool worker with the
+    request's profile while they run (async endpoints run on the event loop,
+    which the profiling middleware registers).
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = in_request_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+# ---- DB spans ----------------------------------------------------------------
+
+_db_hooked: set[int] = set()
+
+
+def install_db_hooks(engine) -> None:
+    """Time cursor executions into the active profile. Installed on first use."""
+    if id(engine) in _db_hooked:
+        return
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("profile_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = _current.get()
+        starts = conn.info.get("profile_t0")
+        if profile is not None and starts:
+            profile.add_span("db", time.perf_counter() - starts.pop())
+
+    _db_hooked.add(id(engine))
+
+
+# ---- Sampling ----------------------------------------------------------------
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _sample_loop(profile: RequestProfile, stop: threading.Event) -> None:
+    names = {t.ident: t.name for t in threading.enumerate()}
+    while not stop.wait(profile.interval_s):
+        frames = sys._current_frames()
+        for ident in profile.thread_idents():
+            frame = frames.get(ident)
+            if frame is None or os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if ident not in names:
+                names = {t.ident: t.name for t in threading.enumerate()}
+            stack.append(f"thread {names.get(ident, ident)}")
+            profile.stacks[";".join(reversed(stack))] += 1
+        profile.samples += 1
+
+
+@contextmanager
+def profile_request(method: str, path: str, interval_ms: float) -> Iterator[RequestProfile]:
+    profile = RequestProfile(method=method, path=path, interval_s=interval_ms / 1000)
+    token = _current.set(profile)
+    stop = threading.Event()
+    sampler = threading.Thread(target=_sample_loop, args=(profile, stop), name="request-profiler", daemon=True)
+    sampler.start()
+    try:
+        with request_thread():
+            yield profile
+    finally:
+        stop.set()
+        sampler.join()
+        profile.ended = time.perf_counter()
+        _current.reset(token)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that carry `X-Debug-Profile: <debug_token>`
+    or win the sample_rate draw, until the response body is sent. The profile
+    id goes out in the X-Profile-Id header; files are written afterwards.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        storage_root: Path,
+        interval_ms: float,
+        sample_rate: float = 0.0,
+        debug_token: str | None = None,
+    ) -> None:
+        self.app = app
+        self.storage_root = storage_root
+        self.interval_ms = interval_ms
+        self.sample_rate = sample_rate
+        self.debug_token = debug_token.encode() if debug_token else None
+
+    def _selected(self, scope) -> bool:
+        if self.debug_token:
+            for name, value in scope.get("headers") or ():
+                if name == b"x-debug-profile":
+                    if hmac.compare_digest(value, self.debug_token):
+                        return True
+                    break
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        from app.db import get_engine
+
+        install_db_hooks(get_engine())
+        with profile_request(scope["method"], scope["path"], self.interval_ms) as profile:
+
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start":
+                    profile.status_code = message["status"]
+                    headers = [*message.get("headers", ()), (b"x-profile-id", profile.id.encode())]
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+        await run_in_threadpool(save_profile, profile, self.storage_root)
+
+
+# ---- Output ------------------------------------------------------------------
+
+
+def _render_svg(stacks: Counter, title: str, width: int = 1200, row_h: int = 16) -> str:
+    """Minimal flamegraph: root at the bottom, frame width proportional to samples."""
+    tree: dict = {}
+    for stack, n in stacks.items():
+        node = tree
+        for frame in stack.split(";"):
+            entry = node.setdefault(frame, [0, {}])
+            entry[0] += n
+            node = entry[1]
+
+    total = sum(stacks.values()) or 1
+    rects: list[tuple[float, int, float, str, int]] = []
+    max_depth = 0
+
+    def walk(node: dict, x: float, depth: int) -> None:
+        nonlocal max_depth
+        max_depth = max(max_depth, depth)
+        for name, (count, children) in sorted(node.items()):
+            w = count / total * width
+            if w >= 0.5:
+                rects.append((x, depth, w, name, count))
+                walk(children, x, depth + 1)
+            x += w
+
+    walk(tree, 0.0, 0)
+    height = (max_depth + 2) * row_h + 24
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="4" y="14">{html.escape(title)} — {total} samples</text>',
+    ]
+    for x, depth, w, name, count in rects:
+        y = height - (depth + 1) * row_h
+        hue = 20 + zlib.crc32(name.encode()) % 40
+        label = html.escape(name)
+        out.append(
+            f'<g><title>{label} ({count} samples, {count / total:.1%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_h - 1}" fill="hsl({hue},80%,60%)"/>'
+        )
+        if w > 40:
+            chars = int(w / 7)
+            text = label if len(name) <= chars else html.escape(name[: max(chars - 2, 0)]) + ".."
+            out.append(f'<text x="{x + 3:.1f}" y="{y + row_h - 4}">{text}</text>')
+        out.append("</g>")
+    out.append("</svg>")
+    return "\n".join(out)
+
+
+def save_profile(profile: RequestProfile, storage_root: Path) -> Path:
+    day = datetime.now(timezone.utc).strftime("%Y%m%d")
+    out_dir = storage_root / PROFILES_DIR / day
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", profile.path).strip("_")[:60] or "root"
+    base = out_dir / f"{datetime.now(timezone.utc):%H%M%S}_{profile.method}_{slug}_{profile.id}"
+
+    base.with_suffix(".folded").write_text(
+        "".join(f"{stack} {n}\n" for stack, n in profile.stacks.most_common()), encoding="utf-8"
+    )
+    base.with_suffix(".svg").write_text(
+        _render_svg(profile.stacks, f"{profile.method} {profile.path}"), encoding="utf-8"
+    )
+    base.with_suffix(".json").write_text(
+        json.dumps(
+            {
+                "id": profile.id,
+                "method": profile.method,
+                "path": profile.path,
+                "status_code": profile.status_code,
+                "interval_ms": profile.interval_s * 1000,
+                "samples": profile.samples,
+                **profile.breakdown(),
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    return base
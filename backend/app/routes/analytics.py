@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import String, cast, func, literal, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models import BriefRun, CoverImage
+from app.profiling import ProfiledRoute
+from app.settings import get_settings
+from app.schemas.analytics import (
+    CallStatsOut,
+    CallStatsRow,
+    HedgeModelLatency,
+    HedgeStatsOut,
+    RouteModelHealth,
+    RoutingStatsOut,
+)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"], route_class=ProfiledRoute)
+
+
+@router.get("/calls", response_model=CallStatsOut)
+def call_stats(
+    kind: Literal["brief", "image"] = "brief",
+    group_by: Literal["model", "day", "project", "route"] = "model",
+    days: int = Query(default=30, ge=1, le=365),
+    project_id: UUID | None = None,
+    db: Session = Depends(get_db),
+) -> CallStatsOut:
+    """
+    Latency percentiles, token totals and estimated spend per model / day /
+    project. Everything is aggregated in Postgres; rows never reach Python.
+    For images, cost per accepted cover is the group's whole image spend
+    (previews and rejected candidates included) over its finalized images.
+    """
+    source = BriefRun if kind == "brief" else CoverImage
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+
+    if group_by == "model":
+        key = source.model
+    elif group_by == "day":
+        # inline literal so SELECT and GROUP BY render the identical expression
+        key = func.date_trunc(literal_column("'day'"), source.created_at)
+    elif group_by == "route":
+        # routing decision ("default", "latency", ...); "unrouted" = routing off or stub
+        key = func.coalesce(source.route_reason, literal_column("'unrouted'"))
+    else:
+        key = source.project_id
+
+    latency = source.latency_ms
+    # images are only persisted on success
+    errors = func.count().filter(BriefRun.status == "error") if kind == "brief" else literal(0)
+
+    key_col = cast(key, String).label("key")
+    columns = [
+        key_col,
+        func.count().label("calls"),
+        errors.label("errors"),
+        func.percentile_cont(0.5).within_group(latency).label("p50"),
+        func.percentile_cont(0.95).within_group(latency).label("p95"),
+        func.coalesce(func.sum(source.input_tokens), 0).label("input_tokens"),
+        func.coalesce(func.sum(source.output_tokens), 0).label("output_tokens"),
+        func.coalesce(func.sum(source.cached_tokens), 0).label("cached_tokens"),
+        func.coalesce(func.sum(source.estimated_cost_usd), 0).label("cost"),
+    ]
+    if kind == "image":
+        columns.append(func.sum(CoverImage.image_bytes).label("image_bytes"))
+        # accepted covers: images finalized from a preview
+        columns.append(func.count().filter(CoverImage.tier == "final").label("accepted"))
+
+    stmt = select(*columns).where(source.created_at >= since).group_by(key_col).order_by(key_col)
+    if project_id is not None:
+        stmt = stmt.where(source.project_id == project_id)
+
+    rows = [
+        CallStatsRow(
+            key=r.key,
+            calls=r.calls,
+            errors=r.errors,
+            p50_latency_ms=r.p50,
+            p95_latency_ms=r.p95,
+            input_tokens=r.input_tokens,
+            output_tokens=r.output_tokens,
+            cached_tokens=r.cached_tokens,
+            image_bytes=getattr(r, "image_bytes", None),
+            estimated_cost_usd=float(r.cost),
+            cost_per_call_usd=float(r.cost) / r.calls if r.calls else None,
+            accepted_covers=getattr(r, "accepted", None),
+            cost_per_accepted_cover_usd=float(r.cost) / r.accepted if getattr(r, "accepted", None) else None,
+        )
+        for r in db.execute(stmt).all()
+    ]
+    return CallStatsOut(kind=kind, group_by=group_by, since=since, rows=rows)
+
+
+@router.get("/hedging", response_model=HedgeStatsOut)
+def hedging_stats() -> HedgeStatsOut:
+    """Hedge rate and duplicate-request spend for text calls, from this process's counters."""
+    from app.services.openai_client import hedge_stats, text_latency
+
+    settings = get_settings()
+    models = []
+    for model, n in sorted(text_latency.counts().items()):
+        p95 = text_latency.p95(model, settings.openai_hedge_min_samples)
+        models.append(
+            HedgeModelLatency(model=model, samples=n, p95_latency_ms=None if p95 is None else round(p95 * 1000, 1))
+        )
+    return HedgeStatsOut(enabled=settings.openai_hedge_text, models=models, **hedge_stats.snapshot())
+
+
+@router.get("/routing", response_model=RoutingStatsOut)
+def routing_stats() -> RoutingStatsOut:
+    """Recent per-model health seen by adaptive routing, and what it would pick now, in this process."""
+    from app.services.model_routing import image_router, text_router
+
+    settings = get_settings()
+    rules = {
+        "max_error_rate": settings.openai_route_max_error_rate,
+        "min_samples": settings.openai_route_min_samples,
+        "window_s": settings.openai_route_window_s,
+    }
+    models = []
+    for kind, router_ in (("text", text_router), ("image", image_router)):
+        for model, variant in router_.keys():
+            h = router_.health(model, settings.openai_route_window_s, variant)
+            models.append(
+                RouteModelHealth(
+                    kind=kind,
+                    model=model,
+                    variant=variant or None,
+                    samples=h.samples,
+                    error_rate=round(h.error_rate, 4),
+                    p95_latency_ms=None if h.p95_s is None else round(h.p95_s * 1000, 1),
+                )
+            )
+
+    text_route = text_router.choose(
+        settings.openai_text_model,
+        settings.openai_text_route_models,
+        slo_s=settings.openai_text_latency_slo_s,
+        **rules,
+    )
+    image_route = image_router.choose(
+        settings.image_model,
+        settings.openai_image_route_models,
+        slo_s=settings.openai_image_latency_slo_s,
+        variant=settings.image_quality or "",
+        **rules,
+    )
+    return RoutingStatsOut(
+        window_s=settings.openai_route_window_s,
+        text_slo_s=settings.openai_text_latency_slo_s,
+        image_slo_s=settings.openai_image_latency_slo_s,
+        text_model=text_route.model,
+        text_route_reason=text_route.reason,
+        image_model=image_route.model,
+        image_route_reason=image_route.reason,
+        models=models,
+    )
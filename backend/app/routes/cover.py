@@ -1,18 +1,43 @@
-import json
-from uuid import uuid4
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from uuid import UUID, uuid4
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.db import get_db
-from app.models import Project, BriefRun, CoverImage
-from app.schemas.cover_brief import CoverBriefRequest, CoverBriefResponse, CoverDirection
-from app.schemas.cover_image import CoverImageGenerateRequest, CoverImageGenerateResponse, CoverImageOut
+from app.db import SessionLocal, get_db
+from app.models import Project, BriefDirection, BriefRun, CoverImage
+from app.profiling import ProfiledRoute
+from app.schemas.cover_brief import CoverBriefDirections, CoverBriefRequest, CoverBriefResponse, CoverDirection
+from app.schemas.cover_image import (
+    CoverImageFinalizeRequest,
+    CoverImageGenerateRequest,
+    CoverImageGenerateResponse,
+    CoverImageOut,
+)
+from app.schemas.print_export import PrintExportOut, PrintExportRequest
+from app.schemas.speculative import SpeculativeCancelOut, SpeculativeStatusOut
+from app.services.brief_prompt import (
+    BRIEF_DIRECTION_COUNT,
+    BRIEF_PROMPT_VERSION,
+    BRIEF_RESPONSE_FORMAT,
+    build_brief_prompt,
+    build_brief_repair_prompt,
+)
+from app.services.blob_store import store_blob
+from app.services.contact_sheets import invalidate_project_sheets
+from app.services.deadlines import DeadlineExceeded, RequestCancelled
+from app.services.idempotency import run_idempotent
 from app.services.openai_client import OpenAIClient
 from app.settings import get_settings
 
-router = APIRouter(prefix="/cover", tags=["cover"])
+router = APIRouter(prefix="/cover", tags=["cover"], route_class=ProfiledRoute)
 
 
 def _use_real_openai_from_request(request: Request, settings) -> bool:
@@ -29,20 +54,159 @@ def _use_real_openai_from_request(request: Request, settings) -> bool:
     return bool(getattr(settings, "use_real_openai", False))
 
 
+def _brief_usage_fields(result: dict) -> dict:
+    """BriefRun columns for prompt version, token usage (cache-hit telemetry), latency and cost."""
+    usage = result.get("usage") or {}
+    return {
+        "prompt_version": BRIEF_PROMPT_VERSION,
+        "input_tokens": usage.get("input_tokens"),
+        "cached_tokens": usage.get("cached_tokens"),
+        "output_tokens": usage.get("output_tokens"),
+        "total_tokens": usage.get("total_tokens"),
+        "latency_ms": result.get("latency_ms"),
+        "estimated_cost_usd": result.get("cost_usd"),
+        "repair_status": None,
+        "repair_tokens": None,
+        "requested_model": result.get("requested_model"),
+        "route_reason": result.get("route_reason"),
+    }
+
+
+def _add_repair_usage(usage: dict, repair: dict) -> None:
+    """Fold the repair pass into the run's latency/cost; its tokens are kept separately."""
+    usage["repair_tokens"] = (repair.get("usage") or {}).get("total_tokens")
+    if repair.get("latency_ms") is not None:
+        usage["latency_ms"] = (usage["latency_ms"] or 0) + repair["latency_ms"]
+    if repair.get("cost_usd") is not None:
+        usage["estimated_cost_usd"] = (usage["estimated_cost_usd"] or 0) + repair["cost_usd"]
+
+
+def _per_image_share(call: dict, n_images: int) -> dict:
+    usage = call.get("usage") or {}
+    n = max(n_images, 1)
+
+    share = {
+        k: None if usage.get(k) is None else usage[k] // n
+        for k in ("input_tokens", "output_tokens", "cached_tokens")
+    }
+    cost = call.get("cost_usd")
+    share["estimated_cost_usd"] = None if cost is None else cost / n
+    return share
+
+
+def _index_brief_run(run: BriefRun) -> None:
+    # only when this process has already loaded the similarity index; otherwise
+    # its first search loads everything from the DB anyway
+    if "app.services.direction_index" in sys.modules:
+        sys.modules["app.services.direction_index"].get_direction_index().add_run(
+            run.id, run.project_id, run.response_json
+        )
+
+
+def _cancel_speculative(project_id: UUID) -> int:
+    # nothing can be queued unless the pool module was loaded by an earlier brief
+    if "app.services.speculative" in sys.modules:
+        return sys.modules["app.services.speculative"].get_speculative_previews().cancel(project_id)
+    return 0
+
+
+def _speculative_budget_unspent(db: Session, project_id: UUID) -> int:
+    """Speculative previews the project may still have in the rolling 24h window, per the DB."""
+    since = datetime.now(timezone.utc) - timedelta(days=1)
+    used = db.execute(
+        select(func.count())
+        .select_from(CoverImage)
+        .where(
+            CoverImage.project_id == project_id,
+            CoverImage.tier == "speculative",
+            CoverImage.created_at >= since,
+        )
+    ).scalar_one()
+    return max(get_settings().speculative_preview_budget - used, 0)
+
+
+def _speculative_budget_left(db: Session, project_id: UUID) -> int:
+    """Unspent budget less the previews queued or running in this process."""
+    left = _speculative_budget_unspent(db, project_id)
+    if "app.services.speculative" in sys.modules:
+        left -= sys.modules["app.services.speculative"].get_speculative_previews().reserved(project_id)
+    return max(left, 0)
+
+
+def _schedule_speculative_previews(
+    db: Session, run: BriefRun, directions: list[CoverDirection], use_real: bool
+) -> int:
+    """Queue previews for the run's first directions; each reserves its share of the daily budget."""
+    from app.services.speculative import get_speculative_previews
+
+    jobs = [
+        partial(_speculative_preview, run.project_id, run.id, i, d.image_prompt, use_real)
+        for i, d in enumerate(directions[: get_settings().speculative_preview_directions])
+    ]
+    return get_speculative_previews().schedule(
+        run.project_id, run.id, jobs, budget=_speculative_budget_unspent(db, run.project_id)
+    )
+
+
+def _speculative_preview(project_id: UUID, run_id: UUID, index: int, prompt: str, use_real: bool) -> None:
+    # runs on a pool thread, outside any request: own session
+    db = SessionLocal()
+    try:
+        payload = CoverImageGenerateRequest(
+            project_id=project_id, brief_run_id=run_id, direction_index=index, prompt=prompt, n=1, preview=True
+        )
+        _generate_cover_images(payload, use_real, db, tier="speculative")
+    finally:
+        db.close()
+
+
+def _direction_rows(project_id: UUID, directions: list[CoverDirection]) -> list[BriefDirection]:
+    return [BriefDirection(project_id=project_id, position=i, **d.model_dump()) for i, d in enumerate(directions)]
+
+
+def _parse_brief(raw_text: str) -> tuple[dict, list[CoverDirection]]:
+    data = CoverBriefDirections.model_validate_json(raw_text).model_dump(mode="json")
+    return data, [CoverDirection(**d) for d in data["directions"]]
+
+
+def _idempotent_body(payload, use_real: bool) -> dict:
+    # stub and real runs of the same payload are different requests
+    return {**payload.model_dump(mode="json"), "use_real_openai": use_real}
+
+
 @router.post("/brief", response_model=CoverBriefResponse)
 def generate_cover_brief(
     payload: CoverBriefRequest,
     request: Request,
+    response: Response,
     db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
 ) -> CoverBriefResponse:
+    use_real = _use_real_openai_from_request(request, get_settings())
+    result, replayed = run_idempotent(
+        db,
+        scope="cover.brief",
+        key=idempotency_key,
+        request_body=_idempotent_body(payload, use_real),
+        response_model=CoverBriefResponse,
+        fn=lambda: _generate_cover_brief(payload, use_real, db),
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+def _generate_cover_brief(payload: CoverBriefRequest, use_real: bool, db: Session) -> CoverBriefResponse:
     settings = get_settings()
-    use_real = _use_real_openai_from_request(request, settings)
 
     # Validate project exists
     proj = db.get(Project, payload.project_id)
     if not proj:
         raise HTTPException(status_code=404, detail="Project not found")
 
+    # previews still queued for the previous brief are no longer wanted
+    _cancel_speculative(payload.project_id)
+
     # ---------------------------------------------------------------------
     # STUB MODE (DEV): Return deterministic directions without calling OpenAI
     # Placement: after project validation, before creating OpenAIClient/prompt
@@ -76,66 +240,26 @@ def generate_cover_brief(
         directions = [CoverDirection(**d) for d in stub_data["directions"]]
 
         # Persist success (stub run) so your history UI still works
-        db.add(
-            BriefRun(
-                project_id=payload.project_id,
-                request_json=payload.model_dump(mode="json"),
-                response_json=stub_data,
-                model="stub",
-                status="success",
-            )
-        )
-        db.commit()
-
-        return CoverBriefResponse(directions=directions, model="stub")
+        return _save_brief_run(db, payload, stub_data, directions, "stub", use_real)
     # ---------------------------------------------------------------------
     # END STUB MODE
     # ---------------------------------------------------------------------
 
     client = OpenAIClient()
 
-    prompt = f"""
-You are a professional book cover art director.
-
-Generate 6 distinct cover directions for the book below.
-Return STRICT JSON only (no markdown) with this exact shape:
-
-{{
-  "directions": [
-    {{
-      "name": "string",
-      "one_liner": "string",
-      "imagery": "string",
-      "typography": "string",
-      "color_palette": "string",
-      "layout_notes": "string",
-      "avoid": "string",
-      "image_prompt": "string"
-    }}
-  ]
-}}
-
-Book:
-- Title: {payload.title}
-- Subtitle: {payload.subtitle or ""}
-- Author: {payload.author}
-- Genre: {payload.genre}
-- Subgenre: {payload.subgenre or ""}
-- Blurb: {payload.blurb or ""}
-
-Tone words: {", ".join(payload.tone_words) if payload.tone_words else ""}
-Comps: {", ".join(payload.comps) if payload.comps else ""}
-Constraints: {", ".join(payload.constraints) if payload.constraints else ""}
-
-Guidelines:
-- Make these market-aware for the stated genre/subgenre.
-- Ensure strong thumbnail readability.
-- Image prompts describe BACKGROUND ART ONLY (no text in the image).
-- Each direction must feel clearly different.
-""".strip()
-
-    result = client.create_text(prompt=prompt)
+    if payload.parallel_calls > 1:
+        return _generate_sub_briefs(payload, client, use_real, db)
+
+    # static, cacheable instructions first; per-book details last
+    prompt = build_brief_prompt(payload)
+
+    result = client.create_text(
+        prompt=prompt,
+        prompt_cache_key=BRIEF_PROMPT_VERSION,
+        response_format=BRIEF_RESPONSE_FORMAT,
+    )
     raw_text = result.get("output_text")
+    usage = _brief_usage_fields(result)
 
     if not raw_text:
         # Persist failed run
@@ -147,130 +271,203 @@ Guidelines:
                 model=result.get("model", "unknown"),
                 status="error",
                 error_message="No output returned from model",
+                **usage,
             )
         )
         db.commit()
         raise HTTPException(status_code=502, detail="No output returned from model")
 
     try:
-        data = json.loads(raw_text)
-        directions = [CoverDirection(**d) for d in data["directions"]]
+        data, directions = _parse_brief(raw_text)
     except Exception as e:
-        # Persist failed run (store raw text)
+        # Structured output makes this rare (e.g. truncated output); run a cheap
+        # repair pass on what we got instead of making the user regenerate.
+        usage["repair_status"] = "failed"
+        try:
+            repair = client.create_text(
+                prompt=build_brief_repair_prompt(raw_text, str(e)),
+                model=settings.openai_repair_model,
+                response_format=BRIEF_RESPONSE_FORMAT,
+            )
+            _add_repair_usage(usage, repair)
+            data, directions = _parse_brief(repair.get("output_text") or "")
+            usage["repair_status"] = "repaired"
+        except Exception as repair_error:
+            # Persist failed run (store raw text)
+            db.add(
+                BriefRun(
+                    project_id=payload.project_id,
+                    request_json=payload.model_dump(mode="json"),
+                    response_json={"raw_text": raw_text},
+                    model=result.get("model", "unknown"),
+                    status="error",
+                    error_message=f"Bad JSON from model: {e} (repair failed: {repair_error})",
+                    **usage,
+                )
+            )
+            db.commit()
+            raise HTTPException(status_code=502, detail=f"Bad JSON from model: {e}")
+
+    # Persist success
+    return _save_brief_run(db, payload, data, directions, result.get("model", "unknown"), use_real, **usage)
+
+
+def _generate_sub_briefs(
+    payload: CoverBriefRequest, client: OpenAIClient, use_real: bool, db: Session
+) -> CoverBriefResponse:
+    """The brief as concurrent smaller calls, merged; failed calls are tolerated down to brief_min_directions."""
+    from app.services.sub_briefs import run_sub_briefs
+
+    result = run_sub_briefs(client, payload, payload.parallel_calls)
+    usage = {
+        "prompt_version": BRIEF_PROMPT_VERSION,
+        **result.usage,
+        "latency_ms": result.latency_ms,
+        "estimated_cost_usd": result.cost_usd,
+        **result.route,
+    }
+    data = {"directions": result.directions, "sub_briefs": result.calls}
+
+    min_directions = min(get_settings().brief_min_directions, BRIEF_DIRECTION_COUNT)
+    if len(result.directions) < min_directions:
+        reasons = [
+            f"{result.received} directions received",
+            f"{result.dropped_by_name} dropped as duplicate names",
+            f"{result.dropped_by_prompt} dropped as similar image prompts",
+        ]
+        reasons += [f"call failed: {c['error']}" for c in result.calls if c["error"]]
+        detail = (
+            f"Sub-briefs returned {len(result.directions)} of {min_directions} required directions "
+            f"({'; '.join(reasons)})"
+        )
         db.add(
             BriefRun(
                 project_id=payload.project_id,
                 request_json=payload.model_dump(mode="json"),
-                response_json={"raw_text": raw_text},
-                model=result.get("model", "unknown"),
+                response_json=data,
+                model=result.model,
                 status="error",
-                error_message=f"Bad JSON from model: {e}",
+                error_message=detail,
+                **usage,
             )
         )
         db.commit()
-        raise HTTPException(status_code=502, detail=f"Bad JSON from model: {e}")
+        raise HTTPException(status_code=502, detail=detail)
 
-    # Persist success
-    db.add(
-        BriefRun(
-            project_id=payload.project_id,
-            request_json=payload.model_dump(mode="json"),
-            response_json=data,
-            model=result.get("model", "unknown"),
-            status="success",
-        )
+    directions = [CoverDirection(**d) for d in result.directions]
+    return _save_brief_run(db, payload, data, directions, result.model, use_real, **usage)
+
+
+def _save_brief_run(
+    db: Session,
+    payload: CoverBriefRequest,
+    data: dict,
+    directions: list[CoverDirection],
+    model: str,
+    use_real: bool,
+    **usage,
+) -> CoverBriefResponse:
+    run = BriefRun(
+        project_id=payload.project_id,
+        request_json=payload.model_dump(mode="json"),
+        response_json=data,
+        model=model,
+        status="success",
+        directions=_direction_rows(payload.project_id, directions),
+        **usage,
     )
+    db.add(run)
     db.commit()
+    _index_brief_run(run)
 
-    return CoverBriefResponse(directions=directions, model=result["model"])
+    queued = _schedule_speculative_previews(db, run, directions, use_real) if payload.speculative_previews else 0
+    return CoverBriefResponse(
+        directions=directions, model=model, route_reason=run.route_reason, speculative_previews=queued
+    )
 
 
 @router.post("/image", response_model=CoverImageGenerateResponse)
 def generate_cover_images(
     payload: CoverImageGenerateRequest,
     request: Request,
+    response: Response,
     db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
 ) -> CoverImageGenerateResponse:
-    settings = get_settings()
-    use_real = _use_real_openai_from_request(request, settings)
+    use_real = _use_real_openai_from_request(request, get_settings())
+    result, replayed = run_idempotent(
+        db,
+        scope="cover.image",
+        key=idempotency_key,
+        request_body=_idempotent_body(payload, use_real),
+        response_model=CoverImageGenerateResponse,
+        fn=lambda: _generate_cover_images(payload, use_real, db),
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
 
-    proj = db.get(Project, payload.project_id)
-    if not proj:
-        raise HTTPException(status_code=404, detail="Project not found")
 
-    if payload.brief_run_id:
-        run = db.get(BriefRun, payload.brief_run_id)
-        if not run or run.project_id != payload.project_id:
-            raise HTTPException(status_code=400, detail="brief_run_id is invalid for this project")
+def _stub_images(n: int, size: str, label: str) -> list[bytes]:
+    """Placeholder PNG bytes drawn with Pillow (no OpenAI)."""
+    import io
+    from PIL import Image, ImageDraw
 
-    model = payload.model or settings.image_model
-    size = payload.size or settings.image_size
+    w_str, h_str = size.split("x")
+    w, h = int(w_str), int(h_str)
 
-    # ---------------------------------------------------------------------
-    # STUB MODE (DEV): create placeholder PNG bytes with Pillow (no OpenAI)
-    # Placement: before creating OpenAIClient / calling generate_images
-    # ---------------------------------------------------------------------
-    if not use_real:
-        try:
-            import io
-            from PIL import Image, ImageDraw
+    images_bytes: list[bytes] = []
+    for i in range(n):
+        img = Image.new("RGB", (w, h), color=(28, 28, 32))
+        draw = ImageDraw.Draw(img)
 
-            w_str, h_str = size.split("x")
-            w, h = int(w_str), int(h_str)
+        # simple diagonal accent
+        draw.rectangle([0, int(h * 0.65), w, h], fill=(18, 18, 22))
+        draw.line((0, 0, w, h), fill=(70, 70, 80), width=3)
 
-            images_bytes: list[bytes] = []
-            for i in range(payload.n):
-                img = Image.new("RGB", (w, h), color=(28, 28, 32))
-                draw = ImageDraw.Draw(img)
+        # small label (purely for dev visibility; remove later)
+        draw.text((24, 24), f"{label} {i+1}/{n}", fill=(200, 200, 210))
 
-                # simple diagonal accent
-                draw.rectangle([0, int(h * 0.65), w, h], fill=(18, 18, 22))
-                draw.line((0, 0, w, h), fill=(70, 70, 80), width=3)
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        images_bytes.append(buf.getvalue())
+    return images_bytes
 
-                # small label (purely for dev visibility; remove later)
-                label = f"STUB {i+1}/{payload.n}"
-                draw.text((24, 24), label, fill=(200, 200, 210))
 
-                buf = io.BytesIO()
-                img.save(buf, format="PNG")
-                images_bytes.append(buf.getvalue())
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Stub image generation failed: {e}")
-    else:
-        client = OpenAIClient()
-        try:
-            images_bytes = client.generate_images(prompt=payload.prompt, n=payload.n, model=model, size=size)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Image generation failed: {e}")
-    # ---------------------------------------------------------------------
-    # END STUB MODE
-    # ---------------------------------------------------------------------
+def _save_images(db: Session, images_bytes: list[bytes], call: dict, **row_fields) -> list[CoverImageOut]:
+    """Store files (content-addressed, one copy per distinct image) + CoverImage rows, then commit."""
+    # numpy/Pillow-backed analysis: loaded on first image save, not at app import
+    from app.services.image_hashing import dhash
+    from app.services.palettes import extract_palette
 
-    # Save files + DB rows
-    storage_root = Path(settings.storage_dir)
-    rel_dir = Path("images") / str(payload.project_id)
-    abs_dir = storage_root / rel_dir
-    abs_dir.mkdir(parents=True, exist_ok=True)
+    storage_root = Path(get_settings().storage_dir)
 
     out: list[CoverImageOut] = []
 
+    # one call produced len(images_bytes) images: attribute its tokens/cost evenly
+    share = _per_image_share(call, len(images_bytes))
+
     for img_bytes in images_bytes:
-        image_id = uuid4()
-        filename = f"{image_id}.png"
-        rel_path = str(rel_dir / filename)  # stored in DB
-        abs_path = abs_dir / filename
+        sha256, rel_path = store_blob(db, storage_root, img_bytes)  # rel_path stored in DB
 
-        abs_path.write_bytes(img_bytes)
+        try:
+            phash = dhash(img_bytes)
+            palette = extract_palette(img_bytes)
+        except OSError:
+            phash, palette = None, None
 
         row = CoverImage(
-            id=image_id,
-            project_id=payload.project_id,
-            brief_run_id=payload.brief_run_id,
-            direction_index=payload.direction_index,
-            prompt=payload.prompt,
-            model=model if use_real else "stub-image",
-            size=size,
+            id=uuid4(),
             image_path=rel_path,
+            content_hash=sha256,
+            phash=phash,
+            palette=palette,
+            latency_ms=call["latency_ms"],
+            image_bytes=len(img_bytes),
+            requested_model=call.get("requested_model"),
+            route_reason=call.get("route_reason"),
+            **row_fields,
+            **share,
         )
         db.add(row)
         db.flush()
@@ -281,13 +478,270 @@ def generate_cover_images(
                 project_id=row.project_id,
                 brief_run_id=row.brief_run_id,
                 direction_index=row.direction_index,
+                brief_direction_id=row.brief_direction_id,
                 prompt=row.prompt,
                 model=row.model,
                 size=row.size,
+                quality=row.quality,
+                requested_model=row.requested_model,
+                route_reason=row.route_reason,
+                tier=row.tier,
+                preview_image_id=row.preview_image_id,
                 image_url=f"/static/{row.image_path}",
             )
         )
 
     db.commit()
 
+    # gallery contact sheets for this project are now stale
+    invalidate_project_sheets(storage_root, row_fields["project_id"])
+
+    return out
+
+
+def _generate_cover_images(
+    payload: CoverImageGenerateRequest, use_real: bool, db: Session, tier: str | None = None
+) -> CoverImageGenerateResponse:
+    settings = get_settings()
+
+    proj = db.get(Project, payload.project_id)
+    if not proj:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    brief_direction_id = None
+    if payload.brief_run_id:
+        run = db.get(BriefRun, payload.brief_run_id)
+        if not run or run.project_id != payload.project_id:
+            raise HTTPException(status_code=400, detail="brief_run_id is invalid for this project")
+        if payload.direction_index is not None:
+            brief_direction_id = db.execute(
+                select(BriefDirection.id).where(
+                    BriefDirection.brief_run_id == run.id, BriefDirection.position == payload.direction_index
+                )
+            ).scalar_one_or_none()
+            if brief_direction_id is None:
+                raise HTTPException(status_code=400, detail="direction_index is invalid for this brief run")
+
+    if payload.preview:
+        # cheap first pass: smallest size, lowest quality; finalize the keepers
+        size = payload.size or settings.preview_image_size
+        quality = settings.preview_image_quality
+    else:
+        size = payload.size or settings.image_size
+        quality = settings.image_quality
+
+    # ---------------------------------------------------------------------
+    # STUB MODE (DEV): create placeholder PNG bytes with Pillow (no OpenAI)
+    # Placement: before creating OpenAIClient / calling generate_images
+    # ---------------------------------------------------------------------
+    if not use_real:
+        started = time.perf_counter()
+        try:
+            images_bytes = _stub_images(payload.n, size, "PREVIEW" if payload.preview else "STUB")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Stub image generation failed: {e}")
+        call = {"usage": {}, "latency_ms": int((time.perf_counter() - started) * 1000), "cost_usd": None}
+    else:
+        client = OpenAIClient()
+        try:
+            # no explicit model: OpenAIClient routes among the allowed image models
+            call = client.generate_images_result(
+                prompt=payload.prompt, n=payload.n, model=payload.model, size=size, quality=quality
+            )
+        except (DeadlineExceeded, RequestCancelled):
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Image generation failed: {e}")
+        images_bytes = call["images"]
+    # ---------------------------------------------------------------------
+    # END STUB MODE
+    # ---------------------------------------------------------------------
+
+    out = _save_images(
+        db,
+        images_bytes,
+        call,
+        project_id=payload.project_id,
+        brief_run_id=payload.brief_run_id,
+        direction_index=payload.direction_index,
+        brief_direction_id=brief_direction_id,
+        prompt=payload.prompt,
+        model=call["model"] if use_real else "stub-image",
+        size=size,
+        quality=quality,
+        tier=tier or ("preview" if payload.preview else None),
+    )
     return CoverImageGenerateResponse(images=out)
+
+
+@router.post("/image/{image_id}/finalize", response_model=CoverImageOut)
+def finalize_cover_image(
+    image_id: UUID,
+    payload: CoverImageFinalizeRequest,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+) -> CoverImageOut:
+    use_real = _use_real_openai_from_request(request, get_settings())
+    result, replayed = run_idempotent(
+        db,
+        scope="cover.image.finalize",
+        key=idempotency_key,
+        request_body={**_idempotent_body(payload, use_real), "image_id": str(image_id)},
+        response_model=CoverImageOut,
+        fn=lambda: _finalize_cover_image(image_id, payload, use_real, db),
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+def _finalize_cover_image(
+    image_id: UUID, payload: CoverImageFinalizeRequest, use_real: bool, db: Session
+) -> CoverImageOut:
+    """Full-size version of a chosen preview, linked back to it via preview_image_id."""
+    settings = get_settings()
+
+    preview = db.get(CoverImage, image_id)
+    if not preview:
+        raise HTTPException(status_code=404, detail="Image not found")
+    if preview.tier not in ("preview", "speculative"):
+        raise HTTPException(status_code=400, detail="Only preview images can be finalized")
+
+    size = payload.size or settings.image_size
+    w_str, h_str = size.split("x")
+
+    started = time.perf_counter()
+    if payload.mode == "upscale":
+        # local resample of the preview: free, keeps it pixel-for-pixel, no added detail
+        from app.services.print_export import upscale_image
+
+        preview_bytes = (Path(settings.storage_dir) / preview.image_path).read_bytes()
+        images_bytes = [upscale_image(preview_bytes, int(w_str), int(h_str))]
+        call = {"usage": {}, "latency_ms": int((time.perf_counter() - started) * 1000), "cost_usd": None}
+        model, quality = "upscale-lanczos", None
+    elif not use_real:
+        images_bytes = _stub_images(1, size, "FINAL")
+        call = {"usage": {}, "latency_ms": int((time.perf_counter() - started) * 1000), "cost_usd": None}
+        model, quality = "stub-image", settings.image_quality
+    else:
+        # regenerate at full settings with the preview as the reference image,
+        # so the composition the user picked carries over
+        preview_bytes = (Path(settings.storage_dir) / preview.image_path).read_bytes()
+        quality = settings.image_quality
+        client = OpenAIClient()
+        try:
+            call = client.edit_image_result(
+                prompt=preview.prompt, image=preview_bytes, model=payload.model, size=size, quality=quality
+            )
+        except (DeadlineExceeded, RequestCancelled):
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Image generation failed: {e}")
+        images_bytes = call["images"][:1]
+        model = call["model"]
+
+    out = _save_images(
+        db,
+        images_bytes,
+        call,
+        project_id=preview.project_id,
+        brief_run_id=preview.brief_run_id,
+        direction_index=preview.direction_index,
+        brief_direction_id=preview.brief_direction_id,
+        prompt=preview.prompt,
+        model=model,
+        size=size,
+        quality=quality,
+        tier="final",
+        preview_image_id=preview.id,
+    )
+    return out[0]
+
+
+# --- speculative previews ---
+
+
+@router.get("/speculative/{project_id}", response_model=SpeculativeStatusOut)
+def speculative_status(project_id: UUID, db: Session = Depends(get_db)) -> SpeculativeStatusOut:
+    if not db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    if "app.services.speculative" in sys.modules:
+        status = sys.modules["app.services.speculative"].get_speculative_previews().status(project_id)
+    else:
+        status = {}
+    return SpeculativeStatusOut(project_id=project_id, budget_left=_speculative_budget_left(db, project_id), **status)
+
+
+@router.delete("/speculative/{project_id}", response_model=SpeculativeCancelOut)
+def cancel_speculative(project_id: UUID) -> SpeculativeCancelOut:
+    """Drop queued previews (e.g. the user moved to another project); running ones still finish."""
+    return SpeculativeCancelOut(project_id=project_id, cancelled=_cancel_speculative(project_id))
+
+
+# --- print export ---
+
+
+def _print_job_out(job) -> PrintExportOut:
+    spec = job.spec
+    fields = dict(job_id=job.id, image_id=job.image_id, width_px=spec.width_px, height_px=spec.height_px, dpi=spec.dpi)
+    if not job.future.done():
+        return PrintExportOut(status="running" if job.future.running() else "queued", **fields)
+    error = job.future.exception()
+    if error is not None:
+        return PrintExportOut(status="failed", error=str(error), **fields)
+    return PrintExportOut(status="done", file_url=f"/static/{job.rel_path}", **fields)
+
+
+@router.post("/print-exports", response_model=PrintExportOut, status_code=202)
+def create_print_export(payload: PrintExportRequest, db: Session = Depends(get_db)) -> PrintExportOut:
+    from app.services.print_export import PrintSpec, get_print_queue, print_rel_path
+
+    settings = get_settings()
+    storage_root = Path(settings.storage_dir)
+
+    image = db.get(CoverImage, payload.image_id)
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    spec = PrintSpec(
+        trim_width_in=payload.trim_width_in,
+        trim_height_in=payload.trim_height_in,
+        dpi=payload.dpi,
+        bleed_in=payload.bleed_in,
+    )
+    rel_path = print_rel_path(image.project_id, image.id, spec, payload.format)
+
+    if (storage_root / rel_path).exists():
+        return PrintExportOut(
+            image_id=image.id,
+            status="done",
+            width_px=spec.width_px,
+            height_px=spec.height_px,
+            dpi=spec.dpi,
+            file_url=f"/static/{rel_path}",
+        )
+
+    queue = get_print_queue()
+    job = queue.find(rel_path) or queue.submit(
+        project_id=image.project_id,
+        image_id=image.id,
+        src_path=storage_root / image.image_path,
+        storage_root=storage_root,
+        rel_path=rel_path,
+        spec=spec,
+        fmt=payload.format,
+    )
+    return _print_job_out(job)
+
+
+@router.get("/print-exports/{job_id}", response_model=PrintExportOut)
+def get_print_export(job_id: UUID) -> PrintExportOut:
+    from app.services.print_export import get_print_queue
+
+    job = get_print_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Print export not found")
+    return _print_job_out(job)
@@ -0,0 +1,70 @@
+import time
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models import BriefRun
+from app.profiling import ProfiledRoute
+from app.schemas.directions import SimilarDirectionOut, SimilarDirectionsOut
+
+router = APIRouter(prefix="/directions", tags=["directions"], route_class=ProfiledRoute)
+
+
+@router.get("/similar", response_model=SimilarDirectionsOut)
+def similar_directions(
+    q: str | None = Query(default=None, max_length=4000, description="Free text to match"),
+    brief_run_id: UUID | None = None,
+    direction_index: int | None = Query(default=None, ge=0),
+    project_id: UUID | None = Query(default=None, description="Only search this project's runs"),
+    k: int = Query(default=10, ge=1, le=100),
+    db: Session = Depends(get_db),
+) -> SimilarDirectionsOut:
+    """
+    Directions most similar (imagery, color palette, image prompt) to free
+    text or to an existing direction (brief_run_id + direction_index), across
+    every successful brief run.
+    """
+    from app.services.direction_index import direction_text, get_direction_index  # numpy: load on demand
+
+    started = time.perf_counter()
+    index = get_direction_index()
+    index.sync(db)
+
+    exclude = None
+    if q is None:
+        if brief_run_id is None or direction_index is None:
+            raise HTTPException(status_code=422, detail="Pass q, or brief_run_id and direction_index")
+        source = index.direction(brief_run_id, direction_index)
+        if source is None:
+            raise HTTPException(status_code=404, detail="Direction not found")
+        q = direction_text(source)
+        exclude = (brief_run_id, direction_index)
+
+    hits = index.search(q, k=k, project_id=project_id, exclude=exclude)
+
+    # runs deleted with their project since indexing: drop them for good and re-rank
+    hit_runs = {h.brief_run_id for h in hits}
+    if hit_runs:
+        live = set(db.execute(select(BriefRun.id).where(BriefRun.id.in_(hit_runs))).scalars())
+        if live != hit_runs:
+            index.remove_runs(hit_runs - live)
+            hits = index.search(q, k=k, project_id=project_id, exclude=exclude)
+
+    return SimilarDirectionsOut(
+        results=[
+            SimilarDirectionOut(
+                brief_run_id=h.brief_run_id,
+                project_id=h.project_id,
+                direction_index=h.direction_index,
+                score=h.score,
+                direction=h.direction,
+            )
+            for h in hits
+        ],
+        indexed=len(index),
+        took_ms=round((time.perf_counter() - started) * 1000, 2),
+        query=q if exclude is None else None,
+    )
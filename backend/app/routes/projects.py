@@ -1,16 +1,38 @@
+import io
+import re
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select
 
-from app.db import get_db
-from app.models import BriefRun, CoverImage, Project
-from app.schemas.brief_runs import BriefRunOut
-from app.schemas.cover_image import CoverImageListOut
-from app.schemas.projects import ProjectCreate, ProjectOut
+from app.db import SessionLocal, get_db
+from app.models import BriefDirection, BriefRun, CoverImage, Project
+from app.profiling import ProfiledRoute, in_request_thread
+from app.schemas.brief_runs import BriefDirectionOut, BriefRunOut, BriefRunSummaryPage
+from app.schemas.contact_sheets import ContactSheetOut
+from app.schemas.dashboard import ProjectDashboardOut
+from app.schemas.cover_image import (
+    DEFAULT_NEAR_DUPLICATE_DISTANCE,
+    CoverImageListOut,
+    CoverImageNearDuplicateOut,
+    CoverImagePaletteMatchOut,
+)
+from app.schemas.projects import ProjectCreate, ProjectImportReport, ProjectOut
+from app.services.brief_archive import ARCHIVE_COLUMNS, hydrate_run_dicts
+from app.services.contact_sheets import load_cached_sheet, render_contact_sheet, sheet_cache_key
+from app.services.fast_json import ORJSONResponse, json_text, raw_json, rows_to_dicts
+from app.services.project_export import iter_zip_range, take_export_manifest
+from app.services.project_import import DEFAULT_CHUNK_SIZE, detect_format, import_projects
+from app.settings import get_settings
 
-router = APIRouter(prefix="/projects", tags=["projects"])
+router = APIRouter(prefix="/projects", tags=["projects"], route_class=ProfiledRoute)
 
 
 @router.post("", response_model=ProjectOut)
@@ -27,6 +49,39 @@ def create_project(payload: ProjectCreate, db: Session = Depends(get_db)) -> Pro
     return proj
 
 
+@router.post("/import", response_model=ProjectImportReport)
+async def import_projects_bulk(
+    request: Request,
+    fmt: Literal["csv", "jsonl"] | None = Query(default=None, alias="format"),
+    chunk_size: int = Query(default=DEFAULT_CHUNK_SIZE, ge=100, le=100_000),
+) -> ProjectImportReport:
+    """
+    Bulk-create projects from a raw CSV (header: title,author,genre,subgenre)
+    or JSONL request body. Rejected rows are reported by line number.
+    """
+    fmt = fmt or detect_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass ?format=")
+
+    # Spool the upload (memory up to 8 MiB, then disk) while streaming it in,
+    # then parse + load it in a worker thread.
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024, mode="w+b") as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+
+        def run() -> ProjectImportReport:
+            lines = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+            db = SessionLocal()
+            try:
+                return ProjectImportReport(**asdict(import_projects(db, lines, fmt, chunk_size=chunk_size)))
+            finally:
+                lines.detach()
+                db.close()
+
+        return await run_in_threadpool(in_request_thread(run))
+
+
 @router.get("", response_model=list[ProjectOut])
 def list_projects(db: Session = Depends(get_db)) -> list[ProjectOut]:
     rows = db.execute(select(Project).order_by(Project.created_at.desc())).scalars().all()
@@ -41,50 +96,529 @@ def get_project(project_id: UUID, db: Session = Depends(get_db)) -> ProjectOut:
     return proj
 
 
-@router.get("/{project_id}/brief-runs", response_model=list[BriefRunOut])
-def list_brief_runs(project_id: UUID, db: Session = Depends(get_db)) -> list[BriefRunOut]:
-    proj = db.get(Project, project_id)
-    if not proj:
+def _require_project(db: Session, project_id: UUID) -> None:
+    if db.execute(select(Project.id).where(Project.id == project_id)).first() is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    runs = (
+
+# Columns of BriefRunOut; JSONB goes out as raw text (see app.services.fast_json)
+_BRIEF_RUN_COLUMNS = (
+    BriefRun.id,
+    BriefRun.project_id,
+    BriefRun.model,
+    BriefRun.status,
+    BriefRun.error_message,
+    BriefRun.created_at,
+    BriefRun.prompt_version,
+    BriefRun.input_tokens,
+    BriefRun.cached_tokens,
+    BriefRun.total_tokens,
+    BriefRun.repair_status,
+    BriefRun.repair_tokens,
+    BriefRun.requested_model,
+    BriefRun.route_reason,
+    json_text(BriefRun.request_json),
+    json_text(BriefRun.response_json),
+    *ARCHIVE_COLUMNS,  # archived runs' JSON is read back by hydrate_run_dicts
+)
+
+
+@router.get("/{project_id}/brief-runs", response_model=list[BriefRunOut], response_class=ORJSONResponse)
+def list_brief_runs(project_id: UUID, db: Session = Depends(get_db)) -> ORJSONResponse:
+    _require_project(db, project_id)
+
+    rows = db.execute(
+        select(*_BRIEF_RUN_COLUMNS)
+        .where(BriefRun.project_id == project_id)
+        .order_by(BriefRun.created_at.desc())
+    )
+    items = rows_to_dicts(rows, json_columns=("request_json", "response_json"))
+    return ORJSONResponse(hydrate_run_dicts(items, Path(get_settings().storage_dir)))
+
+
+@router.get(
+    "/{project_id}/brief-runs/summary",
+    response_model=BriefRunSummaryPage,
+    response_class=ORJSONResponse,
+)
+def list_brief_run_summaries(
+    project_id: UUID,
+    limit: int = Query(default=10, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+) -> ORJSONResponse:
+    """One page of runs, newest first, without the (large) request/response JSON."""
+    _require_project(db, project_id)
+
+    total = db.execute(select(func.count()).where(BriefRun.project_id == project_id)).scalar_one()
+    runs = rows_to_dicts(
         db.execute(
-            select(BriefRun)
+            select(
+                BriefRun.id,
+                BriefRun.project_id,
+                BriefRun.model,
+                BriefRun.status,
+                BriefRun.error_message,
+                BriefRun.created_at,
+            )
             .where(BriefRun.project_id == project_id)
-            .order_by(BriefRun.created_at.desc())
+            .order_by(BriefRun.created_at.desc(), BriefRun.id)
+            .limit(limit)
+            .offset(offset)
+        )
+    )
+
+    _add_direction_names(db, runs)
+    return ORJSONResponse({"total": total, "limit": limit, "offset": offset, "runs": runs})
+
+
+def _add_direction_names(db: Session, runs: list[dict]) -> None:
+    # just the direction names, from brief_directions (no JSONB parsing)
+    names: dict[UUID, list[str]] = {run["id"]: [] for run in runs}
+    if names:
+        for run_id, name in db.execute(
+            select(BriefDirection.brief_run_id, BriefDirection.name)
+            .where(BriefDirection.brief_run_id.in_(names))
+            .order_by(BriefDirection.brief_run_id, BriefDirection.position)
+        ):
+            names[run_id].append(name)
+    for run in runs:
+        run["direction_names"] = names[run["id"]]
+
+
+# Columns of ImageThumbOut
+_THUMB_COLUMNS = (
+    CoverImage.id,
+    CoverImage.brief_run_id,
+    CoverImage.direction_index,
+    CoverImage.model,
+    CoverImage.size,
+    CoverImage.tier,
+    CoverImage.image_path,
+    CoverImage.created_at,
+)
+
+
+@router.get("/{project_id}/dashboard", response_model=ProjectDashboardOut, response_class=ORJSONResponse)
+def get_project_dashboard(
+    project_id: UUID,
+    runs_limit: int = Query(default=10, ge=1, le=100),
+    runs_offset: int = Query(default=0, ge=0),
+    images_per_run: int = Query(default=12, ge=0, le=100),
+    tier: str | None = Query(default=None, description="only thumbnails of this tier, e.g. 'speculative'"),
+    db: Session = Depends(get_db),
+) -> ORJSONResponse:
+    """
+    The project, its image count, one page of run summaries and each run's
+    newest image thumbnails: five queries, instead of a request (and a
+    project lookup) per section.
+    """
+    row = db.execute(
+        select(
+            Project,
+            select(func.count()).where(CoverImage.project_id == project_id).scalar_subquery().label("image_total"),
+        ).where(Project.id == project_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    project, image_total = row
+
+    # the total rides along on every row of the page
+    page = db.execute(
+        select(
+            BriefRun.id,
+            BriefRun.project_id,
+            BriefRun.model,
+            BriefRun.status,
+            BriefRun.error_message,
+            BriefRun.created_at,
+            func.count().over().label("total"),
         )
-        .scalars()
-        .all()
+        .where(BriefRun.project_id == project_id)
+        .order_by(BriefRun.created_at.desc(), BriefRun.id)
+        .limit(runs_limit)
+        .offset(runs_offset)
+    ).all()
+    if page:
+        total = page[0].total
+    elif runs_offset:
+        total = db.execute(select(func.count()).where(BriefRun.project_id == project_id)).scalar_one()
+    else:
+        total = 0
+
+    runs = rows_to_dicts(page)
+    for run in runs:
+        del run["total"]
+        run["image_count"] = 0
+        run["images"] = []
+    _add_direction_names(db, runs)
+
+    if runs:
+        by_id = {run["id"]: run for run in runs}
+        ranked = (
+            select(
+                *_THUMB_COLUMNS,
+                func.row_number()
+                .over(partition_by=CoverImage.brief_run_id, order_by=(CoverImage.created_at.desc(), CoverImage.id))
+                .label("rank"),
+                func.count().over(partition_by=CoverImage.brief_run_id).label("run_total"),
+            )
+            .where(CoverImage.project_id == project_id, CoverImage.brief_run_id.in_(by_id))
+        )
+        if tier is not None:
+            ranked = ranked.where(CoverImage.tier == tier)
+        ranked = ranked.subquery()
+        # at least each run's newest row, which carries its image count
+        for img in db.execute(
+            select(ranked)
+            .where(ranked.c.rank <= max(images_per_run, 1))
+            .order_by(ranked.c.brief_run_id, ranked.c.rank)
+        ):
+            run = by_id[img.brief_run_id]
+            run["image_count"] = img.run_total
+            if img.rank <= images_per_run:
+                run["images"].append(
+                    {
+                        "id": img.id,
+                        "brief_run_id": img.brief_run_id,
+                        "direction_index": img.direction_index,
+                        "model": img.model,
+                        "size": img.size,
+                        "tier": img.tier,
+                        "image_url": f"/static/{img.image_path}",
+                        "created_at": img.created_at,
+                    }
+                )
+
+    return ORJSONResponse(
+        {
+            "project": ProjectOut.model_validate(project).model_dump(),
+            "image_total": image_total,
+            "brief_runs": {"total": total, "limit": runs_limit, "offset": runs_offset, "runs": runs},
+        }
+    )
+
+
+@router.get("/{project_id}/brief-runs/{run_id}", response_model=BriefRunOut, response_class=ORJSONResponse)
+def get_brief_run(project_id: UUID, run_id: UUID, db: Session = Depends(get_db)) -> ORJSONResponse:
+    row = db.execute(
+        select(*_BRIEF_RUN_COLUMNS).where(BriefRun.id == run_id, BriefRun.project_id == project_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Brief run not found")
+    items = rows_to_dicts([row], json_columns=("request_json", "response_json"))
+    return ORJSONResponse(hydrate_run_dicts(items, Path(get_settings().storage_dir))[0])
+
+
+@router.get("/{project_id}/brief-runs/{run_id}/directions", response_model=list[BriefDirectionOut])
+def list_brief_run_directions(
+    project_id: UUID, run_id: UUID, db: Session = Depends(get_db)
+) -> list[BriefDirectionOut]:
+    """A run's directions, without loading its request/response JSON."""
+    run = db.execute(select(BriefRun.id).where(BriefRun.id == run_id, BriefRun.project_id == project_id)).first()
+    if run is None:
+        raise HTTPException(status_code=404, detail="Brief run not found")
+    return db.execute(
+        select(BriefDirection).where(BriefDirection.brief_run_id == run_id).order_by(BriefDirection.position)
+    ).scalars().all()
+
+
+def _image_list_out(row: CoverImage, **extra) -> dict:
+    return dict(
+        id=row.id,
+        project_id=row.project_id,
+        brief_run_id=row.brief_run_id,
+        direction_index=row.direction_index,
+        brief_direction_id=row.brief_direction_id,
+        direction_name=row.brief_direction.name if row.brief_direction else None,
+        prompt=row.prompt,
+        model=row.model,
+        size=row.size,
+        quality=row.quality,
+        tier=row.tier,
+        preview_image_id=row.preview_image_id,
+        image_url=f"/static/{row.image_path}",
+        created_at=row.created_at,
+        palette=row.palette,
+        **extra,
+    )
+
+
+# Columns of CoverImageListOut (+ phash for duplicate collapsing), as row tuples;
+# selected with an outer join to brief_directions for the direction name
+_IMAGE_LIST_COLUMNS = (
+    CoverImage.id,
+    CoverImage.project_id,
+    CoverImage.brief_run_id,
+    CoverImage.direction_index,
+    CoverImage.brief_direction_id,
+    BriefDirection.name.label("direction_name"),
+    CoverImage.prompt,
+    CoverImage.model,
+    CoverImage.size,
+    CoverImage.quality,
+    CoverImage.tier,
+    CoverImage.preview_image_id,
+    CoverImage.image_path,
+    CoverImage.created_at,
+    json_text(CoverImage.palette),
+    CoverImage.phash,
+)
+
+
+def _image_list_item(row, duplicates: int = 0) -> dict:
+    return {
+        "id": row.id,
+        "project_id": row.project_id,
+        "brief_run_id": row.brief_run_id,
+        "direction_index": row.direction_index,
+        "brief_direction_id": row.brief_direction_id,
+        "direction_name": row.direction_name,
+        "prompt": row.prompt,
+        "model": row.model,
+        "size": row.size,
+        "quality": row.quality,
+        "tier": row.tier,
+        "preview_image_id": row.preview_image_id,
+        "image_url": f"/static/{row.image_path}",
+        "created_at": row.created_at,
+        "palette": raw_json(row.palette),
+        "duplicates": duplicates,
+    }
+
+
+@router.get("/{project_id}/images", response_model=list[CoverImageListOut], response_class=ORJSONResponse)
+def list_project_images(
+    project_id: UUID,
+    collapse_duplicates: bool = False,
+    max_distance: int = Query(default=DEFAULT_NEAR_DUPLICATE_DISTANCE, ge=0, le=32),
+    brief_run_id: UUID | None = None,
+    brief_direction_id: UUID | None = None,
+    db: Session = Depends(get_db),
+) -> ORJSONResponse:
+    _require_project(db, project_id)
+
+    stmt = (
+        select(*_IMAGE_LIST_COLUMNS)
+        .outerjoin(BriefDirection, CoverImage.brief_direction_id == BriefDirection.id)
+        .where(CoverImage.project_id == project_id)
     )
-    return runs
+    if brief_run_id is not None:
+        stmt = stmt.where(CoverImage.brief_run_id == brief_run_id)
+    if brief_direction_id is not None:
+        stmt = stmt.where(CoverImage.brief_direction_id == brief_direction_id)
+    rows = db.execute(stmt.order_by(CoverImage.created_at.desc())).all()
+
+    if not collapse_duplicates:
+        return ORJSONResponse([_image_list_item(row) for row in rows])
+
+    from app.services.image_hashing import collapse_near_duplicates  # numpy: load on demand
+
+    # keep the newest image of each near-duplicate group
+    groups = collapse_near_duplicates([row.phash for row in rows], max_distance=max_distance)
+    return ORJSONResponse([_image_list_item(rows[pos], duplicates=count) for pos, count in groups])
 
 
-@router.get("/{project_id}/images", response_model=list[CoverImageListOut])
-def list_project_images(project_id: UUID, db: Session = Depends(get_db)) -> list[CoverImageListOut]:
+@router.get("/{project_id}/images/palette-search", response_model=list[CoverImagePaletteMatchOut])
+def search_images_by_palette(
+    project_id: UUID,
+    colors: str = Query(..., description="Comma-separated hex colors, e.g. '#1b2a3a,#c89b3c'"),
+    limit: int = Query(default=24, ge=1, le=200),
+    max_distance: float | None = Query(default=None, ge=0),
+    db: Session = Depends(get_db),
+) -> list[CoverImagePaletteMatchOut]:
     proj = db.get(Project, project_id)
     if not proj:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    rows = (
-        db.execute(
-            select(CoverImage)
-            .where(CoverImage.project_id == project_id)
-            .order_by(CoverImage.created_at.desc())
+    from app.services.palettes import palette_distances, parse_hex_color  # numpy: load on demand
+
+    try:
+        target = [parse_hex_color(c) for c in colors.split(",") if c.strip()]
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not target:
+        raise HTTPException(status_code=422, detail="At least one color is required")
+
+    candidates = db.execute(
+        select(CoverImage.id, CoverImage.palette).where(
+            CoverImage.project_id == project_id,
+            CoverImage.palette.is_not(None),
         )
-        .scalars()
-        .all()
-    )
+    ).all()
+    if not candidates:
+        return []
+
+    dist = palette_distances([c.palette for c in candidates], target)
+    order = dist.argsort()[:limit]
+    distance = {
+        candidates[i].id: float(dist[i])
+        for i in order
+        if dist[i] != float("inf") and (max_distance is None or dist[i] <= max_distance)
+    }
+    if not distance:
+        return []
+
+    rows = db.execute(
+        select(CoverImage).options(joinedload(CoverImage.brief_direction)).where(CoverImage.id.in_(distance))
+    ).scalars().all()
+    rows.sort(key=lambda r: distance[r.id])
     return [
-        CoverImageListOut(
-            id=row.id,
-            project_id=row.project_id,
-            brief_run_id=row.brief_run_id,
-            direction_index=row.direction_index,
-            prompt=row.prompt,
-            model=row.model,
-            size=row.size,
-            image_url=f"/static/{row.image_path}",
-            created_at=row.created_at,
-        )
+        CoverImagePaletteMatchOut(**_image_list_out(row, palette_distance=round(distance[row.id], 3)))
         for row in rows
     ]
+
+
+@router.get(
+    "/{project_id}/images/{image_id}/near-duplicates",
+    response_model=list[CoverImageNearDuplicateOut],
+)
+def list_near_duplicates(
+    project_id: UUID,
+    image_id: UUID,
+    max_distance: int = Query(default=DEFAULT_NEAR_DUPLICATE_DISTANCE, ge=0, le=32),
+    db: Session = Depends(get_db),
+) -> list[CoverImageNearDuplicateOut]:
+    image = db.get(CoverImage, image_id)
+    if not image or image.project_id != project_id:
+        raise HTTPException(status_code=404, detail="Image not found")
+    if image.phash is None:
+        raise HTTPException(status_code=409, detail="Image has no perceptual hash")
+
+    candidates = db.execute(
+        select(CoverImage.id, CoverImage.phash).where(
+            CoverImage.project_id == project_id,
+            CoverImage.id != image_id,
+            CoverImage.phash.is_not(None),
+        )
+    ).all()
+
+    from app.services.image_hashing import find_near_duplicates  # numpy: load on demand
+
+    matches = find_near_duplicates(image.phash, [(c.id, c.phash) for c in candidates], max_distance)
+    if not matches:
+        return []
+
+    distance = dict(matches)
+    rows = db.execute(
+        select(CoverImage).options(joinedload(CoverImage.brief_direction)).where(CoverImage.id.in_(distance))
+    ).scalars().all()
+    rows.sort(key=lambda r: distance[r.id])
+    return [CoverImageNearDuplicateOut(**_image_list_out(row, distance=distance[row.id])) for row in rows]
+
+
+@router.get("/{project_id}/contact-sheet", response_model=ContactSheetOut)
+def get_contact_sheet(
+    project_id: UUID,
+    page: int = Query(default=0, ge=0),
+    cols: int = Query(default=6, ge=1, le=12),
+    rows: int = Query(default=5, ge=1, le=12),
+    thumb_w: int = Query(default=160, ge=32, le=512),
+    thumb_h: int = Query(default=240, ge=32, le=768),
+    fmt: Literal["jpeg", "webp"] = Query(default="jpeg", alias="format"),
+    db: Session = Depends(get_db),
+) -> ContactSheetOut:
+    """
+    One page of the gallery as a single thumbnail grid + a map of cell
+    coordinates to image ids. Pages are cached on disk, keyed by the project's
+    image-set fingerprint, so a new image invalidates them automatically.
+    """
+    proj = db.get(Project, project_id)
+    if not proj:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    total, newest = db.execute(
+        select(func.count(CoverImage.id), func.max(CoverImage.created_at)).where(
+            CoverImage.project_id == project_id
+        )
+    ).one()
+
+    per_page = cols * rows
+    pages = max(1, -(-total // per_page))
+    if page >= pages:
+        raise HTTPException(status_code=404, detail="Contact sheet page out of range")
+
+    storage_root = Path(get_settings().storage_dir)
+    fingerprint = f"{total}:{newest.isoformat() if newest else ''}"
+    key = sheet_cache_key(
+        fingerprint=fingerprint,
+        page=page,
+        cols=cols,
+        rows=rows,
+        thumb_w=thumb_w,
+        thumb_h=thumb_h,
+        fmt=fmt,
+    )
+
+    cached = load_cached_sheet(storage_root, project_id, key)
+    if cached is not None:
+        return cached
+
+    images = db.execute(
+        select(CoverImage.id, CoverImage.image_path)
+        .where(CoverImage.project_id == project_id)
+        .order_by(CoverImage.created_at.desc())
+        .offset(page * per_page)
+        .limit(per_page)
+    ).all()
+
+    return render_contact_sheet(
+        storage_root=storage_root,
+        project_id=project_id,
+        key=key,
+        images=[(row.id, row.image_path) for row in images],
+        page=page,
+        pages=pages,
+        total=total,
+        cols=cols,
+        rows=rows,
+        thumb_w=thumb_w,
+        thumb_h=thumb_h,
+        fmt=fmt,
+    )
+
+
+@router.get("/{project_id}/export.zip")
+def export_project(project_id: UUID, request: Request, db: Session = Depends(get_db)) -> StreamingResponse:
+    """
+    Stream a ZIP of every image file and brief run. The archive is
+    reproducible for a given ETag, so interrupted downloads can resume with
+    `Range: bytes=<offset>-` (+ `If-Range: <etag>`).
+    """
+    storage_root = Path(get_settings().storage_dir)
+    # rows are read once, in one snapshot; the body streams from this manifest
+    manifest = take_export_manifest(db, storage_root, project_id)
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    etag = f'"{manifest.etag}"'
+    total = manifest.size
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Content-Disposition": f'attachment; filename="project-{project_id}.zip"',
+    }
+
+    start, end = 0, total - 1
+    status_code = 200
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (if_range is None or if_range == etag):
+        m = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+        if not m or (not m.group(1) and not m.group(2)):
+            raise HTTPException(status_code=416, detail="Invalid Range", headers={"Content-Range": f"bytes */{total}"})
+        if m.group(1):
+            start = int(m.group(1))
+            end = min(int(m.group(2)), total - 1) if m.group(2) else total - 1
+        else:  # suffix range: last N bytes
+            start = max(total - int(m.group(2)), 0)
+        if start > end:
+            raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{total}"})
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_zip_range(manifest, start, end), status_code=status_code, media_type="application/zip", headers=headers
+    )
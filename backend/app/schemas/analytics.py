@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CallStatsRow(BaseModel):
+    key: str
+    calls: int
+    errors: int
+
+    p50_latency_ms: Optional[float] = None
+    p95_latency_ms: Optional[float] = None
+
+    input_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    image_bytes: Optional[int] = None
+
+    estimated_cost_usd: float
+    cost_per_call_usd: Optional[float] = None
+    # images only: finalized covers (tier "final") and the group's spend per one
+    accepted_covers: Optional[int] = None
+    cost_per_accepted_cover_usd: Optional[float] = None
+
+
+class HedgeModelLatency(BaseModel):
+    model: str
+    samples: int
+    p95_latency_ms: Optional[float] = None
+
+
+class HedgeStatsOut(BaseModel):
+    """Hedged text calls in this API process since it started."""
+    enabled: bool
+    calls: int
+    hedged: int
+    hedge_wins: int
+    hedge_rate: float
+    extra_cost_usd: float
+    models: list[HedgeModelLatency]
+
+
+class RouteModelHealth(BaseModel):
+    kind: str  # "text" | "image"
+    model: str
+    variant: Optional[str] = None  # image quality
+    samples: int
+    error_rate: float
+    p95_latency_ms: Optional[float] = None
+
+
+class RoutingStatsOut(BaseModel):
+    """Adaptive model routing in this API process: outcomes from the last window_s seconds."""
+    window_s: float
+    text_slo_s: float
+    image_slo_s: float
+    # what a call without an explicit model would use right now (image: at the default quality)
+    text_model: str
+    text_route_reason: Optional[str] = None
+    image_model: str
+    image_route_reason: Optional[str] = None
+    models: list[RouteModelHealth]
+
+
+class CallStatsOut(BaseModel):
+    kind: str
+    group_by: str
+    since: datetime
+    rows: list[CallStatsRow]
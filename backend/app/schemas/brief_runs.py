@@ -13,8 +13,53 @@ class BriefRunOut(BaseModel):
     error_message: Optional[str] = None
     created_at: datetime
 
+    prompt_version: Optional[str] = None
+    input_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    total_tokens: Optional[int] = None
+    repair_status: Optional[str] = None
+    repair_tokens: Optional[int] = None
+    requested_model: Optional[str] = None
+    route_reason: Optional[str] = None
+
     request_json: dict[str, Any]
     response_json: dict[str, Any]
 
     class Config:
         from_attributes = True
+
+
+class BriefDirectionOut(BaseModel):
+    id: UUID
+    brief_run_id: UUID
+    position: int
+
+    name: str
+    one_liner: str
+    imagery: str
+    typography: str
+    color_palette: str
+    layout_notes: str
+    avoid: str
+    image_prompt: str
+
+    class Config:
+        from_attributes = True
+
+
+class BriefRunSummaryOut(BaseModel):
+    """A run without its request/response JSON, for history lists."""
+    id: UUID
+    project_id: UUID
+    model: str
+    status: str
+    error_message: Optional[str] = None
+    created_at: datetime
+    direction_names: list[str] = []
+
+
+class BriefRunSummaryPage(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    runs: list[BriefRunSummaryOut]
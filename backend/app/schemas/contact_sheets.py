@@ -0,0 +1,24 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ContactSheetCell(BaseModel):
+    image_id: UUID
+    x: int
+    y: int
+    w: int
+    h: int
+
+
+class ContactSheetOut(BaseModel):
+    page: int
+    pages: int
+    total: int
+    cols: int
+    rows: int
+    width: int
+    height: int
+
+    sheet_url: str
+    cells: list[ContactSheetCell]
@@ -17,6 +17,12 @@ class CoverBriefRequest(BaseModel):
     comps: List[str] = Field(default_factory=list)
     constraints: List[str] = Field(default_factory=list)
 
+    # queue cheap previews for the top directions in the background
+    speculative_previews: bool = False
+
+    # >1: request the directions as this many concurrent smaller calls (lower tail latency)
+    parallel_calls: int = Field(default=1, ge=1, le=6)
+
 class CoverDirection(BaseModel):
     name: str
     one_liner: str
@@ -27,6 +33,12 @@ class CoverDirection(BaseModel):
     avoid: str
     image_prompt: str
 
+class CoverBriefDirections(BaseModel):
+    """Shape the model must return (also used to build the structured-output schema)."""
+    directions: List[CoverDirection]
+
 class CoverBriefResponse(BaseModel):
     directions: List[CoverDirection]
     model: str
+    route_reason: Optional[str] = None  # why `model` was picked (see BriefRun.route_reason)
+    speculative_previews: int = 0  # previews queued for this brief
@@ -1,8 +1,15 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
+# Default Hamming distance (out of 64 hash bits) under which two images count as near-duplicates.
+DEFAULT_NEAR_DUPLICATE_DISTANCE = 6
+
+class PaletteColor(BaseModel):
+    hex: str
+    weight: float
+
 class CoverImageGenerateRequest(BaseModel):
     project_id: UUID
     brief_run_id: Optional[UUID] = None
@@ -15,15 +22,35 @@ class CoverImageGenerateRequest(BaseModel):
     model: Optional[str] = None
     size: Optional[str] = None
 
+    # cheap preview tier (preview size, lowest quality); finalize the ones worth keeping
+    preview: bool = False
+
+class CoverImageFinalizeRequest(BaseModel):
+    # regenerate: full-settings model call using the preview as reference
+    # upscale: local resample of the preview, no model call
+    mode: Literal["regenerate", "upscale"] = "regenerate"
+
+    model: Optional[str] = None
+    size: Optional[str] = None
+
 class CoverImageOut(BaseModel):
     id: UUID
     project_id: UUID
     brief_run_id: Optional[UUID]
     direction_index: Optional[int]
+    brief_direction_id: Optional[UUID] = None
 
     prompt: str
     model: str
     size: str
+    quality: Optional[str] = None
+
+    # adaptive routing: the default model and why `model` was used (None = not routed)
+    requested_model: Optional[str] = None
+    route_reason: Optional[str] = None
+
+    tier: Optional[str] = None
+    preview_image_id: Optional[UUID] = None
 
     image_url: str
 
@@ -36,10 +63,29 @@ class CoverImageListOut(BaseModel):
     project_id: UUID
     brief_run_id: Optional[UUID]
     direction_index: Optional[int]
+    brief_direction_id: Optional[UUID] = None
+    direction_name: Optional[str] = None
 
     prompt: str
     model: str
     size: str
+    quality: Optional[str] = None
+
+    tier: Optional[str] = None
+    preview_image_id: Optional[UUID] = None
 
     image_url: str
     created_at: datetime
+
+    palette: Optional[list[PaletteColor]] = None
+
+    # near-duplicates folded into this row when listing with collapse_duplicates
+    duplicates: int = 0
+
+
+class CoverImageNearDuplicateOut(CoverImageListOut):
+    distance: int
+
+
+class CoverImagePaletteMatchOut(CoverImageListOut):
+    palette_distance: float
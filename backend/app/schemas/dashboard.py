@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.brief_runs import BriefRunSummaryOut
+from app.schemas.projects import ProjectOut
+
+
+class ImageThumbOut(BaseModel):
+    id: UUID
+    brief_run_id: Optional[UUID]
+    direction_index: Optional[int]
+    model: str
+    size: str
+    tier: Optional[str] = None
+    image_url: str
+    created_at: datetime
+
+
+class DashboardRunOut(BriefRunSummaryOut):
+    image_count: int = 0  # the run's images (of the requested tier, if any)
+    images: list[ImageThumbOut] = []  # newest first, up to images_per_run
+
+
+class DashboardRunPage(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    runs: list[DashboardRunOut]
+
+
+class ProjectDashboardOut(BaseModel):
+    """Everything the project page shows on load, from one request."""
+    project: ProjectOut
+    image_total: int
+    brief_runs: DashboardRunPage
@@ -0,0 +1,23 @@
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.cover_brief import CoverDirection
+
+
+class SimilarDirectionOut(BaseModel):
+    brief_run_id: UUID
+    project_id: UUID
+    direction_index: int
+
+    # 1.0 = as similar as an identical direction
+    score: float
+    direction: CoverDirection
+
+
+class SimilarDirectionsOut(BaseModel):
+    results: list[SimilarDirectionOut]
+    indexed: int
+    took_ms: float
+    query: Optional[str] = None
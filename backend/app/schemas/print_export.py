@@ -0,0 +1,26 @@
+from typing import Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+class PrintExportRequest(BaseModel):
+    image_id: UUID
+
+    # trim size in inches, e.g. 6 x 9 trade paperback
+    trim_width_in: float = Field(gt=0, le=24)
+    trim_height_in: float = Field(gt=0, le=24)
+    bleed_in: float = Field(default=0.125, ge=0, le=1)
+    dpi: int = Field(default=300, ge=72, le=1200)
+
+    format: Literal["tiff", "pdf"] = "pdf"
+
+class PrintExportOut(BaseModel):
+    job_id: Optional[UUID] = None
+    image_id: UUID
+    status: Literal["queued", "running", "done", "failed"]
+
+    width_px: int
+    height_px: int
+    dpi: int
+
+    file_url: Optional[str] = None
+    error: Optional[str] = None
@@ -2,14 +2,15 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ProjectCreate(BaseModel):
-    title: str
-    author: str
-    genre: str
-    subgenre: Optional[str] = None
+    # lengths mirror the projects table columns
+    title: str = Field(max_length=255)
+    author: str = Field(max_length=255)
+    genre: str = Field(max_length=100)
+    subgenre: Optional[str] = Field(default=None, max_length=150)
 
 
 class ProjectOut(BaseModel):
@@ -22,3 +23,16 @@ class ProjectOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ProjectImportRejection(BaseModel):
+    line: int
+    errors: list[str]
+
+
+class ProjectImportReport(BaseModel):
+    inserted: int
+    rejected_count: int
+    rejected: list[ProjectImportRejection]
+    elapsed_ms: int
+    rows_per_second: float
@@ -0,0 +1,18 @@
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+class SpeculativeStatusOut(BaseModel):
+    project_id: UUID
+    brief_run_id: Optional[UUID] = None  # brief the current batch belongs to
+
+    pending: int = 0
+    running: int = 0
+    done: int = 0
+    failed: int = 0
+
+    budget_left: int  # speculative previews still allowed in the rolling 24h window
+
+class SpeculativeCancelOut(BaseModel):
+    project_id: UUID
+    cancelled: int  # queued previews dropped before they started
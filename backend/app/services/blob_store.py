@@ -0,0 +1,52 @@
+import hashlib
+import os
+from pathlib import Path
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import StorageBlob
+
+# Content-addressed layout under storage_dir: blobs/<aa>/<bb>/<sha256>.<ext>
+BLOBS_DIR = "blobs"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def blob_rel_path(sha256: str, ext: str = "png") -> str:
+    return f"{BLOBS_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}.{ext}"
+
+
+def write_blob_file(storage_root: Path, rel_path: str, data: bytes) -> None:
+    """Write once, atomically; identical content already on disk is left alone."""
+    abs_path = storage_root / rel_path
+    if abs_path.exists():
+        return
+    abs_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = abs_path.with_name(f"{abs_path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(abs_path)
+
+
+def store_blob(db: Session, storage_root: Path, data: bytes, *, ext: str = "png") -> tuple[str, str]:
+    """
+    Store `data` once per distinct content and take a reference on it.
+    Returns (sha256, relative path). The caller commits.
+    """
+    sha256 = content_hash(data)
+    rel_path = blob_rel_path(sha256, ext)
+
+    # Upsert first: it row-locks the blob, so a concurrent garbage collection of
+    # the same content either finishes before us (and we rewrite the file) or waits.
+    stmt = insert(StorageBlob).values(sha256=sha256, path=rel_path, size_bytes=len(data), ref_count=1)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[StorageBlob.sha256],
+            set_={"ref_count": StorageBlob.ref_count + 1},
+        )
+    )
+
+    write_blob_file(storage_root, rel_path, data)
+    return sha256, rel_path
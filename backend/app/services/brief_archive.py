@@ -0,0 +1,400 @@
+"""
+Cold storage for old brief runs.
+
+brief_runs is range-partitioned by created_at month (Postgres). Once a month
+is older than brief_archive_after_months, its runs' request/response JSON is
+moved into an append-only segment file,
+
+    storage_dir/archive/brief_runs/<YYYY-MM>.<codec>.seg
+
+one zlib stream per run, primed with a preset dictionary of the strings every
+brief repeats (keys, schema boilerplate), so even a 2 KB document compresses
+well and a single run reads back with one seek and one small inflate. The row
+keeps its metadata plus the segment path and byte range; its JSON columns
+become NULL and the month's partition is vacuumed, so the hot table only
+carries recent JSON.
+
+Readers go through load_run_json() / hydrate_run_dicts(), which return the
+columns for hot rows and inflate archived ones on demand.
+
+    python -m app.services.brief_archive                   # dry run: what would be archived
+    python -m app.services.brief_archive --apply
+    python -m app.services.brief_archive --apply --older-than-months 3 --vacuum-full
+    python -m app.services.brief_archive --apply --restore  # move everything back (e.g. before a downgrade)
+"""
+import argparse
+import json
+import os
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+import orjson
+from sqlalchemy import bindparam, func, null, select, text, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models import BriefRun
+
+ARCHIVE_DIR = "archive/brief_runs"
+
+# Segment codec, part of the file name so old segments stay readable if the
+# dictionary ever changes (add "z2", never edit an existing entry).
+CODEC = "z1"
+_ZDICTS = {
+    "z1": (
+        b'"sub_briefs":[{"approaches":[],"status":"ok","directions":2,"error":null}]'
+        b'"tone_words":[],"comps":[],"constraints":[],"speculative_previews":false,"parallel_calls":1}'
+        b'{"project_id":"","title":"","subtitle":null,"author":"","genre":"","subgenre":null,"blurb":null,'
+        b' cinematic lighting, high contrast, film grain, shallow depth of field, background only, no text'
+        b'{"directions":[{"name":"","one_liner":"","imagery":"","typography":"","color_palette":"",'
+        b'"layout_notes":"","avoid":"","image_prompt":""},{"name":"'
+    ),
+}
+
+# select these with the run's JSON columns, then pass the rows' dicts to hydrate_run_dicts
+ARCHIVE_COLUMNS = (BriefRun.archive_segment, BriefRun.archive_offset, BriefRun.archive_length)
+
+
+# ---- Encoding -----------------------------------------------------------------
+
+
+def segment_path(month: date) -> str:
+    return f"{ARCHIVE_DIR}/{month:%Y-%m}.{CODEC}.seg"
+
+
+def compress_run(request_json: Any, response_json: Any, codec: str = CODEC) -> bytes:
+    c = zlib.compressobj(level=9, zdict=_ZDICTS[codec])
+    return c.compress(orjson.dumps([request_json, response_json])) + c.flush()
+
+
+def decompress_run(blob: bytes, codec: str) -> tuple[Any, Any]:
+    d = zlib.decompressobj(zdict=_ZDICTS[codec])
+    request_json, response_json = orjson.loads(d.decompress(blob) + d.flush())
+    return request_json, response_json
+
+
+def read_archived(storage_root: Path, segment: str, offset: int, length: int) -> tuple[Any, Any]:
+    with open(storage_root / segment, "rb") as f:
+        f.seek(offset)
+        blob = f.read(length)
+    if len(blob) != length:
+        raise OSError(f"Archive segment {segment} is truncated at offset {offset}")
+    return decompress_run(blob, codec=segment.rsplit(".", 2)[-2])
+
+
+def load_run_json(run: Any, storage_root: Path) -> tuple[Any, Any]:
+    """(request_json, response_json) of a BriefRun (or a row with the same fields), archived or not."""
+    if run.archive_segment:
+        return read_archived(storage_root, run.archive_segment, run.archive_offset, run.archive_length)
+    return run.request_json, run.response_json
+
+
+def hydrate_run_dicts(items: Iterable[dict[str, Any]], storage_root: Path) -> list[dict[str, Any]]:
+    """Row dicts selected with ARCHIVE_COLUMNS: drop those keys, inflating archived runs' JSON."""
+    out = []
+    for item in items:
+        segment = item.pop("archive_segment")
+        offset, length = item.pop("archive_offset"), item.pop("archive_length")
+        if segment:
+            item["request_json"], item["response_json"] = read_archived(storage_root, segment, offset, length)
+        out.append(item)
+    return out
+
+
+# ---- Partitions ---------------------------------------------------------------
+
+
+def month_start(value: datetime | date) -> date:
+    """First day of value's month (of its UTC month, for aware datetimes)."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    y, m = divmod(month.month - 1 + n, 12)
+    return date(month.year + y, m + 1, 1)
+
+
+def _month_bounds(month: date) -> tuple[datetime, datetime]:
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    end_month = add_months(month, 1)
+    return start, datetime(end_month.year, end_month.month, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: date) -> str:
+    return f"brief_runs_{month:%Y_%m}"
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def partition_bound(month: date) -> str:
+    # explicit UTC: a bare date on a timestamptz column would follow the session TimeZone
+    return f"{month:%Y-%m-%d} 00:00:00+00"
+
+
+def _create_partition(db: Session, month: date) -> None:
+    name = partition_name(month)
+    lower, upper = partition_bound(month), partition_bound(add_months(month, 1))
+    in_default = db.execute(
+        text("SELECT EXISTS (SELECT 1 FROM brief_runs_default WHERE created_at >= :lower AND created_at < :upper)"),
+        {"lower": lower, "upper": upper},
+    ).scalar()
+    if not in_default:
+        db.execute(text(f"CREATE TABLE {name} PARTITION OF brief_runs FOR VALUES FROM ('{lower}') TO ('{upper}')"))
+        return
+
+    # runs for this month already landed in the default partition (the job ran
+    # late): Postgres refuses the new partition until they move out of it, so
+    # detach the default, create the month, move its rows over and reattach
+    db.execute(text("ALTER TABLE brief_runs DETACH PARTITION brief_runs_default"))
+    db.execute(text(f"CREATE TABLE {name} PARTITION OF brief_runs FOR VALUES FROM ('{lower}') TO ('{upper}')"))
+    db.execute(
+        text(
+            "WITH moved AS (DELETE FROM brief_runs_default WHERE created_at >= :lower AND created_at < :upper "
+            "RETURNING *) INSERT INTO brief_runs SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    db.execute(text("ALTER TABLE brief_runs ATTACH PARTITION brief_runs_default DEFAULT"))
+
+
+def ensure_partitions(db: Session, months_ahead: int, *, apply: bool) -> list[str]:
+    """Create missing monthly partitions from this month through months_ahead."""
+    if not _is_postgres(db):
+        return []
+    created = []
+    this_month = month_start(datetime.now(timezone.utc))
+    for i in range(months_ahead + 1):
+        month = add_months(this_month, i)
+        name = partition_name(month)
+        if db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+            continue
+        created.append(name)
+        if apply:
+            # one transaction per month: a failure leaves the default partition attached
+            _create_partition(db, month)
+            db.commit()
+    db.rollback()
+    return created
+
+
+def _vacuum_partition(db: Session, month: date, full: bool) -> str | None:
+    name = partition_name(month)
+    if not _is_postgres(db) or db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None:
+        return None
+    db.commit()
+    # VACUUM can't run inside a transaction; FULL also returns the space to the OS
+    # (exclusive lock, but only on this cold partition)
+    with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql(f"VACUUM ({'FULL, ' if full else ''}ANALYZE) {name}")
+    return name
+
+
+# ---- Archive / restore --------------------------------------------------------
+
+
+@dataclass
+class ArchiveReport:
+    months: list[str] = field(default_factory=list)
+    runs: int = 0
+    json_bytes: int = 0
+    archived_bytes: int = 0
+    partitions_created: list[str] = field(default_factory=list)
+    partitions_vacuumed: list[str] = field(default_factory=list)
+
+
+def archivable_months(db: Session, before: date) -> list[date]:
+    """Months before `before` that still hold un-archived runs, oldest first."""
+    cutoff, _ = _month_bounds(before)
+    oldest = db.execute(
+        select(func.min(BriefRun.created_at)).where(BriefRun.archived_at.is_(None), BriefRun.created_at < cutoff)
+    ).scalar()
+    if oldest is None:
+        return []
+    months, month = [], month_start(oldest)
+    while month < before:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+_archive_update = (
+    update(BriefRun.__table__)
+    .where(BriefRun.id == bindparam("b_id"), BriefRun.created_at == bindparam("b_created_at"))
+    .values(
+        request_json=null(),
+        response_json=null(),
+        archive_segment=bindparam("b_segment"),
+        archive_offset=bindparam("b_offset"),
+        archive_length=bindparam("b_length"),
+        archived_at=bindparam("b_archived_at"),
+    )
+)
+
+
+def archive_month(
+    db: Session, storage_root: Path, month: date, *, apply: bool, batch: int, report: ArchiveReport
+) -> int:
+    """Move one month's run JSON into its segment file. Returns runs archived (or that would be)."""
+    start, end = _month_bounds(month)
+    segment = segment_path(month)
+    path = storage_root / segment
+    after: tuple[datetime, Any] | None = None
+    count = 0
+
+    while True:
+        stmt = select(BriefRun.id, BriefRun.created_at, BriefRun.request_json, BriefRun.response_json).where(
+            BriefRun.created_at >= start, BriefRun.created_at < end, BriefRun.archived_at.is_(None)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(BriefRun.created_at, BriefRun.id) > after)
+        rows = db.execute(stmt.order_by(BriefRun.created_at, BriefRun.id).limit(batch)).all()
+        if not rows:
+            break
+        after = (rows[-1].created_at, rows[-1].id)
+
+        blobs = [compress_run(r.request_json, r.response_json) for r in rows]
+        count += len(rows)
+        report.json_bytes += sum(len(orjson.dumps([r.request_json, r.response_json])) for r in rows)
+        report.archived_bytes += sum(len(b) for b in blobs)
+        if not apply:
+            continue
+
+        # segment first (fsynced), then the rows: a crash in between leaves
+        # unreferenced bytes in the segment, never a row pointing at nothing
+        path.parent.mkdir(parents=True, exist_ok=True)
+        params = []
+        now = datetime.now(timezone.utc)
+        with open(path, "ab") as f:
+            offset = f.tell()
+            for row, blob in zip(rows, blobs):
+                f.write(blob)
+                params.append(
+                    {
+                        "b_id": row.id,
+                        "b_created_at": row.created_at,
+                        "b_segment": segment,
+                        "b_offset": offset,
+                        "b_length": len(blob),
+                        "b_archived_at": now,
+                    }
+                )
+                offset += len(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        db.execute(_archive_update, params)
+        db.commit()
+
+    db.rollback()
+    return count
+
+
+def restore_archived(db: Session, storage_root: Path, *, apply: bool, batch: int) -> int:
+    """Put archived JSON back into the rows (segments are left for the orphan cleanup)."""
+    restored = 0
+    after: tuple[datetime, Any] | None = None
+    while True:
+        stmt = select(BriefRun.id, BriefRun.created_at, *ARCHIVE_COLUMNS).where(BriefRun.archived_at.is_not(None))
+        if after is not None:
+            stmt = stmt.where(tuple_(BriefRun.created_at, BriefRun.id) > after)
+        rows = db.execute(stmt.order_by(BriefRun.created_at, BriefRun.id).limit(batch)).all()
+        if not rows:
+            break
+        after = (rows[-1].created_at, rows[-1].id)
+        restored += len(rows)
+        if not apply:
+            continue
+        for row in rows:
+            request_json, response_json = load_run_json(row, storage_root)
+            db.execute(
+                update(BriefRun.__table__)
+                .where(BriefRun.id == row.id, BriefRun.created_at == row.created_at)
+                .values(
+                    request_json=request_json,
+                    response_json=response_json,
+                    archive_segment=None,
+                    archive_offset=None,
+                    archive_length=None,
+                    archived_at=None,
+                )
+            )
+        db.commit()
+    db.rollback()
+    return restored
+
+
+def run_archive(
+    db: Session,
+    storage_root: Path,
+    *,
+    apply: bool = False,
+    older_than_months: int = 6,
+    months_ahead: int = 3,
+    batch: int = 500,
+    vacuum_full: bool = False,
+) -> ArchiveReport:
+    report = ArchiveReport()
+    report.partitions_created = ensure_partitions(db, months_ahead, apply=apply)
+
+    before = add_months(month_start(datetime.now(timezone.utc)), -older_than_months)
+    for month in archivable_months(db, before):
+        count = archive_month(db, storage_root, month, apply=apply, batch=batch, report=report)
+        if count:
+            report.runs += count
+            report.months.append(f"{month:%Y-%m}")
+            if apply:
+                vacuumed = _vacuum_partition(db, month, full=vacuum_full)
+                if vacuumed:
+                    report.partitions_vacuumed.append(vacuumed)
+    return report
+
+
+def main() -> None:
+    from app.db import SessionLocal
+    from app.settings import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Archive old brief-run JSON to compressed cold storage")
+    parser.add_argument("--apply", action="store_true", help="write segments and update rows (default: dry run)")
+    parser.add_argument(
+        "--older-than-months",
+        type=int,
+        default=settings.brief_archive_after_months,
+        help="archive months that ended at least this many months ago",
+    )
+    parser.add_argument("--months-ahead", type=int, default=3, help="create partitions this far ahead")
+    parser.add_argument("--batch", type=int, default=500, help="runs per segment write / commit")
+    parser.add_argument("--vacuum-full", action="store_true", help="VACUUM FULL archived partitions")
+    parser.add_argument("--restore", action="store_true", help="move all archived JSON back into the table")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        storage_root = Path(settings.storage_dir)
+        if args.restore:
+            result: dict = {"restored": restore_archived(db, storage_root, apply=args.apply, batch=args.batch)}
+        else:
+            result = asdict(
+                run_archive(
+                    db,
+                    storage_root,
+                    apply=args.apply,
+                    older_than_months=args.older_than_months,
+                    months_ahead=args.months_ahead,
+                    batch=args.batch,
+                    vacuum_full=args.vacuum_full,
+                )
+            )
+    finally:
+        db.close()
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.schemas.cover_brief import CoverBriefDirections, CoverBriefRequest
+
+# Bump whenever BRIEF_PROMPT_PREFIX changes: it is recorded on every BriefRun and
+# used as the provider prompt-cache key, so runs stay comparable across edits.
+BRIEF_PROMPT_VERSION = "brief-v4"
+
+# Visual approaches a brief's directions are spread across; parallel sub-briefs
+# assign each call its own slice of them (app.services.sub_briefs).
+DIVERSITY_APPROACHES = (
+    "photographic, cinematic realism",
+    "illustrated or painterly artwork",
+    "type-led minimalism with a single restrained graphic element",
+    "a symbolic object or still life",
+    "setting-led landscape or environment",
+    "abstract texture, pattern or color field",
+)
+
+# Static instructions, schema and rubric. Kept byte-for-byte identical across
+# requests so the provider can serve it from its prompt cache; per-book details
+# go AFTER it. It must stay above the provider's caching minimum (1024 tokens),
+# which tests/test_brief_prompt.py checks.
+BRIEF_PROMPT_PREFIX = (
+    """
+You are a professional book cover art director.
+
+Generate distinct cover directions for the book described at the end of this prompt,
+as many as it asks for.
+Return STRICT JSON only (no markdown) with this exact shape:
+
+{
+  "directions": [
+    {
+      "name": "string",
+      "one_liner": "string",
+      "imagery": "string",
+      "typography": "string",
+      "color_palette": "string",
+      "layout_notes": "string",
+      "avoid": "string",
+      "image_prompt": "string"
+    }
+  ]
+}
+
+Guidelines:
+- Make these market-aware for the stated genre/subgenre.
+- Ensure strong thumbnail readability.
+- Image prompts describe BACKGROUND ART ONLY (no text in the image).
+- Each direction must feel clearly different.
+
+Field rubric:
+- name: two to four words that a designer could use to refer to the direction
+  in conversation ("Drowned Lanterns", "Salt and Iron"). No genre labels, no
+  series numbering, and never the book's title.
+- one_liner: one sentence, under 25 words, saying what the cover promises the
+  reader and why it suits this book. Write it as a pitch, not a description.
+- imagery: the focal subject, its setting and the mood, in two or three
+  sentences. Name one clear focal point; say where the eye lands first and
+  what is deliberately left out or in shadow.
+- typography: the type treatment for title and author: serif, sans or script;
+  weight and case; tracking; whether the title is stacked, set on a curve or
+  integrated into the art; and which of title or author dominates.
+- color_palette: three to five named colors with their roles (background,
+  focal accent, type color), plus the overall value contrast, e.g. "deep
+  teal ground, bone white type, single ember orange accent; high contrast".
+- layout_notes: where the focal subject sits, where the title and author go,
+  how much clear space the type needs, and how the composition survives a
+  crop to a square thumbnail and to a spine.
+- avoid: the clichés and pitfalls this direction must steer clear of for the
+  genre, concretely ("no silhouetted couple at sunset", "no lens flare").
+- image_prompt: a self-contained prompt for an image model that produces the
+  background art for this direction: subject, setting, composition, lighting,
+  medium or rendering style, palette, and the empty areas reserved for type.
+  60 to 120 words. It must never ask for letters, words, logos, signatures,
+  watermarks or a book mockup.
+
+Quality rubric (check every direction against it before answering):
+1. Thumbnail test: at 150 pixels tall the focal point and the title area still
+   read as distinct shapes with strong value contrast.
+2. Genre signal: a reader browsing the stated genre recognises it within a
+   second, through palette, type and subject, without the cover copying the
+   comps listed for the book.
+3. Specificity: the imagery comes from this book's blurb, setting and tone
+   words, not from the genre in general; swap in another book of the same
+   genre and the direction should no longer fit.
+4. Type room: the composition leaves calm, low-detail space where the title
+   and author will be set, and says where it is.
+5. Distinctness: across the directions, vary the approach, the focal subject,
+   the palette family and the typographic voice; no two directions may share
+   more than one of these.
+6. Constraints: honour every constraint listed for the book (for example
+   "no faces" or "series look"); when a constraint conflicts with a guideline
+   above, the constraint wins.
+
+Visual approaches to spread the directions across, when none are assigned:
+"""
+    + "\n".join(f"- {a}" for a in DIVERSITY_APPROACHES)
+    + """
+
+Genre conventions to respect (and to subvert only on purpose):
+- Romance: warm or jewel-toned palettes, script or elegant serif titles, a
+  couple, a single figure or a meaningful object; rom-coms lean illustrated.
+- Thriller and crime: high contrast, bold condensed sans titles, lone figures,
+  urban or isolated settings, a single saturated accent color.
+- Fantasy: rich textures, ornate or carved serif titles, emblems, weapons,
+  maps or vast landscapes; epic scale for epic fantasy, intimacy for cozy.
+- Science fiction: clean geometric type, cool palettes with luminous accents,
+  scale contrast between figure and structure or sky.
+- Mystery: moody settings and telling objects; cozy mysteries go illustrated
+  with bright palettes, a location and a pet or prop; noir goes photographic.
+- Historical fiction: period-true costume, architecture and objects, muted or
+  painterly palettes, classic serif titles; figures are often seen from behind.
+- Horror: dark grounds, distressed or sharp type, negative space that feels
+  occupied, one unsettling detail rather than gore.
+- Young adult: bold saturated color, a striking central symbol or a figure
+  with attitude, expressive hand-lettered or heavy display type.
+- Literary fiction: restrained palettes, generous white space, typographic or
+  symbolic covers that reward a second look.
+- Nonfiction: a clear promise in the one_liner, confident type, a single
+  strong concept image or a typographic solution.
+- Memoir: an authentic, personal image (a place, an object, a candid figure),
+  quiet palettes and understated type.
+
+Writing the image_prompt:
+- Open with the medium and style ("oil painting", "35mm photograph", "flat
+  vector illustration"), then the subject, then the setting.
+- State the camera or viewpoint and the lighting: low angle, overhead, close
+  crop; golden hour, overcast, rim light, candlelight.
+- Place the subject explicitly ("in the lower third", "off-center right") and
+  name the empty area for type ("clear dark sky across the top third").
+- Repeat the palette in plain color words the image model understands.
+- Portrait orientation, 2:3, full bleed; no borders, frames or mockups.
+- Never describe text, lettering or a title, even as part of the scene
+  (no shop signs, book spines, newspapers or inscriptions).
+""".strip()
+)
+
+
+# A full brief; parallel sub-briefs split this count across their calls
+BRIEF_DIRECTION_COUNT = 6
+
+
+def build_brief_book_details(payload: CoverBriefRequest) -> str:
+    return f"""
+Book:
+- Title: {payload.title}
+- Subtitle: {payload.subtitle or ""}
+- Author: {payload.author}
+- Genre: {payload.genre}
+- Subgenre: {payload.subgenre or ""}
+- Blurb: {payload.blurb or ""}
+
+Tone words: {", ".join(payload.tone_words) if payload.tone_words else ""}
+Comps: {", ".join(payload.comps) if payload.comps else ""}
+Constraints: {", ".join(payload.constraints) if payload.constraints else ""}
+""".strip()
+
+
+def build_brief_prompt(
+    payload: CoverBriefRequest,
+    count: int = BRIEF_DIRECTION_COUNT,
+    approaches: list[str] | None = None,
+) -> str:
+    """
+    Cacheable static prefix first, variable book details last. `approaches`
+    steers each direction toward a different visual approach (one each, in
+    order), so separately generated sub-briefs don't converge on the same idea.
+    """
+    ask = f"Directions to generate: {count}"
+    if approaches:
+        ask += "\nOne direction per visual approach, in this order:\n" + "\n".join(f"- {a}" for a in approaches)
+    return f"{BRIEF_PROMPT_PREFIX}\n\n{build_brief_book_details(payload)}\n\n{ask}"
+
+
+def strict_json_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """
+    Pydantic JSON schema adjusted for strict structured output: every object
+    closes additionalProperties and lists all of its properties as required.
+    """
+    schema = model.model_json_schema()
+
+    def close(node: Any) -> None:
+        if isinstance(node, dict):
+            if node.get("type") == "object" and "properties" in node:
+                node["additionalProperties"] = False
+                node["required"] = list(node["properties"])
+            if isinstance(node.get("title"), str):  # schema title, not a property named "title"
+                del node["title"]
+            for value in node.values():
+                close(value)
+        elif isinstance(node, list):
+            for value in node:
+                close(value)
+
+    close(schema)
+    return schema
+
+
+# Responses API `text.format` for brief generation (and for the repair pass).
+BRIEF_RESPONSE_FORMAT: dict[str, Any] = {
+    "type": "json_schema",
+    "name": "cover_brief",
+    "schema": strict_json_schema(CoverBriefDirections),
+    "strict": True,
+}
+
+
+def build_brief_repair_prompt(raw_text: str, error: str) -> str:
+    """Cheap second pass: fix malformed/partial output instead of regenerating the brief."""
+    return f"""
+The text below was supposed to be JSON describing book cover directions, but it failed validation.
+Repair it into valid JSON matching the required schema. Keep the existing content; only fill in
+missing fields with short, consistent values if the text was truncated. Return JSON only.
+
+Validation error: {error}
+
+Text:
+{raw_text}
+""".strip()
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Contact sheets live next to the images so they are served by the same /static mount:
+#   storage/sheets/<project_id>/<cache_key>.<ext>   (the rendered grid)
+#   storage/sheets/<project_id>/<cache_key>.json    (cell -> image id map)
+SHEETS_DIR = "sheets"
+
+SHEET_FORMATS = {"jpeg": "jpg", "webp": "webp"}
+
+BACKGROUND = (20, 20, 24)
+
+
+def sheets_dir(storage_root: Path, project_id: UUID) -> Path:
+    return storage_root / SHEETS_DIR / str(project_id)
+
+
+def sheet_cache_key(
+    *,
+    fingerprint: str,
+    page: int,
+    cols: int,
+    rows: int,
+    thumb_w: int,
+    thumb_h: int,
+    fmt: str,
+) -> str:
+    """
+    Stable key for one rendered page. The fingerprint changes whenever the
+    project's image set changes, so stale sheets are never served.
+    """
+    raw = f"{fingerprint}|{page}|{cols}x{rows}|{thumb_w}x{thumb_h}|{fmt}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def load_cached_sheet(storage_root: Path, project_id: UUID, key: str) -> dict[str, Any] | None:
+    manifest = sheets_dir(storage_root, project_id) / f"{key}.json"
+    if not manifest.exists():
+        return None
+    try:
+        return json.loads(manifest.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def invalidate_project_sheets(storage_root: Path, project_id: UUID) -> None:
+    """Drop every cached sheet for a project (called when its image set changes)."""
+    shutil.rmtree(sheets_dir(storage_root, project_id), ignore_errors=True)
+
+
+def _paste_thumbnail(sheet: "Image.Image", src_path: Path, x: int, y: int, thumb_w: int, thumb_h: int) -> bool:
+    from PIL import Image
+
+    try:
+        with Image.open(src_path) as src:
+            # draft() lets JPEG sources decode at reduced scale; no-op for PNG
+            src.draft("RGB", (thumb_w, thumb_h))
+            src = src.convert("RGB")
+            src.thumbnail((thumb_w, thumb_h), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            off_x = x + (thumb_w - src.width) // 2
+            off_y = y + (thumb_h - src.height) // 2
+            sheet.paste(src, (off_x, off_y))
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def render_contact_sheet(
+    *,
+    storage_root: Path,
+    project_id: UUID,
+    key: str,
+    images: list[tuple[UUID, str]],
+    page: int,
+    pages: int,
+    total: int,
+    cols: int,
+    rows: int,
+    thumb_w: int,
+    thumb_h: int,
+    fmt: str,
+    gap: int = 4,
+) -> dict[str, Any]:
+    """
+    Render one page of thumbnails into a single image and write it plus its
+    JSON manifest to the sheet cache. `images` is [(image_id, image_path), ...]
+    in display order.
+    """
+    from PIL import Image  # deferred: keeps route imports light
+
+    ext = SHEET_FORMATS[fmt]
+    used_rows = max(1, -(-len(images) // cols))
+
+    width = cols * thumb_w + (cols + 1) * gap
+    height = used_rows * thumb_h + (used_rows + 1) * gap
+    sheet = Image.new("RGB", (width, height), color=BACKGROUND)
+
+    cells: list[dict[str, Any]] = []
+    for i, (image_id, image_path) in enumerate(images):
+        col, row = i % cols, i // cols
+        x = gap + col * (thumb_w + gap)
+        y = gap + row * (thumb_h + gap)
+        if not _paste_thumbnail(sheet, storage_root / image_path, x, y, thumb_w, thumb_h):
+            continue
+        cells.append({"image_id": str(image_id), "x": x, "y": y, "w": thumb_w, "h": thumb_h})
+
+    out_dir = sheets_dir(storage_root, project_id)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    sheet_path = out_dir / f"{key}.{ext}"
+    tmp_sheet = out_dir / f"{key}.{ext}.tmp"
+    if fmt == "webp":
+        sheet.save(tmp_sheet, format="WEBP", quality=80, method=4)
+    else:
+        sheet.save(tmp_sheet, format="JPEG", quality=82, optimize=True, progressive=True)
+    tmp_sheet.replace(sheet_path)
+
+    manifest = {
+        "page": page,
+        "pages": pages,
+        "total": total,
+        "cols": cols,
+        "rows": rows,
+        "width": width,
+        "height": height,
+        "sheet_url": f"/static/{SHEETS_DIR}/{project_id}/{key}.{ext}",
+        "cells": cells,
+    }
+
+    # write the manifest last: its presence marks the cache entry as complete
+    manifest_path = out_dir / f"{key}.json"
+    tmp_manifest = out_dir / f"{key}.json.tmp"
+    tmp_manifest.write_text(json.dumps(manifest), encoding="utf-8")
+    tmp_manifest.replace(manifest_path)
+
+    return manifest
@@ -0,0 +1,154 @@
+"""
+Request deadlines and cancellation for upstream calls.
+
+Each HTTP request gets a Deadline: an expiry taken from the client's
+X-Request-Timeout header (seconds, capped by request_timeout_max_s) plus a
+cancel flag that is set when the client disconnects. It travels with the
+request in a ContextVar, the same way the profiling span collector does, so
+it reaches threadpool workers and anything they copy the context into.
+
+OpenAIClient bounds every call by the time left and stops waiting as soon as
+the request is cancelled, which frees the worker. The SDK call itself runs on
+the async client and is cancelled with it: its HTTP request is closed and its
+concurrency slot freed.
+"""
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Event
+from typing import Iterator
+
+# how often a waiting worker re-checks the cancel flag
+CANCEL_POLL_S = 0.25
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class RequestCancelled(RuntimeError):
+    pass
+
+
+@dataclass
+class Deadline:
+    expires_at: float | None = None  # time.monotonic(); None = no request-wide deadline
+    cancelled: Event = field(default_factory=Event)
+
+    def remaining(self) -> float | None:
+        return None if self.expires_at is None else self.expires_at - time.monotonic()
+
+
+_current: ContextVar[Deadline | None] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[Deadline]:
+    deadline = Deadline(expires_at=None if seconds is None else time.monotonic() + seconds)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def time_left(op_timeout_s: float) -> float:
+    """Seconds an operation may take: its own timeout, shortened by the request deadline."""
+    deadline = _current.get()
+    if deadline is None:
+        return op_timeout_s
+    if deadline.cancelled.is_set():
+        raise RequestCancelled("Client disconnected")
+    remaining = deadline.remaining()
+    if remaining is None:
+        return op_timeout_s
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(op_timeout_s, remaining)
+
+
+def wait_first(futures: list[Future], timeout_s: float) -> Future | None:
+    """
+    First future to complete successfully, or None once timeout_s passes.
+    Raises the first error if every future failed, and RequestCancelled if the
+    request is cancelled while waiting.
+    """
+    deadline = _current.get()
+    ends = time.monotonic() + timeout_s
+    pending = set(futures)
+    while pending:
+        if deadline is not None and deadline.cancelled.is_set():
+            raise RequestCancelled("Client disconnected")
+        left = ends - time.monotonic()
+        if left <= 0:
+            return None
+        done, pending = wait(pending, timeout=min(left, CANCEL_POLL_S), return_when=FIRST_COMPLETED)
+        for f in done:
+            if f.exception() is None:
+                return f
+    # every future failed: surface the first one's error
+    raise futures[0].exception()
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware opening a deadline_scope per HTTP request. Once the request
+    body has been read it is the only reader of `receive`, so it sees the
+    client's disconnect and sets the cancel flag; the app below gets the
+    disconnect message from it when it asks.
+    """
+
+    def __init__(self, app, max_seconds: float) -> None:
+        self.app = app
+        self.max_seconds = max_seconds
+
+    def _seconds(self, scope) -> float | None:
+        for name, value in scope.get("headers") or ():
+            if name == b"x-request-timeout":
+                try:
+                    seconds = float(value)
+                except ValueError:
+                    return None
+                return min(seconds, self.max_seconds) if seconds > 0 else None
+        return None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with deadline_scope(self._seconds(scope)) as deadline:
+            body_read = asyncio.Event()
+            disconnected = asyncio.Event()
+
+            async def receive_wrapper():
+                if body_read.is_set():
+                    await disconnected.wait()
+                    return {"type": "http.disconnect"}
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    deadline.cancelled.set()
+                    disconnected.set()
+                elif not message.get("more_body", False):
+                    body_read.set()
+                return message
+
+            async def watch_disconnect():
+                await body_read.wait()
+                while (await receive())["type"] != "http.disconnect":
+                    pass
+                deadline.cancelled.set()
+                disconnected.set()
+
+            watcher = asyncio.create_task(watch_disconnect())
+            try:
+                await self.app(scope, receive_wrapper, send)
+            finally:
+                watcher.cancel()
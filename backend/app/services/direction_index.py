@@ -0,0 +1,268 @@
+"""
+In-process similarity index over brief directions.
+
+Each direction's imagery, color_palette and image_prompt text becomes a bag
+of unigrams + bigrams. Postings (doc ids + term frequencies) are kept as NumPy
+arrays per term and scored with BM25 (a saturating TF-IDF), so a query only
+touches the postings of its own terms. Documents are appended as runs are
+saved; IDF and length normalisation are computed at query time, so nothing is
+ever re-weighted or rebuilt.
+
+Runs saved by other processes are picked up by sync(). A run's created_at is
+its transaction's start, which can precede its commit by a whole request, so
+each sync re-reads a window before the newest run it has seen; runs already
+indexed are skipped by id.
+"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Iterable
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import BriefDirection, BriefRun
+
+INDEXED_FIELDS = ("imagery", "color_palette", "image_prompt")
+
+_DIRECTION_COLUMNS = (
+    BriefDirection.name,
+    BriefDirection.one_liner,
+    BriefDirection.imagery,
+    BriefDirection.typography,
+    BriefDirection.color_palette,
+    BriefDirection.layout_notes,
+    BriefDirection.avoid,
+    BriefDirection.image_prompt,
+)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has in into is it its of on or over the this to under with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    words = [w for w in _TOKEN.findall(text.lower()) if len(w) > 1 and w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def direction_text(direction: dict[str, Any]) -> str:
+    return " ".join(str(direction.get(f) or "") for f in INDEXED_FIELDS)
+
+
+@dataclass
+class _Posting:
+    doc_ids: list[int] = field(default_factory=list)
+    tfs: list[int] = field(default_factory=list)
+    # live documents containing the term (doc_ids also keeps tombstoned ones)
+    df: int = 0
+    frozen: tuple[np.ndarray, np.ndarray] | None = None
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.frozen is None or len(self.frozen[0]) != len(self.doc_ids):
+            self.frozen = (np.asarray(self.doc_ids, dtype=np.int32), np.asarray(self.tfs, dtype=np.float32))
+        return self.frozen
+
+
+@dataclass
+class DirectionHit:
+    brief_run_id: UUID
+    project_id: UUID
+    direction_index: int
+    score: float
+    direction: dict[str, Any]
+
+
+class DirectionIndex:
+    def __init__(self, sync_overlap_s: float = 900.0) -> None:
+        self.sync_overlap = timedelta(seconds=sync_overlap_s)
+        self._lock = Lock()
+        self._postings: dict[str, _Posting] = {}
+        self._doc_len = np.zeros(1024, dtype=np.float32)
+        self._docs: list[tuple[UUID, UUID, int, dict[str, Any]]] = []
+        self._alive = np.zeros(1024, dtype=bool)
+        self._project_code = np.zeros(1024, dtype=np.int32)
+        self._project_codes: dict[UUID, int] = {}
+        self._doc_by_key: dict[tuple[UUID, int], int] = {}
+        self._total_len = 0.0
+        self._runs: set[UUID] = set()
+
+        # newest indexed run, for catching up on runs saved by other processes
+        self._watermark: datetime | None = None
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return int(self._alive[: len(self._docs)].sum())
+
+    # ---- updates ----------------------------------------------------------
+
+    def add_run(
+        self,
+        run_id: UUID,
+        project_id: UUID,
+        response_json: dict[str, Any] | None,
+        created_at: datetime | None = None,
+    ) -> int:
+        """Index every direction of a run (no-op if already indexed). Returns directions added."""
+        directions = (response_json or {}).get("directions") or []
+        with self._lock:
+            if run_id in self._runs:
+                return 0
+            self._runs.add(run_id)
+            if created_at is not None and (self._watermark is None or created_at > self._watermark):
+                self._watermark = created_at
+
+            for i, d in enumerate(directions):
+                if not isinstance(d, dict):
+                    continue
+                terms = Counter(tokenize(direction_text(d)))
+                doc_id = len(self._docs)
+                self._docs.append((run_id, project_id, i, d))
+                self._doc_by_key[(run_id, i)] = doc_id
+                self._ensure_capacity(doc_id + 1)
+                self._alive[doc_id] = True
+                self._project_code[doc_id] = self._project_codes.setdefault(project_id, len(self._project_codes))
+
+                length = float(sum(terms.values()))
+                self._doc_len[doc_id] = length
+                self._total_len += length
+                for term, tf in terms.items():
+                    posting = self._postings.setdefault(term, _Posting())
+                    posting.doc_ids.append(doc_id)
+                    posting.tfs.append(tf)
+                    posting.df += 1
+            return len(directions)
+
+    def remove_runs(self, run_ids: Iterable[UUID]) -> None:
+        """Tombstone deleted runs (their postings stay but never score or count towards df)."""
+        dead = set(run_ids)
+        with self._lock:
+            for doc_id, (run_id, _project_id, _i, direction) in enumerate(self._docs):
+                if run_id in dead and self._alive[doc_id]:
+                    self._alive[doc_id] = False
+                    self._total_len -= float(self._doc_len[doc_id])
+                    for term in set(tokenize(direction_text(direction))):
+                        self._postings[term].df -= 1
+
+    def _ensure_capacity(self, n: int) -> None:
+        if n <= len(self._doc_len):
+            return
+        cap = max(n, 2 * len(self._doc_len))
+        self._doc_len = np.resize(self._doc_len, cap)
+        self._project_code = np.resize(self._project_code, cap)
+        alive = np.zeros(cap, dtype=bool)
+        alive[: len(self._alive)] = self._alive
+        self._alive = alive
+
+    def sync(self, db: Session, batch: int = 500) -> int:
+        """Load (first call) or catch up on successful runs committed since the last sync."""
+        # from brief_directions rather than response_json, which is NULL once a run is archived
+        stmt = (
+            select(BriefRun.id, BriefRun.project_id, BriefRun.created_at, *_DIRECTION_COLUMNS)
+            .join(BriefDirection, BriefDirection.brief_run_id == BriefRun.id)
+            .where(BriefRun.status == "success")
+        )
+        if self._loaded and self._watermark is not None:
+            # runs that committed late carry an older created_at than ones already indexed
+            stmt = stmt.where(BriefRun.created_at >= self._watermark - self.sync_overlap)
+        stmt = stmt.order_by(BriefRun.created_at, BriefRun.id, BriefDirection.position)
+
+        added = 0
+        run, directions = None, []
+        for row in db.execute(stmt.execution_options(yield_per=batch)):
+            if run is not None and row.id != run.id:
+                added += self.add_run(run.id, run.project_id, {"directions": directions}, run.created_at)
+                directions = []
+            run = row
+            if row.id not in self._runs:
+                directions.append({c.key: getattr(row, c.key) for c in _DIRECTION_COLUMNS})
+        if run is not None:
+            added += self.add_run(run.id, run.project_id, {"directions": directions}, run.created_at)
+        self._loaded = True
+        return added
+
+    # ---- queries ----------------------------------------------------------
+
+    def search(
+        self,
+        text: str,
+        *,
+        k: int = 10,
+        project_id: UUID | None = None,
+        exclude: tuple[UUID, int] | None = None,
+    ) -> list[DirectionHit]:
+        """
+        Top-k directions by BM25 score against `text`. Scores are normalised by
+        the query's score against itself, so 1.0 means "as similar as an
+        identical direction" and values are comparable across queries.
+        """
+        q_terms = Counter(tokenize(text))
+        with self._lock:
+            n_docs = len(self._docs)
+            if not q_terms or n_docs == 0:
+                return []
+
+            alive = self._alive[:n_docs]
+            n_alive = int(alive.sum())
+            avg_len = self._total_len / n_alive if n_alive else 1.0
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_len[:n_docs] / avg_len)
+
+            scores = np.zeros(n_docs, dtype=np.float32)
+            self_score = 0.0
+            q_len = sum(q_terms.values())
+            for term, qtf in q_terms.items():
+                posting = self._postings.get(term)
+                df = posting.df if posting else 0
+                idf = math.log(1 + (n_alive - df + 0.5) / (df + 0.5))
+                self_score += qtf * idf * qtf * (BM25_K1 + 1) / (qtf + BM25_K1 * (1 - BM25_B + BM25_B * q_len / avg_len))
+                if posting is None:
+                    continue
+                ids, tfs = posting.arrays()
+                # doc ids are unique within a posting, so fancy-index += is safe
+                scores[ids] += qtf * idf * tfs * (BM25_K1 + 1) / (tfs + norm[ids])
+
+            mask = alive & (scores > 0)
+            if project_id is not None:
+                code = self._project_codes.get(project_id, -1)
+                mask &= self._project_code[:n_docs] == code
+            if exclude is not None and exclude in self._doc_by_key:
+                mask[self._doc_by_key[exclude]] = False
+
+            candidates = np.flatnonzero(mask)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+            return [
+                DirectionHit(
+                    brief_run_id=self._docs[i][0],
+                    project_id=self._docs[i][1],
+                    direction_index=self._docs[i][2],
+                    score=round(float(scores[i]) / self_score, 4) if self_score > 0 else 0.0,
+                    direction=self._docs[i][3],
+                )
+                for i in candidates
+            ]
+
+    def direction(self, run_id: UUID, direction_index: int) -> dict[str, Any] | None:
+        with self._lock:
+            doc_id = self._doc_by_key.get((run_id, direction_index))
+            return None if doc_id is None else self._docs[doc_id][3]
+
+
+@lru_cache
+def get_direction_index() -> DirectionIndex:
+    from app.settings import get_settings
+
+    # a run commits at most one request after its created_at (a brief plus its repair pass)
+    return DirectionIndex(sync_overlap_s=get_settings().request_timeout_max_s + 300)
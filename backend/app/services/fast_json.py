@@ -0,0 +1,40 @@
+"""
+Fast JSON path for high-volume read endpoints.
+
+Rows are selected as tuples (no ORM entities, no per-row Pydantic models) and
+returned through an orjson-backed response, which handles UUIDs and datetimes natively. JSON/JSONB
+columns are cast to text in SQL and embedded verbatim as orjson Fragments, so
+large blobs are never parsed into Python objects and re-encoded.
+"""
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import JSONResponse
+from sqlalchemy import Text, cast
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        # OPT_UTC_Z: UTC datetimes as "...Z", matching Pydantic's JSON output
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def json_text(column: ColumnElement, label: str | None = None) -> ColumnElement:
+    """Select a JSON/JSONB column as its text form (Postgres: jsonb::text)."""
+    return cast(column, Text).label(label or column.key)
+
+
+def raw_json(text: str | None) -> orjson.Fragment | None:
+    """Embed already-serialized JSON from the database without parsing it."""
+    return None if text is None else orjson.Fragment(text)
+
+
+def rows_to_dicts(rows: Iterable, json_columns: tuple[str, ...] = ()) -> list[dict[str, Any]]:
+    out = []
+    for row in rows:
+        item = dict(row._mapping)
+        for name in json_columns:
+            item[name] = raw_json(item[name])
+        out.append(item)
+    return out
@@ -0,0 +1,157 @@
+"""
+Idempotency-Key support for the generation endpoints.
+
+A completed response is stored per (scope, key) and replayed for retries of
+the same request. Concurrent requests with the same key and body inside one
+API process are coalesced onto a single upstream call (single-flight); across
+processes the in-progress row makes the second caller get a 409 instead of a
+duplicate model call.
+"""
+import hashlib
+import json
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import IdempotencyKey
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+# completed responses are replayable this long
+RESPONSE_TTL = timedelta(hours=24)
+# an in-progress claim older than this is assumed abandoned (crashed worker)
+IN_PROGRESS_LEASE = timedelta(minutes=10)
+
+
+def request_fingerprint(body: dict) -> str:
+    return hashlib.sha256(json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key onto one execution."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Returns (result, shared); shared is True for callers that only waited."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result(), False
+
+
+_flights = SingleFlight()
+
+
+def _claim(db: Session, scope: str, key: str, fingerprint: str) -> dict | None:
+    """
+    Take ownership of (scope, key). Returns None when claimed (caller runs the
+    request) or the stored response when the key already completed.
+    """
+    now = datetime.now(timezone.utc)
+    db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+            or_(
+                and_(IdempotencyKey.status == "completed", IdempotencyKey.created_at < now - RESPONSE_TTL),
+                and_(IdempotencyKey.status == "in_progress", IdempotencyKey.created_at < now - IN_PROGRESS_LEASE),
+            ),
+        )
+    )
+    # RETURNING, not rowcount: psycopg reports -1 for INSERT .. ON CONFLICT DO NOTHING
+    claimed = db.execute(
+        insert(IdempotencyKey.__table__)
+        .values(scope=scope, key=key, request_hash=fingerprint, status="in_progress")
+        .on_conflict_do_nothing(index_elements=[IdempotencyKey.scope, IdempotencyKey.key])
+        .returning(IdempotencyKey.key)
+    ).first()
+    db.commit()
+    if claimed is not None:
+        return None
+
+    row = db.get(IdempotencyKey, (scope, key))
+    if row is None:
+        # completed and expired between our statements; let the client retry
+        raise HTTPException(status_code=409, detail="Idempotency-Key is being reused; retry the request")
+    if row.request_hash != fingerprint:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+    if row.status != "completed":
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+    return row.response_json
+
+
+def _release(db: Session, scope: str, key: str) -> None:
+    # failed requests are not stored: the client may retry with the same key
+    db.rollback()
+    db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.scope == scope, IdempotencyKey.key == key, IdempotencyKey.status == "in_progress"
+        )
+    )
+    db.commit()
+
+
+def run_idempotent(
+    db: Session,
+    *,
+    scope: str,
+    key: str | None,
+    request_body: dict,
+    response_model: type[M],
+    fn: Callable[[], M],
+) -> tuple[M, bool]:
+    """
+    Run fn at most once per (scope, key). Returns (response, replayed), where
+    replayed is True when the response came from storage or another caller's
+    in-flight execution.
+    """
+    if not key:
+        return fn(), False
+
+    fingerprint = request_fingerprint(request_body)
+
+    def execute() -> tuple[M, bool]:
+        stored = _claim(db, scope, key, fingerprint)
+        if stored is not None:
+            return response_model.model_validate(stored), True
+
+        try:
+            result = fn()
+        except BaseException:
+            _release(db, scope, key)
+            raise
+
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            .values(status="completed", response_json=result.model_dump(mode="json"))
+        )
+        db.commit()
+        return result, False
+
+    (result, replayed), shared = _flights.do(f"{scope}:{key}:{fingerprint}", execute)
+    return result, replayed or shared
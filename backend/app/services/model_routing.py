@@ -0,0 +1,115 @@
+"""
+Latency-aware model routing for OpenAI calls.
+
+Every text and image call records its outcome (latency, success) per model.
+Before a call, the router checks the default model's recent p95 latency and
+error rate against the configured SLO; if it misses, the first allowed
+alternative that meets it is used instead. Only outcomes from the last
+openai_route_window_s count, so a degraded model is tried again once its bad
+samples age out (a model with too few recent samples counts as healthy).
+
+The SLO is further capped by what is left of the request deadline. A model
+named explicitly by the caller is never rerouted.
+"""
+import time
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+from app.services.deadlines import current_deadline
+
+
+@dataclass(frozen=True)
+class Route:
+    model: str  # model to call
+    requested: str  # model that would have been called without routing
+    # None = routing off, "pinned" = model named by the caller, "default" = default met the SLO,
+    # "latency"/"errors" = default missed the SLO on p95/error rate, "best_effort" = nothing met it
+    reason: str | None
+
+    def fields(self) -> dict[str, Any]:
+        """requested_model/route_reason, as stored on BriefRun and CoverImage."""
+        return {"requested_model": self.requested, "route_reason": self.reason}
+
+
+@dataclass(frozen=True)
+class ModelHealth:
+    samples: int
+    error_rate: float
+    p95_s: float | None  # of successful calls
+
+
+class ModelRouter:
+    """Rolling outcomes per (model, variant); variant separates e.g. image qualities."""
+
+    def __init__(self, size: int = 200) -> None:
+        self.size = size
+        self._outcomes: dict[tuple[str, str], deque[tuple[float, float, bool]]] = {}
+        self._lock = Lock()
+
+    def record(self, model: str, seconds: float, ok: bool, variant: str = "") -> None:
+        with self._lock:
+            window = self._outcomes.setdefault((model, variant), deque(maxlen=self.size))
+            window.append((time.monotonic(), seconds, ok))
+
+    def health(self, model: str, window_s: float, variant: str = "") -> ModelHealth:
+        since = time.monotonic() - window_s
+        with self._lock:
+            recent = [(s, ok) for t, s, ok in self._outcomes.get((model, variant), ()) if t >= since]
+        if not recent:
+            return ModelHealth(samples=0, error_rate=0.0, p95_s=None)
+        latencies = sorted(s for s, ok in recent if ok)
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] if latencies else None
+        errors = sum(1 for _, ok in recent if not ok)
+        return ModelHealth(samples=len(recent), error_rate=errors / len(recent), p95_s=p95)
+
+    def keys(self) -> list[tuple[str, str]]:
+        with self._lock:
+            return sorted(self._outcomes)
+
+    def choose(
+        self,
+        default: str,
+        alternatives: list[str],
+        *,
+        slo_s: float,
+        max_error_rate: float,
+        min_samples: int,
+        window_s: float,
+        variant: str = "",
+    ) -> Route:
+        if not alternatives:
+            return Route(model=default, requested=default, reason=None)
+
+        deadline = current_deadline()
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None:
+            slo_s = min(slo_s, max(remaining, 0.0))
+
+        candidates = [default] + [m for m in alternatives if m != default]
+        health = {m: self.health(m, window_s, variant) for m in candidates}
+
+        def miss(h: ModelHealth) -> str | None:
+            if h.samples < min_samples:
+                return None
+            if h.error_rate > max_error_rate:
+                return "errors"
+            if h.p95_s is None or h.p95_s > slo_s:
+                return "latency"
+            return None
+
+        default_miss = miss(health[default])
+        if default_miss is None:
+            return Route(model=default, requested=default, reason="default")
+        for model in candidates[1:]:
+            if miss(health[model]) is None:
+                return Route(model=model, requested=default, reason=default_miss)
+
+        # nothing meets the SLO: fewest errors, then fastest
+        best = min(candidates, key=lambda m: (health[m].error_rate, health[m].p95_s or float("inf")))
+        return Route(model=best, requested=default, reason="best_effort")
+
+
+text_router = ModelRouter()
+image_router = ModelRouter()
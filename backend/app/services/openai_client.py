@@ -1,13 +1,165 @@
+import asyncio
 import base64
-from typing import Any
-from openai import OpenAI
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Lock, Thread
+from typing import Any, Awaitable, Callable
+from app.profiling import span
+from app.services.deadlines import DeadlineExceeded, current_deadline, time_left, wait_first
+from app.services.model_routing import Route, image_router, text_router
+from app.services.pricing import estimate_cost_usd
 from app.settings import get_settings
 
 
+def _usage_dict(usage: Any) -> dict[str, int | None]:
+    """Token counts from a Responses/Images API usage object (None when not reported)."""
+    details = getattr(usage, "input_tokens_details", None)
+    return {
+        "input_tokens": getattr(usage, "input_tokens", None),
+        "cached_tokens": getattr(details, "cached_tokens", None),
+        "output_tokens": getattr(usage, "output_tokens", None),
+        "total_tokens": getattr(usage, "total_tokens", None),
+    }
+
+
+def _cost_tokens(usage: dict[str, int | None]) -> dict[str, int | None]:
+    return {
+        "input_tokens": usage.get("input_tokens"),
+        "output_tokens": usage.get("output_tokens"),
+        "cached_tokens": usage.get("cached_tokens"),
+    }
+
+
+# a call times itself out at its budget; the waiting thread only cancels it
+# itself if that hasn't happened shortly after
+_WAIT_GRACE_S = 0.5
+
+
+class CallLoop:
+    """
+    Event loop thread running SDK calls on the async client, at most
+    `max_calls` at a time. The request thread waits on the Future that
+    submit() returns. Cancelling that Future (deadline, disconnect, losing
+    hedge) cancels the call's task, which closes its HTTP request and frees
+    its slot immediately.
+    """
+
+    def __init__(self, max_calls: int) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._slots = asyncio.Semaphore(max_calls)
+        self.in_flight = 0  # calls holding a slot
+        Thread(target=self.loop.run_forever, name="openai-calls", daemon=True).start()
+
+    def submit(self, fn: Callable[[float], Awaitable[dict[str, Any]]], timeout_s: float) -> Future:
+        # the task runs in a copy of the caller's context (request deadline, profile)
+        return asyncio.run_coroutine_threadsafe(self._run(fn, time.monotonic() + timeout_s), self.loop)
+
+    async def _run(self, fn: Callable[[float], Awaitable[dict[str, Any]]], ends: float) -> dict[str, Any]:
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                timeout_s = ends - time.monotonic()
+                if timeout_s <= 0:
+                    raise DeadlineExceeded("OpenAI call did not start before its deadline")
+                try:
+                    return await fn(timeout_s)
+                except TimeoutError as e:
+                    raise DeadlineExceeded(f"OpenAI call did not finish within {timeout_s:.1f}s") from e
+            finally:
+                self.in_flight -= 1
+
+
+@lru_cache
+def _call_loop() -> CallLoop:
+    return CallLoop(get_settings().openai_call_workers)
+
+
+def _submit(fn: Callable[[float], Awaitable[dict[str, Any]]], timeout_s: float) -> Future:
+    return _call_loop().submit(fn, timeout_s)
+
+
+def _cancel(*futures: Future | None) -> None:
+    for future in futures:
+        if future is not None:
+            future.cancel()  # no-op once finished
+
+
+class LatencyWindow:
+    """Recent successful text-call latencies per model, for the hedging threshold."""
+
+    def __init__(self, size: int = 200) -> None:
+        self.size = size
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = Lock()
+
+    def add(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.size)).append(seconds)
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            return {model: len(samples) for model, samples in self._samples.items()}
+
+    def p95(self, model: str, min_samples: int) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        return samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+
+
+@dataclass
+class HedgeStats:
+    """Process-wide hedging counters (since start)."""
+
+    calls: int = 0  # text calls eligible for hedging
+    hedged: int = 0  # ... that fired a second request
+    hedge_wins: int = 0  # ... where the second request answered first
+    extra_cost_usd: float = 0.0  # spend on the losing duplicates
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    def record(self, **deltas) -> None:
+        with self._lock:
+            for key, value in deltas.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedged / self.calls if self.calls else 0.0,
+                "extra_cost_usd": round(self.extra_cost_usd, 6),
+            }
+
+
+text_latency = LatencyWindow()
+hedge_stats = HedgeStats()
+
+
+def _record_loser_cost(future: Future) -> None:
+    # a loser cancelled in time isn't billed for its output; one that already answered is
+    if future.cancelled():
+        return
+    if future.exception() is None and future.result().get("cost_usd"):
+        hedge_stats.record(extra_cost_usd=future.result()["cost_usd"])
+
+
 class OpenAIClient:
     """
-    - create_text(prompt) -> {"model": ..., "output_text": "..."}
+    - create_text(prompt) -> {"model": ..., "output_text": "...", "usage": {...}, "latency_ms": ..., "cost_usd": ...}
     - generate_images(...) -> list[bytes] (PNG bytes)
+    - generate_images_result(...) -> {"model": ..., "images": [bytes], "usage": {...}, "latency_ms": ..., "cost_usd": ...}
+    - edit_image_result(prompt, image=png_bytes, ...) -> same shape, using the image as the reference
+
+    Every call is bounded by its operation timeout and the request deadline
+    (app.services.deadlines); text calls can be hedged (`hedged` in the result).
+    Without an explicit model, the model is picked by app.services.model_routing
+    (`requested_model` / `route_reason` in the result).
     """
 
     def __init__(self) -> None:
@@ -17,8 +169,11 @@ class OpenAIClient:
         if not api_key:
             raise RuntimeError("Missing OPENAI_API_KEY (openai_api_key) in settings")
 
-        # Always create the SDK client
-        self.client = OpenAI(api_key=api_key)
+        # Imported here so the SDK is only loaded once a real call is made (fast cold start)
+        from openai import AsyncOpenAI
+
+        # Always create the SDK client (async: calls run on the CallLoop, where they can be cancelled)
+        self.client = AsyncOpenAI(api_key=api_key)
 
         # Belt-and-suspenders: if something weird happened, fail NOW (not later)
         if self.client is None:
@@ -27,21 +182,174 @@ class OpenAIClient:
                 "This suggests your OpenAI import or instantiation is being shadowed."
             )
 
-        self.text_model = getattr(self.settings, "text_model", None) or "gpt-4.1-mini"
+        self.text_model = getattr(self.settings, "openai_text_model", None) or "gpt-4.1-mini"
         self.image_model = getattr(self.settings, "image_model", None) or "gpt-image-1.5"
         self.image_size = getattr(self.settings, "image_size", None) or "1024x1536"
 
-    def create_text(self, *, prompt: str, model: str | None = None) -> dict[str, Any]:
+    def create_text(
+        self,
+        *,
+        prompt: str,
+        model: str | None = None,
+        prompt_cache_key: str | None = None,
+        response_format: dict[str, Any] | None = None,
+        hedge: bool | None = None,
+    ) -> dict[str, Any]:
         if self.client is None:
             raise RuntimeError("OpenAI client is not initialized (self.client is None)")
 
-        use_model = model or self.text_model
-        resp = self.client.responses.create(
-            model=use_model,
-            input=prompt,
+        route = self._route(
+            text_router,
+            model,
+            self.text_model,
+            self.settings.openai_text_route_models,
+            self.settings.openai_text_latency_slo_s,
+        )
+        use_model = route.model
+        kwargs: dict[str, Any] = {}
+        if prompt_cache_key:
+            # routes requests sharing a static prefix to the same prompt cache
+            kwargs["prompt_cache_key"] = prompt_cache_key
+        if response_format:
+            # structured output, e.g. {"type": "json_schema", "name": ..., "schema": ..., "strict": True}
+            kwargs["text"] = {"format": response_format}
+
+        async def call(timeout_s: float) -> dict[str, Any]:
+            started = time.perf_counter()
+            try:
+                # the SDK timeout is per read; this bounds the whole call
+                async with asyncio.timeout(timeout_s):
+                    resp = await self._sdk(timeout_s).responses.create(
+                        model=use_model,
+                        input=prompt,
+                        **kwargs,
+                    )
+            except Exception:
+                text_router.record(use_model, time.perf_counter() - started, ok=False)
+                raise
+            latency_ms = int((time.perf_counter() - started) * 1000)
+            text_latency.add(use_model, latency_ms / 1000)
+            text_router.record(use_model, latency_ms / 1000, ok=True)
+
+            output_text = getattr(resp, "output_text", "") or ""
+            usage = _usage_dict(getattr(resp, "usage", None))
+            return {
+                "model": use_model,
+                "output_text": output_text,
+                "usage": usage,
+                "latency_ms": latency_ms,
+                "cost_usd": estimate_cost_usd(use_model, **_cost_tokens(usage)),
+                "hedged": False,
+                **route.fields(),
+            }
+
+        if hedge is None:
+            hedge = self.settings.openai_hedge_text
+        with span("openai"):
+            if hedge:
+                return self._hedged(call, use_model)
+            return self._bounded(call, self.settings.openai_text_timeout_s)
+
+    def _route(
+        self,
+        router,
+        model: str | None,
+        default: str,
+        alternatives: list[str],
+        slo_s: float,
+        variant: str = "",
+    ) -> Route:
+        if model:
+            return Route(model=model, requested=model, reason="pinned")
+        return router.choose(
+            default,
+            alternatives,
+            slo_s=slo_s,
+            max_error_rate=self.settings.openai_route_max_error_rate,
+            min_samples=self.settings.openai_route_min_samples,
+            window_s=self.settings.openai_route_window_s,
+            variant=variant,
         )
-        output_text = getattr(resp, "output_text", "") or ""
-        return {"model": use_model, "output_text": output_text}
+
+    def _image_call(
+        self, route: Route, variant: str, fn: Callable[[float], Awaitable[Any]]
+    ) -> Callable[[float], Awaitable[dict[str, Any]]]:
+        """call(timeout) for an Images API request, recording its outcome for routing."""
+
+        async def call(timeout_s: float) -> dict[str, Any]:
+            started = time.perf_counter()
+            try:
+                async with asyncio.timeout(timeout_s):
+                    img = await fn(timeout_s)
+            except Exception:
+                image_router.record(route.model, time.perf_counter() - started, ok=False, variant=variant)
+                raise
+            latency_ms = int((time.perf_counter() - started) * 1000)
+            image_router.record(route.model, latency_ms / 1000, ok=True, variant=variant)
+            return {**self._images_result(route.model, img, latency_ms), **route.fields()}
+
+        return call
+
+    def _sdk(self, timeout_s: float):
+        deadline = current_deadline()
+        if deadline is not None and deadline.expires_at is not None:
+            # a retry would not fit in what is left of the request: fail fast instead
+            return self.client.with_options(timeout=timeout_s, max_retries=0)
+        return self.client.with_options(timeout=timeout_s)
+
+    def _bounded(self, call: Callable[[float], Awaitable[dict[str, Any]]], op_timeout_s: float) -> dict[str, Any]:
+        """Run call(timeout) within the operation timeout and the request deadline."""
+        budget = time_left(op_timeout_s)
+        future = _submit(call, budget)
+        try:
+            winner = wait_first([future], budget + _WAIT_GRACE_S)
+        finally:
+            # deadline passed or client gone: close the request instead of abandoning it
+            _cancel(future)
+        if winner is None:
+            raise DeadlineExceeded(f"OpenAI call did not finish within {budget:.1f}s")
+        return winner.result()
+
+    def _hedged(self, call: Callable[[float], Awaitable[dict[str, Any]]], model: str) -> dict[str, Any]:
+        """
+        Send the request; if it is still running once the model's observed p95
+        has passed, send it again and take whichever answers first. The loser
+        is cancelled; if it had already answered, its cost is added to hedge_stats.
+        """
+        started = time.perf_counter()
+        budget = time_left(self.settings.openai_text_timeout_s)
+        threshold = text_latency.p95(model, self.settings.openai_hedge_min_samples)
+        hedge_stats.record(calls=1)
+
+        primary = _submit(call, budget)
+        backup: Future | None = None
+        try:
+            if threshold is None or threshold >= budget:
+                winner = wait_first([primary], budget + _WAIT_GRACE_S)
+            else:
+                winner = wait_first([primary], threshold)
+                if winner is None:
+                    remaining = budget - (time.perf_counter() - started)
+                    backup = _submit(call, remaining)
+                    hedge_stats.record(hedged=1)
+                    winner = wait_first([primary, backup], remaining + _WAIT_GRACE_S)
+        except BaseException:
+            _cancel(primary, backup)
+            raise
+
+        if winner is None:
+            _cancel(primary, backup)
+            raise DeadlineExceeded(f"OpenAI call did not finish within {budget:.1f}s")
+        if backup is None:
+            return winner.result()
+
+        loser = primary if winner is backup else backup
+        loser.add_done_callback(_record_loser_cost)
+        _cancel(loser)
+        if winner is backup:
+            hedge_stats.record(hedge_wins=1)
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        return {**winner.result(), "hedged": True, "latency_ms": latency_ms}
 
     def generate_images(
         self,
@@ -50,20 +358,88 @@ class OpenAIClient:
         n: int = 1,
         model: str | None = None,
         size: str | None = None,
+        quality: str | None = None,
     ) -> list[bytes]:
+        return self.generate_images_result(prompt=prompt, n=n, model=model, size=size, quality=quality)["images"]
+
+    def generate_images_result(
+        self,
+        *,
+        prompt: str,
+        n: int = 1,
+        model: str | None = None,
+        size: str | None = None,
+        quality: str | None = None,
+    ) -> dict[str, Any]:
         if self.client is None:
             raise RuntimeError("OpenAI client is not initialized (self.client is None)")
 
-        use_model = model or self.image_model
         use_size = size or self.image_size
+        kwargs: dict[str, Any] = {"quality": quality} if quality else {}
+        # image latency depends heavily on quality: route each quality on its own numbers
+        variant = quality or ""
+        route = self._route(
+            image_router,
+            model,
+            self.image_model,
+            self.settings.openai_image_route_models,
+            self.settings.openai_image_latency_slo_s,
+            variant,
+        )
+
+        call = self._image_call(
+            route,
+            variant,
+            lambda timeout_s: self._sdk(timeout_s).images.generate(
+                model=route.model,
+                prompt=prompt,
+                size=use_size,
+                n=n,
+                **kwargs,
+            ),
+        )
+        with span("openai"):
+            return self._bounded(call, self.settings.openai_image_timeout_s)
+
+    def edit_image_result(
+        self,
+        *,
+        prompt: str,
+        image: bytes,
+        model: str | None = None,
+        size: str | None = None,
+        quality: str | None = None,
+    ) -> dict[str, Any]:
+        if self.client is None:
+            raise RuntimeError("OpenAI client is not initialized (self.client is None)")
+
+        use_size = size or self.image_size
+        kwargs: dict[str, Any] = {"quality": quality} if quality else {}
+        variant = quality or ""
+        route = self._route(
+            image_router,
+            model,
+            self.image_model,
+            self.settings.openai_image_route_models,
+            self.settings.openai_image_latency_slo_s,
+            variant,
+        )
 
-        img = self.client.images.generate(
-            model=use_model,
-            prompt=prompt,
-            size=use_size,
-            n=n,
+        call = self._image_call(
+            route,
+            variant,
+            lambda timeout_s: self._sdk(timeout_s).images.edit(
+                model=route.model,
+                image=("reference.png", image, "image/png"),
+                prompt=prompt,
+                size=use_size,
+                **kwargs,
+            ),
         )
+        with span("openai"):
+            return self._bounded(call, self.settings.openai_image_timeout_s)
 
+    def _images_result(self, use_model: str, img: Any, latency_ms: int) -> dict[str, Any]:
         out: list[bytes] = []
         for item in img.data:
             b64 = getattr(item, "b64_json", None)
@@ -80,4 +456,11 @@ class OpenAIClient:
 
             raise RuntimeError("OpenAI returned an image item with no b64_json or url")
 
-        return out
+        usage = _usage_dict(getattr(img, "usage", None))
+        return {
+            "model": use_model,
+            "images": out,
+            "usage": usage,
+            "latency_ms": latency_ms,
+            "cost_usd": estimate_cost_usd(use_model, **_cost_tokens(usage)),
+        }
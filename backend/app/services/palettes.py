@@ -0,0 +1,129 @@
+import io
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+# Dominant-palette extraction: k-means over a downsampled copy of the image.
+PALETTE_SIZE = 5
+SAMPLE_SIZE = 64
+KMEANS_ITERATIONS = 12
+
+
+def rgb_to_hex(rgb: np.ndarray) -> str:
+    r, g, b = (int(round(c)) for c in rgb)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def parse_hex_color(value: str) -> tuple[int, int, int]:
+    v = value.strip().lstrip("#")
+    if len(v) == 3:
+        v = "".join(c * 2 for c in v)
+    if len(v) != 6:
+        raise ValueError(f"Invalid hex color: {value!r}")
+    return int(v[0:2], 16), int(v[2:4], 16), int(v[4:6], 16)
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (0-255, shape [..., 3]) -> CIE Lab, so distances track perceived color difference."""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+
+    m = np.array(
+        [
+            [0.4124564, 0.3575761, 0.1804375],
+            [0.2126729, 0.7151522, 0.0721750],
+            [0.0193339, 0.1191920, 0.9503041],
+        ]
+    )
+    xyz = c @ m.T / np.array([0.95047, 1.0, 1.08883])
+
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    lab = np.empty_like(f)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def _kmeans(pixels: np.ndarray, k: int, iterations: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)  # deterministic palettes for identical images
+
+    # k-means++ seeding
+    centers = np.empty((k, pixels.shape[1]), dtype=pixels.dtype)
+    centers[0] = pixels[rng.integers(len(pixels))]
+    d2 = ((pixels - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        total = d2.sum()
+        if total == 0:
+            centers[i:] = centers[0]
+            break
+        centers[i] = pixels[rng.choice(len(pixels), p=d2 / total)]
+        d2 = np.minimum(d2, ((pixels - centers[i]) ** 2).sum(axis=1))
+
+    labels = np.zeros(len(pixels), dtype=np.int64)
+    for it in range(iterations):
+        dist = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        new_labels = dist.argmin(axis=1)
+        if it > 0 and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, pixels)
+        counts = np.bincount(labels, minlength=k)
+        nonempty = counts > 0
+        centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+
+    counts = np.bincount(labels, minlength=k)
+    return centers, counts
+
+
+def extract_palette(image_bytes: bytes, k: int = PALETTE_SIZE) -> list[dict[str, Any]]:
+    """Dominant colors of an encoded image: [{"hex": "#rrggbb", "weight": 0.42}, ...], heaviest first."""
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        img.draft("RGB", (SAMPLE_SIZE * 2, SAMPLE_SIZE * 2))
+        small = img.convert("RGB").resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.Resampling.BILINEAR)
+        pixels = np.asarray(small, dtype=np.float32).reshape(-1, 3)
+
+    centers, counts = _kmeans(pixels, k, KMEANS_ITERATIONS)
+
+    # merge clusters that collapsed onto the same color
+    merged: dict[str, float] = {}
+    for center, count in zip(centers, counts):
+        if count == 0:
+            continue
+        hex_color = rgb_to_hex(center)
+        merged[hex_color] = merged.get(hex_color, 0.0) + float(count) / len(pixels)
+
+    return [
+        {"hex": hex_color, "weight": round(weight, 4)}
+        for hex_color, weight in sorted(merged.items(), key=lambda kv: kv[1], reverse=True)
+    ]
+
+
+def palette_distances(palettes: list[list[dict[str, Any]]], target: list[tuple[int, int, int]]) -> np.ndarray:
+    """
+    Vectorized distance from every stored palette to a target palette.
+
+    For each target color, take the Lab distance to the closest color in the
+    image's palette; an image's score is the mean over target colors. Lower is closer.
+    """
+    n = len(palettes)
+    if n == 0:
+        return np.empty(0)
+
+    width = max((len(p) for p in palettes), default=0) or 1
+    rgb = np.zeros((n, width, 3), dtype=np.float64)
+    present = np.zeros((n, width), dtype=bool)
+    for i, palette in enumerate(palettes):
+        for j, color in enumerate(palette):
+            rgb[i, j] = parse_hex_color(color["hex"])
+            present[i, j] = True
+
+    lab = rgb_to_lab(rgb)  # (n, width, 3)
+    target_lab = rgb_to_lab(np.asarray(target, dtype=np.float64))  # (m, 3)
+
+    dist = np.linalg.norm(lab[:, None, :, :] - target_lab[None, :, None, :], axis=3)  # (n, m, width)
+    dist = np.where(present[:, None, :], dist, np.inf)
+    return dist.min(axis=2).mean(axis=1)
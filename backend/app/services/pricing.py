@@ -0,0 +1,34 @@
+# Estimated USD prices per 1M tokens: (input, cached_input, output).
+# These are estimates for analytics only; update when provider pricing changes.
+# Unknown models cost None (not 0) so they never skew aggregates.
+TOKEN_PRICES_PER_MILLION: dict[str, tuple[float, float, float]] = {
+    "gpt-5.2": (1.75, 0.175, 14.00),
+    "gpt-5": (1.25, 0.125, 10.00),
+    "gpt-5-mini": (0.25, 0.025, 2.00),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-image-1.5": (5.00, 1.25, 32.00),
+    "gpt-image-1": (5.00, 1.25, 40.00),
+    "gpt-image-1-mini": (2.00, 0.20, 8.00),
+}
+
+
+def estimate_cost_usd(
+    model: str,
+    *,
+    input_tokens: int | None,
+    output_tokens: int | None,
+    cached_tokens: int | None = None,
+) -> float | None:
+    prices = TOKEN_PRICES_PER_MILLION.get(model)
+    if prices is None or input_tokens is None or output_tokens is None:
+        return None
+
+    input_price, cached_price, output_price = prices
+    cached = min(cached_tokens or 0, input_tokens)
+    cost = (
+        (input_tokens - cached) * input_price
+        + cached * cached_price
+        + output_tokens * output_price
+    ) / 1_000_000
+    return round(cost, 6)
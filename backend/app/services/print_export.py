@@ -0,0 +1,360 @@
+"""
+Print export: upscale a generated cover to a print trim size at print DPI.
+
+The output is produced tile by tile (Lanczos resampling of the matching
+source box, feather-blended across tile overlaps) and streamed row-band by
+row-band into an uncompressed TIFF or a Flate-compressed PDF on disk, so peak
+memory is a few bands of the output, not the whole print canvas.
+"""
+import io
+import struct
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import BinaryIO, Literal
+from uuid import UUID, uuid4
+
+import numpy as np
+from PIL import Image
+
+PrintFormat = Literal["tiff", "pdf"]
+
+# Outputs live under storage_dir/prints/<project_id>/ (outside the blob GC's dirs)
+PRINTS_DIR = "prints"
+
+TILE_SIZE = 256
+TILE_OVERLAP = 16
+STRIP_ROWS = 64
+
+# refuse anything that would not fit a classic (32-bit offset) TIFF
+MAX_OUTPUT_BYTES = 3_500_000_000
+
+
+@dataclass(frozen=True)
+class PrintSpec:
+    trim_width_in: float
+    trim_height_in: float
+    dpi: int = 300
+    bleed_in: float = 0.125
+
+    @property
+    def width_px(self) -> int:
+        return round((self.trim_width_in + 2 * self.bleed_in) * self.dpi)
+
+    @property
+    def height_px(self) -> int:
+        return round((self.trim_height_in + 2 * self.bleed_in) * self.dpi)
+
+
+def print_rel_path(project_id: UUID, image_id: UUID, spec: PrintSpec, fmt: PrintFormat) -> str:
+    # deterministic per (image, spec): repeat exports of the same size are served from disk
+    name = f"{image_id}_{spec.trim_width_in:g}x{spec.trim_height_in:g}in_{spec.bleed_in:g}bleed_{spec.dpi}dpi.{fmt}"
+    return f"{PRINTS_DIR}/{project_id}/{name}"
+
+
+# ---- Output writers --------------------------------------------------------
+
+
+class _TiffWriter:
+    """Baseline RGB TIFF written strip by strip; the IFD goes at the end."""
+
+    def __init__(self, f: BinaryIO, width: int, height: int, dpi: int) -> None:
+        self.f, self.width, self.height, self.dpi = f, width, height, dpi
+        self.strip_offsets: list[int] = []
+        self.strip_counts: list[int] = []
+        self._pending = np.empty((0, width, 3), dtype=np.uint8)
+        f.write(b"II*\x00" + struct.pack("<I", 0))  # IFD offset patched in close()
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        self._pending = np.concatenate([self._pending, rows]) if len(self._pending) else rows
+        while len(self._pending) >= STRIP_ROWS:
+            self._write_strip(self._pending[:STRIP_ROWS])
+            self._pending = self._pending[STRIP_ROWS:]
+
+    def _write_strip(self, rows: np.ndarray) -> None:
+        data = np.ascontiguousarray(rows).tobytes()
+        self.strip_offsets.append(self.f.tell())
+        self.strip_counts.append(len(data))
+        self.f.write(data)
+
+    def _write_array(self, fmt: str, values: list[int]) -> int:
+        if self.f.tell() % 2:
+            self.f.write(b"\x00")  # word-align out-of-line values
+        offset = self.f.tell()
+        self.f.write(struct.pack(f"<{len(values)}{fmt}", *values))
+        return offset
+
+    def close(self) -> None:
+        if len(self._pending):
+            self._write_strip(self._pending)
+
+        n = len(self.strip_offsets)
+        bits = self._write_array("H", [8, 8, 8])
+        offsets = self._write_array("I", self.strip_offsets) if n > 1 else self.strip_offsets[0]
+        counts = self._write_array("I", self.strip_counts) if n > 1 else self.strip_counts[0]
+        resolution = self._write_array("I", [self.dpi, 1])
+
+        SHORT, LONG, RATIONAL = 3, 4, 5
+        entries = [
+            (256, LONG, 1, self.width),
+            (257, LONG, 1, self.height),
+            (258, SHORT, 3, bits),
+            (259, SHORT, 1, 1),  # no compression
+            (262, SHORT, 1, 2),  # RGB
+            (273, LONG, n, offsets),
+            (277, SHORT, 1, 3),
+            (278, LONG, 1, STRIP_ROWS),
+            (279, LONG, n, counts),
+            (282, RATIONAL, 1, resolution),
+            (283, RATIONAL, 1, resolution),
+            (284, SHORT, 1, 1),  # chunky
+            (296, SHORT, 1, 2),  # inches
+        ]
+
+        if self.f.tell() % 2:
+            self.f.write(b"\x00")
+        ifd_offset = self.f.tell()
+        self.f.write(struct.pack("<H", len(entries)))
+        for tag, typ, count, value in entries:
+            if typ == SHORT and count == 1:
+                self.f.write(struct.pack("<HHIHH", tag, typ, count, value, 0))
+            else:
+                self.f.write(struct.pack("<HHII", tag, typ, count, value))
+        self.f.write(struct.pack("<I", 0))
+
+        self.f.seek(4)
+        self.f.write(struct.pack("<I", ifd_offset))
+
+
+class _PdfWriter:
+    """Single-page PDF whose image XObject stream is deflated as rows arrive."""
+
+    def __init__(self, f: BinaryIO, width: int, height: int, dpi: int) -> None:
+        self.f, self.width, self.height = f, width, height
+        self.page_w = width / dpi * 72
+        self.page_h = height / dpi * 72
+        self.offsets: dict[int, int] = {}
+        self._compressor = zlib.compressobj(6)
+        self._stream_len = 0
+
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._obj(2, b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>")
+        self._obj(
+            3,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.page_w:.3f} {self.page_h:.3f}] "
+            f"/Resources << /XObject << /Im0 4 0 R >> >> /Contents 5 0 R >>".encode(),
+        )
+        self.offsets[4] = f.tell()
+        f.write(
+            f"4 0 obj\n<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+            f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode /Length 6 0 R >>\nstream\n".encode()
+        )
+
+    def _obj(self, num: int, body: bytes) -> None:
+        self.offsets[num] = self.f.tell()
+        self.f.write(f"{num} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def _emit(self, data: bytes) -> None:
+        if data:
+            self.f.write(data)
+            self._stream_len += len(data)
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        self._emit(self._compressor.compress(np.ascontiguousarray(rows).tobytes()))
+
+    def close(self) -> None:
+        self._emit(self._compressor.flush())
+        self.f.write(b"\nendstream\nendobj\n")
+
+        content = f"q {self.page_w:.3f} 0 0 {self.page_h:.3f} 0 0 cm /Im0 Do Q".encode()
+        self._obj(5, f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+        self._obj(6, str(self._stream_len).encode())
+
+        xref = self.f.tell()
+        self.f.write(f"xref\n0 {len(self.offsets) + 1}\n".encode())
+        self.f.write(b"0000000000 65535 f \n")
+        for num in sorted(self.offsets):
+            self.f.write(f"{self.offsets[num]:010d} 00000 n \n".encode())
+        self.f.write(
+            f"trailer\n<< /Size {len(self.offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+        )
+
+
+# ---- Tiled upscaling -------------------------------------------------------
+
+
+def _ramp(length: int, lead: int, trail: int) -> np.ndarray:
+    """1-D blend weights: rises over `lead` samples, falls over `trail` samples."""
+    # a last tile narrower than the overlap is all ramp
+    lead, trail = min(lead, length), min(trail, length)
+    w = np.ones(length, dtype=np.float32)
+    if lead:
+        w[:lead] = (np.arange(lead, dtype=np.float32) + 0.5) / lead
+    if trail:
+        w[length - trail :] = np.minimum(w[length - trail :], ((np.arange(trail, dtype=np.float32) + 0.5) / trail)[::-1])
+    return w
+
+
+def _cover_box(src_w: int, src_h: int, out_w: int, out_h: int) -> tuple[float, float, float, float]:
+    """Centered source crop with the output's aspect ratio (fill, no letterboxing)."""
+    target = out_w / out_h
+    if src_w / src_h > target:
+        crop_w = src_h * target
+        x0 = (src_w - crop_w) / 2
+        return x0, 0.0, x0 + crop_w, float(src_h)
+    crop_h = src_w / target
+    y0 = (src_h - crop_h) / 2
+    return 0.0, y0, float(src_w), y0 + crop_h
+
+
+def render_print_file(
+    src_path: Path,
+    out_path: Path,
+    spec: PrintSpec,
+    fmt: PrintFormat,
+    *,
+    tile: int = TILE_SIZE,
+    overlap: int = TILE_OVERLAP,
+) -> Path:
+    out_w, out_h = spec.width_px, spec.height_px
+    if out_w * out_h * 3 > MAX_OUTPUT_BYTES:
+        raise ValueError(f"Print size {out_w}x{out_h} is too large")
+
+    with Image.open(src_path) as src_img:
+        src = src_img.convert("RGB")
+
+    bx0, by0, bx1, by1 = _cover_box(src.width, src.height, out_w, out_h)
+    sx, sy = (bx1 - bx0) / out_w, (by1 - by0) / out_h
+
+    def render_tile(x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        box = (bx0 + x0 * sx, by0 + y0 * sy, bx0 + x1 * sx, by0 + y1 * sy)
+        return np.asarray(src.resize((x1 - x0, y1 - y0), Image.Resampling.LANCZOS, box=box), dtype=np.float32)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+
+    with tmp_path.open("wb") as f:
+        writer = (_TiffWriter if fmt == "tiff" else _PdfWriter)(f, out_w, out_h, spec.dpi)
+
+        # Accumulator rows [acc_top, acc_top + len(acc)) across the full width.
+        acc = np.zeros((0, out_w, 3), dtype=np.float32)
+        wsum = np.zeros((0, out_w), dtype=np.float32)
+        acc_top = 0
+
+        for band_top in range(0, out_h, tile):
+            band_bottom = min(band_top + tile, out_h)
+            ry0, ry1 = max(band_top - overlap, 0), min(band_bottom + overlap, out_h)
+
+            # grow the accumulator down to this band's lowest rendered row
+            grow = ry1 - (acc_top + len(acc))
+            if grow > 0:
+                acc = np.concatenate([acc, np.zeros((grow, out_w, 3), dtype=np.float32)])
+                wsum = np.concatenate([wsum, np.zeros((grow, out_w), dtype=np.float32)])
+
+            wy = _ramp(ry1 - ry0, 2 * overlap if ry0 > 0 else 0, 2 * overlap if ry1 < out_h else 0)
+
+            for tile_left in range(0, out_w, tile):
+                tile_right = min(tile_left + tile, out_w)
+                rx0, rx1 = max(tile_left - overlap, 0), min(tile_right + overlap, out_w)
+                wx = _ramp(rx1 - rx0, 2 * overlap if rx0 > 0 else 0, 2 * overlap if rx1 < out_w else 0)
+
+                weight = wy[:, None] * wx[None, :]
+                pixels = render_tile(rx0, ry0, rx1, ry1)
+                acc[ry0 - acc_top : ry1 - acc_top, rx0:rx1] += pixels * weight[:, :, None]
+                wsum[ry0 - acc_top : ry1 - acc_top, rx0:rx1] += weight
+
+            # rows above the next band's overlap are final: emit and drop them
+            done = out_h if band_bottom >= out_h else band_bottom - overlap
+            n_done = done - acc_top
+            if n_done > 0:
+                rows = acc[:n_done] / np.maximum(wsum[:n_done], 1e-6)[:, :, None]
+                writer.write_rows(np.clip(np.rint(rows), 0, 255).astype(np.uint8))
+                acc, wsum, acc_top = acc[n_done:], wsum[n_done:], done
+
+        writer.close()
+
+    tmp_path.replace(out_path)
+    return out_path
+
+
+# ---- Worker pool -----------------------------------------------------------
+
+
+@dataclass
+class PrintJob:
+    id: UUID
+    project_id: UUID
+    image_id: UUID
+    rel_path: str
+    spec: PrintSpec
+    future: Future
+
+
+class PrintExportQueue:
+    """
+    Runs exports in a process pool (resampling is CPU-bound) so several can
+    proceed at once without blocking API workers. Jobs are tracked per API
+    process; the finished files live in storage and survive restarts.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._jobs: dict[UUID, PrintJob] = {}
+        self._lock = Lock()
+
+    def submit(
+        self,
+        *,
+        project_id: UUID,
+        image_id: UUID,
+        src_path: Path,
+        storage_root: Path,
+        rel_path: str,
+        spec: PrintSpec,
+        fmt: PrintFormat,
+    ) -> PrintJob:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            future = self._pool.submit(render_print_file, src_path, storage_root / rel_path, spec, fmt)
+            job = PrintJob(
+                id=uuid4(), project_id=project_id, image_id=image_id, rel_path=rel_path, spec=spec, future=future
+            )
+            self._jobs[job.id] = job
+            return job
+
+    def find(self, rel_path: str) -> PrintJob | None:
+        """A still-running job writing rel_path, so duplicate requests share it."""
+        with self._lock:
+            return next((j for j in self._jobs.values() if j.rel_path == rel_path and not j.future.done()), None)
+
+    def get(self, job_id: UUID) -> PrintJob | None:
+        return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+@lru_cache
+def get_print_queue() -> PrintExportQueue:
+    from app.settings import get_settings
+
+    return PrintExportQueue(max_workers=get_settings().print_export_workers)
+
+
+def upscale_image(data: bytes, width: int, height: int) -> bytes:
+    """Whole-image Lanczos resize to (width, height), center-cropped to fit. For screen sizes, not print."""
+    with Image.open(io.BytesIO(data)) as img:
+        src = img.convert("RGB")
+    out = src.resize((width, height), Image.Resampling.LANCZOS, box=_cover_box(src.width, src.height, width, height))
+    buf = io.BytesIO()
+    out.save(buf, format="PNG")
+    return buf.getvalue()
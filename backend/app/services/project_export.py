@@ -0,0 +1,418 @@
+import hashlib
+import json
+import struct
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from typing import Any, Iterator
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import BriefRun, CoverImage, Project
+from app.services.brief_archive import load_run_json
+
+CHUNK_SIZE = 1024 * 1024
+DB_BATCH = 200
+
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+_ZIP64_LIMIT = 0xFFFFFFFF
+_ZIP_FILECOUNT_LIMIT = 0xFFFF
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_UNIX_FILE_ATTR = 0o644 << 16
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_DESCRIPTOR = struct.Struct("<4sLLL")
+_DESCRIPTOR64 = struct.Struct("<4sLQQ")
+_END = struct.Struct("<4s4H2LH")
+_END64 = struct.Struct("<4sQ2H2L4Q")
+_END64_LOCATOR = struct.Struct("<4sLQL")
+
+# CRC-32s of image files seen by earlier exports, so a resumed download does
+# not re-read the entries it skips just to write the central directory
+_CRC_CACHE_SIZE = 65536
+_crc_cache: OrderedDict[tuple[str, int, int], int] = OrderedDict()
+_crc_lock = Lock()
+
+
+@dataclass(frozen=True)
+class ExportEntry:
+    """
+    One archive member. JSON documents are held deflated in memory (`data`);
+    image files are stored as-is and read from `path` while streaming, their
+    CRC-32 computed on the way (they're written with data descriptors, so the
+    local header doesn't need it).
+    """
+
+    name: str
+    date_time: tuple[int, ...]
+    method: int
+    size: int
+    compressed_size: int
+    crc: int | None = None
+    data: bytes | None = None
+    path: Path | None = None
+    mtime_ns: int = 0
+
+    @property
+    def zip64(self) -> bool:
+        return self.size >= _ZIP64_LIMIT or self.compressed_size >= _ZIP64_LIMIT
+
+    @property
+    def crc_key(self) -> tuple[str, int, int]:
+        return str(self.path), self.size, self.mtime_ns
+
+
+@dataclass
+class ExportManifest:
+    """
+    Everything an export contains, fixed when it is taken. The byte layout
+    (and so Content-Length) follows from the entry sizes alone, and the ETag
+    covers every entry, so a resumed download with a matching If-Range gets
+    exactly the bytes the first response advertised.
+    """
+
+    project_id: UUID
+    entries: list[ExportEntry]
+    offsets: list[int] = field(init=False)
+    central_directory_offset: int = field(init=False)
+    central_directory_size: int = field(init=False)
+    size: int = field(init=False)
+    etag: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        pos = 0
+        self.offsets = []
+        for entry in self.entries:
+            self.offsets.append(pos)
+            pos += _local_header_size(entry) + entry.compressed_size + _descriptor_size(entry)
+        self.central_directory_offset = pos
+        self.central_directory_size = sum(
+            _central_header_size(entry, offset) for entry, offset in zip(self.entries, self.offsets)
+        )
+        self.size = pos + self.central_directory_size + len(self.end_records())
+
+        digest = hashlib.sha1(str(self.project_id).encode("utf-8"))
+        for entry in self.entries:
+            digest.update(f"|{entry.name}|{entry.method}|{entry.size}|{entry.compressed_size}|".encode("utf-8"))
+            if entry.data is not None:
+                digest.update(entry.data)
+            else:
+                # image blobs are content-addressed; mtime catches legacy paths rewritten in place
+                digest.update(f"{entry.path}|{entry.mtime_ns}".encode("utf-8"))
+        self.etag = digest.hexdigest()
+
+    def end_records(self) -> bytes:
+        count = len(self.entries)
+        cd_offset, cd_size = self.central_directory_offset, self.central_directory_size
+        out = b""
+        if count >= _ZIP_FILECOUNT_LIMIT or cd_offset >= _ZIP64_LIMIT or cd_size >= _ZIP64_LIMIT:
+            end64_offset = cd_offset + cd_size
+            out += _END64.pack(b"PK\x06\x06", _END64.size - 12, 45, 45, 0, 0, count, count, cd_size, cd_offset)
+            out += _END64_LOCATOR.pack(b"PK\x06\x07", 0, end64_offset, 1)
+        return out + _END.pack(
+            b"PK\x05\x06",
+            0,
+            0,
+            min(count, _ZIP_FILECOUNT_LIMIT),
+            min(count, _ZIP_FILECOUNT_LIMIT),
+            min(cd_size, _ZIP64_LIMIT),
+            min(cd_offset, _ZIP64_LIMIT),
+            0,
+        )
+
+
+def _date_time(created_at: datetime | None) -> tuple[int, ...]:
+    # fixed timestamps (from the rows) keep the archive byte-for-byte reproducible
+    if created_at is None:
+        return _ZIP_EPOCH
+    return max(created_at.astimezone(timezone.utc).timetuple()[:6], _ZIP_EPOCH)
+
+
+def _json_entry(name: str, created_at: datetime | None, doc: dict[str, Any]) -> ExportEntry:
+    raw = json.dumps(doc, indent=2, sort_keys=True).encode("utf-8")
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    data = compressor.compress(raw) + compressor.flush()
+    return ExportEntry(
+        name=name,
+        date_time=_date_time(created_at),
+        method=_ZIP_DEFLATED,
+        size=len(raw),
+        compressed_size=len(data),
+        crc=zlib.crc32(raw),
+        data=data,
+    )
+
+
+def take_export_manifest(db: Session, storage_root: Path, project_id: UUID) -> ExportManifest | None:
+    """
+    Snapshot of what the project's export contains: project.json, every brief
+    run as JSON and every image file (PNGs are already compressed, so they are
+    stored). Call on a fresh session: on Postgres every query runs in one
+    REPEATABLE READ snapshot, so rows committed meanwhile can't make the
+    archive disagree with the ETag and Content-Length taken here.
+
+    Run documents are held deflated in memory; image files are only stat()ed.
+    Returns None when the project doesn't exist.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    project = db.get(Project, project_id)
+    if project is None:
+        return None
+
+    project_doc = {
+        "id": str(project.id),
+        "title": project.title,
+        "author": project.author,
+        "genre": project.genre,
+        "subgenre": project.subgenre,
+        "created_at": project.created_at.isoformat() if project.created_at else None,
+    }
+    entries = [_json_entry("project.json", project.created_at, project_doc)]
+
+    runs = db.execute(
+        select(BriefRun)
+        .where(BriefRun.project_id == project_id)
+        .order_by(BriefRun.created_at, BriefRun.id)
+        .execution_options(stream_results=True, yield_per=DB_BATCH)
+    ).scalars()
+    for run in runs:
+        request_json, response_json = load_run_json(run, storage_root)
+        doc = {
+            "id": str(run.id),
+            "model": run.model,
+            "status": run.status,
+            "error_message": run.error_message,
+            "created_at": run.created_at.isoformat() if run.created_at else None,
+            "request_json": request_json,
+            "response_json": response_json,
+        }
+        entries.append(_json_entry(f"brief_runs/{run.created_at:%Y%m%dT%H%M%S}_{run.id}.json", run.created_at, doc))
+        db.expunge(run)
+
+    images = db.execute(
+        select(CoverImage.id, CoverImage.image_path, CoverImage.created_at)
+        .where(CoverImage.project_id == project_id)
+        .order_by(CoverImage.created_at, CoverImage.id)
+        .execution_options(stream_results=True, yield_per=DB_BATCH)
+    )
+    for image in images:
+        path = storage_root / image.image_path
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append(
+            ExportEntry(
+                name=f"images/{image.created_at:%Y%m%dT%H%M%S}_{image.id}{path.suffix}",
+                date_time=_date_time(image.created_at),
+                method=_ZIP_STORED,
+                size=st.st_size,
+                compressed_size=st.st_size,
+                path=path,
+                mtime_ns=st.st_mtime_ns,
+            )
+        )
+
+    return ExportManifest(project_id=project_id, entries=entries)
+
+
+# ---- ZIP records --------------------------------------------------------------
+
+
+def _name_and_flags(entry: ExportEntry) -> tuple[bytes, int]:
+    flags = _FLAG_DATA_DESCRIPTOR if entry.name.isascii() else _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8
+    return entry.name.encode("utf-8"), flags
+
+
+def _dos_time(date_time: tuple[int, ...]) -> tuple[int, int]:
+    y, mo, d, h, mi, s = date_time
+    return h << 11 | mi << 5 | s // 2, (y - 1980) << 9 | mo << 5 | d
+
+
+def _local_header_size(entry: ExportEntry) -> int:
+    return _LOCAL_HEADER.size + len(entry.name.encode("utf-8")) + (20 if entry.zip64 else 0)
+
+
+def _local_header(entry: ExportEntry) -> bytes:
+    # CRC and sizes go in the data descriptor after the data (flag bit 3)
+    name, flags = _name_and_flags(entry)
+    dostime, dosdate = _dos_time(entry.date_time)
+    if entry.zip64:
+        extra = struct.pack("<HHQQ", 1, 16, 0, 0)
+        sizes = (_ZIP64_LIMIT, _ZIP64_LIMIT)
+    else:
+        extra, sizes = b"", (0, 0)
+    version = 45 if entry.zip64 else 20
+    return (
+        _LOCAL_HEADER.pack(
+            b"PK\x03\x04", version, 0, flags, entry.method, dostime, dosdate, 0, *sizes, len(name), len(extra)
+        )
+        + name
+        + extra
+    )
+
+
+def _descriptor_size(entry: ExportEntry) -> int:
+    return _DESCRIPTOR64.size if entry.zip64 else _DESCRIPTOR.size
+
+
+def _descriptor(entry: ExportEntry, crc: int) -> bytes:
+    record = _DESCRIPTOR64 if entry.zip64 else _DESCRIPTOR
+    return record.pack(b"PK\x07\x08", crc, entry.compressed_size, entry.size)
+
+
+def _central_zip64_fields(entry: ExportEntry, offset: int) -> list[int]:
+    fields = [entry.size, entry.compressed_size] if entry.zip64 else []
+    if offset >= _ZIP64_LIMIT:
+        fields.append(offset)
+    return fields
+
+
+def _central_header_size(entry: ExportEntry, offset: int) -> int:
+    n = len(_central_zip64_fields(entry, offset))
+    return _CENTRAL_HEADER.size + len(entry.name.encode("utf-8")) + (4 + 8 * n if n else 0)
+
+
+def _central_header(entry: ExportEntry, offset: int, crc: int) -> bytes:
+    name, flags = _name_and_flags(entry)
+    dostime, dosdate = _dos_time(entry.date_time)
+    zip64_fields = _central_zip64_fields(entry, offset)
+    extra = struct.pack(f"<HH{len(zip64_fields)}Q", 1, 8 * len(zip64_fields), *zip64_fields) if zip64_fields else b""
+    version = 45 if zip64_fields else 20
+    compressed_size, size = (_ZIP64_LIMIT, _ZIP64_LIMIT) if entry.zip64 else (entry.compressed_size, entry.size)
+    return (
+        _CENTRAL_HEADER.pack(
+            b"PK\x01\x02",
+            version,
+            3,  # made on Unix: external_attr carries the file mode
+            version,
+            0,
+            flags,
+            entry.method,
+            dostime,
+            dosdate,
+            crc,
+            compressed_size,
+            size,
+            len(name),
+            len(extra),
+            0,
+            0,
+            0,
+            _UNIX_FILE_ATTR,
+            min(offset, _ZIP64_LIMIT),
+        )
+        + name
+        + extra
+    )
+
+
+# ---- Streaming ----------------------------------------------------------------
+
+
+def _clip(data: bytes, at: int, start: int, end: int) -> Iterator[bytes]:
+    """The part of `data` (placed at offset `at`) inside [start, end]."""
+    lo, hi = max(start - at, 0), min(end - at + 1, len(data))
+    if lo < hi:
+        yield data[lo:hi]
+
+
+def _cached_crc(entry: ExportEntry) -> int | None:
+    with _crc_lock:
+        crc = _crc_cache.get(entry.crc_key)
+        if crc is not None:
+            _crc_cache.move_to_end(entry.crc_key)
+        return crc
+
+
+def _remember_crc(entry: ExportEntry, crc: int) -> None:
+    with _crc_lock:
+        _crc_cache[entry.crc_key] = crc
+        _crc_cache.move_to_end(entry.crc_key)
+        while len(_crc_cache) > _CRC_CACHE_SIZE:
+            _crc_cache.popitem(last=False)
+
+
+def _file_chunks(entry: ExportEntry, pos: int, stop: int) -> Iterator[tuple[int, bytes]]:
+    """(offset, chunk) pairs covering bytes [pos, stop) of the entry's file."""
+    with entry.path.open("rb") as f:
+        f.seek(pos)
+        while pos < stop:
+            chunk = f.read(min(CHUNK_SIZE, stop - pos))
+            if not chunk:
+                raise RuntimeError(f"{entry.path} changed during export")
+            yield pos, chunk
+            pos += len(chunk)
+
+
+def _entry_crc(entry: ExportEntry) -> int:
+    if entry.crc is not None:
+        return entry.crc
+    crc = _cached_crc(entry)
+    if crc is None:
+        crc = 0
+        for _, chunk in _file_chunks(entry, 0, entry.size):
+            crc = zlib.crc32(chunk, crc)
+        _remember_crc(entry, crc)
+    return crc
+
+
+def iter_zip_range(manifest: ExportManifest, start: int, end: int) -> Iterator[bytes]:
+    """
+    Bytes [start, end] (inclusive) of the manifest's archive. Entries that end
+    before `start` are skipped without being read; the central directory only
+    needs their CRC-32, which comes from the cache (or a plain read on a miss).
+    """
+    crcs: dict[int, int] = {}
+    for i, (entry, offset) in enumerate(zip(manifest.entries, manifest.offsets)):
+        data_at = offset + _local_header_size(entry)
+        descriptor_at = data_at + entry.compressed_size
+        if descriptor_at + _descriptor_size(entry) <= start:
+            continue
+        if offset > end:
+            return
+
+        yield from _clip(_local_header(entry), offset, start, end)
+        if entry.data is not None:
+            yield from _clip(entry.data, data_at, start, end)
+            crc = entry.crc
+        else:
+            crc = _cached_crc(entry) if descriptor_at <= end else None
+            if descriptor_at <= end and crc is None:
+                # the descriptor needs this file's CRC: read it from the start
+                crc = 0
+                for at, chunk in _file_chunks(entry, 0, entry.size):
+                    crc = zlib.crc32(chunk, crc)
+                    yield from _clip(chunk, data_at + at, start, end)
+                _remember_crc(entry, crc)
+            else:
+                lo, hi = max(start - data_at, 0), min(end - data_at + 1, entry.size)
+                if lo < hi:
+                    for _, chunk in _file_chunks(entry, lo, hi):
+                        yield chunk
+        if descriptor_at > end:
+            return
+        crcs[i] = crc
+        yield from _clip(_descriptor(entry, crc), descriptor_at, start, end)
+
+    pos = manifest.central_directory_offset
+    for i, (entry, offset) in enumerate(zip(manifest.entries, manifest.offsets)):
+        if pos > end:
+            return
+        size = _central_header_size(entry, offset)
+        if pos + size > start:
+            crc = crcs[i] if i in crcs else _entry_crc(entry)
+            yield from _clip(_central_header(entry, offset, crc), pos, start, end)
+        pos += size
+    yield from _clip(manifest.end_records(), pos, start, end)
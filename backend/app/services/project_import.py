@@ -0,0 +1,172 @@
+"""
+Bulk project import from CSV or JSONL.
+
+Rows are validated with ProjectCreate in chunks and loaded with Postgres COPY
+(psycopg) or, on other drivers, batched multi-row INSERTs. Invalid rows are
+reported by line number and skipped; valid rows are committed chunk by chunk.
+
+    python -m app.services.project_import catalogue.csv
+    python -m app.services.project_import catalogue.jsonl --chunk-size 20000
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import Project
+from app.schemas.projects import ProjectCreate
+
+ImportFormat = Literal["csv", "jsonl"]
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_REJECTIONS = 1000
+
+_COLUMNS = ("id", "title", "author", "genre", "subgenre")
+
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    rejected_count: int = 0
+    rejected: list[dict] = field(default_factory=list)
+    elapsed_ms: int = 0
+    rows_per_second: float = 0.0
+
+    def reject(self, line: int, errors: list[str]) -> None:
+        self.rejected_count += 1
+        if len(self.rejected) < MAX_REPORTED_REJECTIONS:
+            self.rejected.append({"line": line, "errors": errors})
+
+
+def _iter_csv(lines: Iterable[str]) -> Iterator[tuple[int, dict | None, str | None]]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, None, "too many fields"
+            continue
+        # empty optional cells mean "not set"
+        yield reader.line_num, {k: (v if v != "" else None) for k, v in row.items()}, None
+
+
+def _iter_jsonl(lines: Iterable[str]) -> Iterator[tuple[int, dict | None, str | None]]:
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(obj, dict):
+            yield line_no, None, "expected a JSON object"
+            continue
+        yield line_no, obj, None
+
+
+def _format_errors(e: ValidationError) -> list[str]:
+    return [f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()]
+
+
+def _copy_rows(db: Session, rows: list[tuple]) -> None:
+    """COPY a chunk through the session's psycopg connection (same transaction)."""
+    dbapi_conn = db.connection().connection.driver_connection
+    with dbapi_conn.cursor() as cur:
+        with cur.copy(f"COPY projects ({', '.join(_COLUMNS)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def _insert_rows(db: Session, rows: list[tuple]) -> None:
+    # executemany -> SQLAlchemy "insertmanyvalues": batched multi-row INSERTs
+    db.execute(insert(Project), [dict(zip(_COLUMNS, row)) for row in rows])
+
+
+def import_projects(
+    db: Session,
+    lines: Iterable[str],
+    fmt: ImportFormat,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ImportReport:
+    report = ImportReport()
+    started = time.perf_counter()
+
+    bind = db.get_bind()
+    use_copy = bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg"
+    load = _copy_rows if use_copy else _insert_rows
+
+    parsed = _iter_csv(lines) if fmt == "csv" else _iter_jsonl(lines)
+
+    chunk: list[tuple] = []
+
+    def flush() -> None:
+        if chunk:
+            load(db, chunk)
+            db.commit()
+            report.inserted += len(chunk)
+            chunk.clear()
+
+    for line_no, raw, parse_error in parsed:
+        if parse_error:
+            report.reject(line_no, [parse_error])
+            continue
+        try:
+            p = ProjectCreate.model_validate(raw)
+        except ValidationError as e:
+            report.reject(line_no, _format_errors(e))
+            continue
+
+        chunk.append((uuid.uuid4(), p.title, p.author, p.genre, p.subgenre))
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+
+    elapsed = time.perf_counter() - started
+    report.elapsed_ms = int(elapsed * 1000)
+    report.rows_per_second = round(report.inserted / elapsed, 1) if elapsed > 0 else 0.0
+    return report
+
+
+def detect_format(name_or_content_type: str | None) -> ImportFormat | None:
+    value = (name_or_content_type or "").lower()
+    if "csv" in value:
+        return "csv"
+    if "jsonl" in value or "ndjson" in value or "json-lines" in value:
+        return "jsonl"
+    return None
+
+
+def main() -> None:
+    from app.db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Bulk import projects from CSV or JSONL")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path.suffix)
+    if fmt is None:
+        sys.exit("Cannot infer format from file extension; pass --format csv|jsonl")
+
+    db = SessionLocal()
+    try:
+        with args.path.open(encoding="utf-8", newline="") as f:
+            report = import_projects(db, f, fmt, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+
+    print(json.dumps(asdict(report), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Speculative preview generation: after a brief, cheap previews for its top
+directions are generated in the background so the brief history can show
+them immediately.
+
+One batch per project at a time. A new brief (or an explicit cancel, e.g.
+the user switching projects) cancels the project's pending jobs; a job
+already waiting on the image API is allowed to finish, since its cost is
+already incurred.
+
+Each queued job reserves one preview of the project's spend budget until it
+finishes: a finished job's image is counted from the DB instead, and a
+cancelled or failed job gives its reservation back.
+"""
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Event, Lock
+from typing import Callable
+from uuid import UUID
+
+
+@dataclass
+class _Batch:
+    run_id: UUID
+    cancelled: Event = field(default_factory=Event)
+    futures: list[Future] = field(default_factory=list)
+
+
+class SpeculativePreviews:
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._batches: dict[UUID, _Batch] = {}
+        # per project: jobs queued or running, i.e. previews paid for but not yet saved
+        self._reserved: Counter[UUID] = Counter()
+        self._lock = Lock()
+
+    def schedule(
+        self,
+        project_id: UUID,
+        run_id: UUID,
+        jobs: list[Callable[[], None]],
+        budget: int,
+    ) -> int:
+        """
+        Replace the project's batch with `jobs` (cancelling the previous one),
+        keeping as many as `budget` (previews not yet saved in the window) less
+        what earlier jobs still hold reserved. Returns the number queued.
+        """
+        with self._lock:
+            self._cancel_locked(project_id)
+            jobs = jobs[: max(budget - self._reserved[project_id], 0)]
+            if not jobs:
+                return 0
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="speculative")
+            batch = _Batch(run_id=run_id)
+            self._reserved[project_id] += len(jobs)
+            batch.futures = [self._pool.submit(self._run, project_id, job, batch.cancelled) for job in jobs]
+            self._batches[project_id] = batch
+            return len(jobs)
+
+    def _run(self, project_id: UUID, job: Callable[[], None], cancelled: Event) -> None:
+        try:
+            if not cancelled.is_set():
+                job()
+        finally:
+            # saved (now counted in the DB), failed or skipped: either way no longer pending spend
+            self._release(project_id, 1)
+
+    def _release(self, project_id: UUID, n: int) -> None:
+        with self._lock:
+            self._release_locked(project_id, n)
+
+    def _release_locked(self, project_id: UUID, n: int) -> None:
+        self._reserved[project_id] -= n
+        if self._reserved[project_id] <= 0:
+            del self._reserved[project_id]
+
+    def reserved(self, project_id: UUID) -> int:
+        """Previews queued or running for the project, not yet in the DB."""
+        with self._lock:
+            return self._reserved[project_id]
+
+    def cancel(self, project_id: UUID) -> int:
+        """Cancel the project's pending jobs. Returns how many never started."""
+        with self._lock:
+            return self._cancel_locked(project_id)
+
+    def _cancel_locked(self, project_id: UUID) -> int:
+        batch = self._batches.pop(project_id, None)
+        if batch is None:
+            return 0
+        batch.cancelled.set()
+        # jobs cancelled here never reach _run, so their reservations end now
+        cancelled = sum(1 for f in batch.futures if f.cancel())
+        self._release_locked(project_id, cancelled)
+        return cancelled
+
+    def status(self, project_id: UUID) -> dict:
+        with self._lock:
+            batch = self._batches.get(project_id)
+            if batch is None:
+                return {"brief_run_id": None, "pending": 0, "running": 0, "done": 0, "failed": 0}
+            futures = batch.futures
+            done = [f for f in futures if f.done() and not f.cancelled()]
+            return {
+                "brief_run_id": batch.run_id,
+                "pending": sum(1 for f in futures if not f.done() and not f.running()),
+                "running": sum(1 for f in futures if f.running()),
+                "done": sum(1 for f in done if f.exception() is None),
+                "failed": sum(1 for f in done if f.exception() is not None),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for project_id in list(self._batches):
+                self._cancel_locked(project_id)
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+@lru_cache
+def get_speculative_previews() -> SpeculativePreviews:
+    from app.settings import get_settings
+
+    return SpeculativePreviews(max_workers=get_settings().speculative_workers)
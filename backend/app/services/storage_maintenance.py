@@ -0,0 +1,337 @@
+"""
+Storage maintenance: orphan-file collection and content-hash deduplication.
+
+Every step streams (filesystem walk, server-side DB cursors, bounded batches),
+so memory stays flat regardless of store size, and every step can stop after a
+budget and resume on the next run.
+
+    python -m app.services.storage_maintenance                 # dry run, report only
+    python -m app.services.storage_maintenance --apply
+    python -m app.services.storage_maintenance --apply --max-files 200000 --dedup-batch 1000
+"""
+import argparse
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models import CoverImage, StorageBlob
+from app.services.blob_store import BLOBS_DIR, content_hash, store_blob
+
+# Directories under storage_dir that hold referenced files, in path order (the
+# orphan scan merges them against sorted DB paths). Anything else, e.g.
+# contact-sheet caches, is managed by its own owner.
+MANAGED_DIRS = tuple(sorted(("images", BLOBS_DIR)))
+
+STATE_FILE = ".maintenance/gc_state.json"
+
+
+@dataclass
+class MaintenanceReport:
+    dedup_rows: int = 0
+    dedup_bytes_saved: int = 0
+    refs_reconciled: int = 0
+    blobs_collected: int = 0
+    files_scanned: int = 0
+    orphans_found: int = 0
+    orphan_bytes: int = 0
+    orphans_deleted: int = 0
+    scan_complete: bool = False
+    resume_after: str = ""
+
+
+# ---- Orphan scan ------------------------------------------------------------
+
+
+def walk_sorted(storage_root: Path, subdir: str, start_after: str = "") -> Iterator[tuple[str, os.DirEntry]]:
+    """
+    Yield (relative_path, entry) for files under storage_root/subdir in plain
+    code-point order of the full relative path, one directory listing in memory
+    at a time. Directories sort as "name/" so tree order equals path order.
+    """
+
+    def walk(abs_dir: Path, rel_dir: str) -> Iterator[tuple[str, os.DirEntry]]:
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = sorted(it, key=lambda e: e.name + "/" if e.is_dir(follow_symlinks=False) else e.name)
+        except FileNotFoundError:
+            return
+
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                # skip whole subtrees that sort entirely before the resume point
+                if start_after and rel + "/" < start_after[: len(rel) + 1]:
+                    continue
+                yield from walk(Path(entry.path), rel)
+            elif entry.is_file(follow_symlinks=False) and rel > start_after:
+                yield rel, entry
+
+    yield from walk(storage_root / subdir, subdir)
+
+
+def referenced_paths(db: Session, start_after: str = "", batch: int = 5000) -> Iterator[str]:
+    """Every path the DB references, streamed in byte order via a server-side cursor."""
+    union = select(CoverImage.image_path.label("path")).union(select(StorageBlob.path.label("path"))).subquery()
+    stmt = (
+        select(union.c.path)
+        .where(union.c.path.collate("C") > start_after)
+        # "C" collation = byte order, which matches Python str order for UTF-8
+        .order_by(union.c.path.collate("C"))
+    )
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch))
+    for (p,) in result:
+        yield p
+
+
+def find_orphans(
+    db: Session,
+    storage_root: Path,
+    *,
+    start_after: str = "",
+    max_files: int | None = None,
+    grace_seconds: int = 3600,
+    report: MaintenanceReport,
+) -> Iterator[tuple[str, int]]:
+    """
+    Sorted-merge diff of the filesystem against the DB. Yields (path, size) of
+    files that no row references and that are older than the grace period
+    (files are written before their row commits). Updates report.resume_after.
+    """
+    cutoff = time.time() - grace_seconds
+    db_paths = referenced_paths(db, start_after)
+    current_ref = next(db_paths, None)
+
+    scanned = 0
+    for subdir in MANAGED_DIRS:
+        if start_after and subdir < start_after.split("/", 1)[0]:
+            continue
+        for rel, entry in walk_sorted(storage_root, subdir, start_after):
+            if entry.name.endswith(".tmp"):
+                continue
+            while current_ref is not None and current_ref < rel:
+                current_ref = next(db_paths, None)
+
+            scanned += 1
+            report.files_scanned += 1
+            report.resume_after = rel
+
+            if current_ref != rel:
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime < cutoff:
+                    yield rel, stat.st_size
+
+            if max_files is not None and scanned >= max_files:
+                return
+
+    report.scan_complete = True
+    report.resume_after = ""
+
+
+# ---- Reference counts + blob collection --------------------------------------
+
+
+def reconcile_ref_counts(db: Session) -> int:
+    """Recompute storage_blobs.ref_count from cover_images (rows vanish via project cascades)."""
+    # correlated count, served by ix_cover_images_content_hash
+    actual = select(func.count()).where(CoverImage.content_hash == StorageBlob.sha256).scalar_subquery()
+    result = db.execute(update(StorageBlob).where(StorageBlob.ref_count != actual).values(ref_count=actual))
+    db.commit()
+    return result.rowcount or 0
+
+
+def collect_unreferenced_blobs(
+    db: Session,
+    storage_root: Path,
+    *,
+    grace_seconds: int,
+    batch: int = 500,
+    apply: bool,
+) -> int:
+    """Delete blobs nobody references, a locked batch at a time."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    collected = 0
+    while True:
+        rows = db.execute(
+            select(StorageBlob.sha256, StorageBlob.path)
+            .where(
+                StorageBlob.ref_count <= 0,
+                StorageBlob.created_at < cutoff,
+                # ref_count is bookkeeping; this check is what makes deletion safe
+                ~select(CoverImage.id).where(CoverImage.content_hash == StorageBlob.sha256).exists(),
+            )
+            .limit(batch)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            db.rollback()
+            return collected
+
+        if not apply:
+            db.rollback()
+            return collected + len(rows)
+
+        # unlink while holding the row locks: a concurrent store_blob of the
+        # same content waits, then re-inserts the row and rewrites the file
+        for row in rows:
+            (storage_root / row.path).unlink(missing_ok=True)
+        db.execute(StorageBlob.__table__.delete().where(StorageBlob.sha256.in_([r.sha256 for r in rows])))
+        db.commit()
+        collected += len(rows)
+
+
+# ---- Deduplication of pre-blob files ------------------------------------------
+
+
+def dedup_legacy_images(
+    db: Session,
+    storage_root: Path,
+    *,
+    after_id: str = "",
+    batch: int,
+    apply: bool,
+    report: MaintenanceReport,
+) -> str:
+    """
+    Move rows still pointing at per-project files into the content-addressed
+    store. Identical bytes collapse onto one blob; the old file is removed.
+    Works through at most `batch` rows per call, keyset-paged by id so rows
+    whose file is missing cannot stall progress. Returns the id to resume
+    after ("" once the pass is complete).
+    """
+    stmt = select(CoverImage.id, CoverImage.image_path).where(CoverImage.content_hash.is_(None))
+    if after_id:
+        stmt = stmt.where(CoverImage.id > after_id)
+    rows = db.execute(stmt.order_by(CoverImage.id).limit(batch)).all()
+    if not rows:
+        return ""
+
+    for row in rows:
+        old_path = storage_root / row.image_path
+        try:
+            data = old_path.read_bytes()
+        except FileNotFoundError:
+            continue
+
+        sha256 = content_hash(data)
+        existing = db.get(StorageBlob, sha256)
+        report.dedup_rows += 1
+        if existing is not None:
+            report.dedup_bytes_saved += len(data)
+        if not apply:
+            continue
+
+        ext = old_path.suffix.lstrip(".") or "png"
+        _, rel_path = store_blob(db, storage_root, data, ext=ext)
+        db.execute(
+            update(CoverImage)
+            .where(CoverImage.id == row.id)
+            .values(image_path=rel_path, content_hash=sha256, image_bytes=len(data))
+        )
+        db.commit()
+        old_path.unlink(missing_ok=True)
+
+    db.rollback()
+    return str(rows[-1].id) if len(rows) == batch else ""
+
+
+# ---- Orchestration ------------------------------------------------------------
+
+
+def _load_state(storage_root: Path) -> dict:
+    try:
+        return json.loads((storage_root / STATE_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(storage_root: Path, state: dict) -> None:
+    path = storage_root / STATE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    tmp.replace(path)
+
+
+def run_maintenance(
+    db: Session,
+    storage_root: Path,
+    *,
+    apply: bool = False,
+    max_files: int | None = 100_000,
+    dedup_batch: int = 500,
+    grace_seconds: int = 3600,
+) -> MaintenanceReport:
+    report = MaintenanceReport()
+    state = _load_state(storage_root)
+
+    dedup_after = dedup_legacy_images(
+        db,
+        storage_root,
+        after_id=state.get("dedup_after", ""),
+        batch=dedup_batch,
+        apply=apply,
+        report=report,
+    )
+
+    if apply:
+        report.refs_reconciled = reconcile_ref_counts(db)
+    report.blobs_collected = collect_unreferenced_blobs(
+        db, storage_root, grace_seconds=grace_seconds, apply=apply
+    )
+
+    for rel, size in find_orphans(
+        db,
+        storage_root,
+        start_after=state.get("resume_after", ""),
+        max_files=max_files,
+        grace_seconds=grace_seconds,
+        report=report,
+    ):
+        report.orphans_found += 1
+        report.orphan_bytes += size
+        if apply:
+            (storage_root / rel).unlink(missing_ok=True)
+            report.orphans_deleted += 1
+    db.rollback()  # end the streaming read transaction
+
+    if apply:
+        _save_state(storage_root, {"resume_after": report.resume_after, "dedup_after": dedup_after})
+    return report
+
+
+def main() -> None:
+    from app.db import SessionLocal
+    from app.settings import get_settings
+
+    parser = argparse.ArgumentParser(description="Collect orphaned image files and deduplicate storage")
+    parser.add_argument("--apply", action="store_true", help="delete/move files (default: dry run)")
+    parser.add_argument("--max-files", type=int, default=100_000, help="files to scan this run (0 = all)")
+    parser.add_argument("--dedup-batch", type=int, default=500, help="legacy rows to deduplicate this run")
+    parser.add_argument("--grace-minutes", type=int, default=60, help="ignore files newer than this")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = run_maintenance(
+            db,
+            Path(get_settings().storage_dir),
+            apply=args.apply,
+            max_files=args.max_files or None,
+            dedup_batch=args.dedup_batch,
+            grace_seconds=args.grace_minutes * 60,
+        )
+    finally:
+        db.close()
+
+    print(json.dumps(asdict(report), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Parallel sub-briefs: a brief's directions requested as several smaller
+concurrent calls instead of one long completion.
+
+Output length dominates brief latency, so N calls of 6/N directions each
+finish in roughly the time of the slowest short stream. Each call is steered
+toward different visual approaches (DIVERSITY_APPROACHES) so the calls don't
+converge on the same idea, then the results are merged and de-duplicated.
+A failed call only costs its share of directions.
+"""
+import contextvars
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.profiling import in_request_thread
+from app.schemas.cover_brief import CoverBriefDirections, CoverBriefRequest
+from app.services.brief_prompt import (
+    BRIEF_DIRECTION_COUNT,
+    BRIEF_PROMPT_VERSION,
+    BRIEF_RESPONSE_FORMAT,
+    DIVERSITY_APPROACHES,
+    build_brief_prompt,
+)
+from app.settings import get_settings
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class SubBriefResult:
+    directions: list[dict[str, Any]]
+    model: str
+    usage: dict[str, int | None]
+    cost_usd: float | None
+    latency_ms: int
+    # per call: approaches, status ("ok"/"error"), directions returned, error
+    calls: list[dict[str, Any]] = field(default_factory=list)
+    # directions parsed from the calls, and how many the merge dropped as duplicates
+    received: int = 0
+    dropped_by_name: int = 0
+    dropped_by_prompt: int = 0
+    # requested_model/route_reason of the call `model` came from (each call is routed on its own)
+    route: dict[str, str | None] = field(default_factory=dict)
+
+
+def split_counts(total: int, calls: int) -> list[int]:
+    """Spread `total` directions over `calls` calls, e.g. 6 over 4 -> [2, 2, 1, 1]."""
+    calls = max(1, min(calls, total))
+    base, extra = divmod(total, calls)
+    return [base + (1 if i < extra else 0) for i in range(calls)]
+
+
+def _name_key(direction: dict[str, Any]) -> str:
+    return " ".join(_WORD.findall(str(direction.get("name", "")).lower()))
+
+
+def _prompt_words(direction: dict[str, Any]) -> set[str]:
+    return set(_WORD.findall(str(direction.get("image_prompt", "")).lower()))
+
+
+def merge_directions(
+    batches: list[list[dict[str, Any]]], limit: int, overlap: float
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """
+    Concatenate batches in call order, dropping directions whose name matches
+    an earlier one or whose image prompt shares at least `overlap` of its words
+    (Jaccard) with an earlier one. Returns (merged, {"name": n, "prompt": n} dropped).
+    """
+    merged: list[dict[str, Any]] = []
+    dropped = {"name": 0, "prompt": 0}
+    names: set[str] = set()
+    prompts: list[set[str]] = []
+    for batch in batches:
+        for d in batch:
+            name, words = _name_key(d), _prompt_words(d)
+            if name and name in names:
+                dropped["name"] += 1
+                continue
+            if words and any(len(words & seen) / len(words | seen) >= overlap for seen in prompts):
+                dropped["prompt"] += 1
+                continue
+            names.add(name)
+            prompts.append(words)
+            merged.append(d)
+            if len(merged) == limit:
+                return merged, dropped
+    return merged, dropped
+
+
+def _sum_usage(results: list[dict[str, Any]]) -> dict[str, int | None]:
+    out: dict[str, int | None] = {}
+    for key in ("input_tokens", "cached_tokens", "output_tokens", "total_tokens"):
+        values = [(r.get("usage") or {}).get(key) for r in results]
+        values = [v for v in values if v is not None]
+        out[key] = sum(values) if values else None
+    return out
+
+
+def run_sub_briefs(client, payload: CoverBriefRequest, calls: int) -> SubBriefResult:
+    """Run the sub-brief calls concurrently and merge whatever comes back."""
+    counts = split_counts(BRIEF_DIRECTION_COUNT, calls)
+    plans, start = [], 0
+    for count in counts:
+        plans.append(list(DIVERSITY_APPROACHES[start : start + count]))
+        start += count
+
+    def one(approaches: list[str]) -> dict[str, Any]:
+        return client.create_text(
+            prompt=build_brief_prompt(payload, count=len(approaches), approaches=approaches),
+            prompt_cache_key=BRIEF_PROMPT_VERSION,
+            response_format=BRIEF_RESPONSE_FORMAT,
+        )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(plans), thread_name_prefix="sub-brief") as pool:
+        # copy the context per call so request profiling spans and samples land on this request
+        run = in_request_thread(one)
+        futures = [pool.submit(contextvars.copy_context().run, run, approaches) for approaches in plans]
+    latency_ms = int((time.perf_counter() - started) * 1000)
+
+    answered: list[dict[str, Any]] = []  # every call that returned (billed), parsed or not
+    batches: list[list[dict[str, Any]]] = []
+    calls_out: list[dict[str, Any]] = []
+    for approaches, future in zip(plans, futures):
+        call = {"approaches": approaches, "status": "error", "directions": 0, "error": None}
+        calls_out.append(call)
+        if future.exception() is not None:
+            call["error"] = str(future.exception())
+            continue
+        result = future.result()
+        answered.append(result)
+        try:
+            parsed = CoverBriefDirections.model_validate_json(result.get("output_text") or "")
+        except ValueError as e:
+            call["error"] = f"Bad JSON from model: {e}"
+            continue
+        batches.append(parsed.model_dump(mode="json")["directions"])
+        call.update(status="ok", directions=len(batches[-1]))
+
+    costs = [r["cost_usd"] for r in answered if r.get("cost_usd") is not None]
+    directions, dropped = merge_directions(
+        batches, BRIEF_DIRECTION_COUNT, overlap=get_settings().sub_brief_duplicate_overlap
+    )
+    return SubBriefResult(
+        directions=directions,
+        model=answered[0]["model"] if answered else client.text_model,
+        usage=_sum_usage(answered),
+        cost_usd=sum(costs) if costs else None,
+        latency_ms=latency_ms,
+        calls=calls_out,
+        received=sum(len(b) for b in batches),
+        dropped_by_name=dropped["name"],
+        dropped_by_prompt=dropped["prompt"],
+        route={k: answered[0].get(k) for k in ("requested_model", "route_reason")} if answered else {},
+    )
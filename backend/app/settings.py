@@ -17,9 +17,10 @@ class Settings(BaseSettings):
     # Database (REQUIRED)
     database_url: str
 
-    # OpenAI
-    openai_api_key: str
+    # OpenAI (only required when use_real_openai / X-Use-Real-OpenAI is on)
+    openai_api_key: str | None = None
     openai_text_model: str = "gpt-5.2"  # default, can override in .env
+    openai_repair_model: str = "gpt-4.1-mini"  # cheap model for repairing malformed brief JSON
 
     app_env: str = "dev"
     use_real_openai: bool = False
@@ -27,6 +28,59 @@ class Settings(BaseSettings):
     storage_dir: str = Field(default="storage")
     image_model: str = Field(default="gpt-image-1.5")
     image_size: str = Field(default="1024x1536")  # portrait cover-ish
+    image_quality: str | None = None  # full-tier quality (low/medium/high); None = provider default
+
+    # Upstream call deadlines (further shortened by the client's X-Request-Timeout)
+    request_timeout_max_s: float = 600.0  # cap on X-Request-Timeout
+    openai_text_timeout_s: float = 120.0
+    openai_image_timeout_s: float = 300.0
+    openai_call_workers: int = 16  # concurrent SDK calls (a cancelled or timed-out call frees its slot at once)
+
+    # Hedged text calls: re-send once a call outlives the model's observed p95, take the first answer
+    openai_hedge_text: bool = False
+    openai_hedge_min_samples: int = 20  # recent calls needed before a p95 is trusted
+
+    # Brief history: runs in months older than this get their JSON archived (python -m app.services.brief_archive)
+    brief_archive_after_months: int = 6
+
+    # Adaptive model routing: when the default model's recent p95 latency or error rate misses its SLO,
+    # calls without an explicit model go to the first listed alternative that meets it.
+    # Lists are JSON in the env, e.g. OPENAI_TEXT_ROUTE_MODELS='["gpt-4.1-mini"]'; empty = always the default.
+    openai_text_route_models: list[str] = []
+    openai_image_route_models: list[str] = []
+    openai_text_latency_slo_s: float = 45.0
+    openai_image_latency_slo_s: float = 120.0  # per quality (preview and full images are tracked separately)
+    openai_route_max_error_rate: float = 0.25
+    openai_route_min_samples: int = 5  # fewer recent calls than this = assumed healthy
+    openai_route_window_s: float = 600.0  # outcomes older than this are forgotten (degraded models get retried)
+
+    # Parallel sub-briefs: fewest merged directions that still count as a successful brief
+    brief_min_directions: int = 4
+    # merged directions whose image prompts share this fraction of words (Jaccard) are duplicates;
+    # the required boilerplate ("background only, no text", ...) alone pushes prompts toward it
+    sub_brief_duplicate_overlap: float = 0.7
+
+    # Preview tier: cheap first pass, finalized only for the images a user keeps
+    preview_image_size: str = "1024x1024"
+    preview_image_quality: str = "low"
+
+    # Startup
+    prewarm_db_connections: int = 0  # open N pooled connections in the lifespan hook (<= pool size)
+    prewarm_schemas: bool = False  # build the OpenAPI schema + warm Pydantic validators at startup
+    startup_target_ms: int = 1500  # time-to-first-request budget reported by /health/startup
+
+    # Request profiling (writes to storage_dir/profiles/)
+    profile_sample_rate: float = 0.0  # fraction of requests to profile; 0 = only on the debug header
+    profile_debug_token: str | None = None  # X-Debug-Profile: <token> profiles that request
+    profile_interval_ms: float = 5.0  # stack sampling interval
+
+    # Print export
+    print_export_workers: int = 2  # processes rendering print files concurrently
+
+    # Speculative previews (opt-in per brief; generated in the background)
+    speculative_workers: int = 2  # threads generating speculative previews
+    speculative_preview_directions: int = 3  # previews for the first N directions of a brief
+    speculative_preview_budget: int = 12  # max speculative previews per project per 24h
 
     model_config = SettingsConfigDict(
         env_file=str(ENV_FILE),
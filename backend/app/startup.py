@@ -0,0 +1,101 @@
+"""
+Startup instrumentation: import-time profiling and time-to-first-request.
+
+    python -m app.startup            # top modules by cumulative import time for `import app.main`
+    python -m app.startup --top 40
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class StartupTimings:
+    import_started: float
+    app_created: float | None = None
+    lifespan_started: float | None = None
+    lifespan_ready: float | None = None
+    first_request: float | None = None
+    prewarm: dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self, target_ms: int) -> dict:
+        def ms(t: float | None) -> float | None:
+            return None if t is None else round((t - self.import_started) * 1000, 1)
+
+        first = ms(self.first_request)
+        return {
+            "app_created_ms": ms(self.app_created),
+            "lifespan_ready_ms": ms(self.lifespan_ready),
+            "first_request_ms": first,
+            "prewarm_ms": {k: round(v * 1000, 1) for k, v in self.prewarm.items()},
+            "target_ms": target_ms,
+            "meets_target": None if first is None else first <= target_ms,
+        }
+
+
+def now() -> float:
+    return time.perf_counter()
+
+
+class FirstRequestMiddleware:
+    """ASGI middleware stamping timings.first_request once the first HTTP request is served."""
+
+    def __init__(self, app, timings: StartupTimings) -> None:
+        self.app = app
+        self.timings = timings
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.app(scope, receive, send)
+        if self.timings.first_request is None and scope["type"] == "http":
+            self.timings.first_request = now()
+
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_imports(target: str = "app.main", top: int = 25) -> list[tuple[str, float, float]]:
+    """
+    Run `python -X importtime -c "import <target>"` in a fresh interpreter and
+    return [(module, self_ms, cumulative_ms), ...] sorted by cumulative time.
+    """
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")  # engine is lazy; nothing connects
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=Path(__file__).resolve().parents[1],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_LINE.match(line)
+        if m:
+            self_us, cumulative_us, _, module = m.groups()
+            rows.append((module, int(self_us) / 1000, int(cumulative_us) / 1000))
+
+    rows.sort(key=lambda r: r[2], reverse=True)
+    return rows[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile import time of the API")
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for module, self_ms, cumulative_ms in profile_imports(args.target, args.top):
+        print(f"{cumulative_ms:14.1f} {self_ms:9.1f}  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import json
+import uuid
+
+from app.routes.cover import _parse_brief
+from app.schemas.cover_brief import CoverBriefRequest
+from app.services.brief_prompt import build_brief_prompt
+
+DIRECTION = {
+    "name": "Midnight Rain",
+    "one_liner": "A moody, cinematic cover built on rain, neon reflections, and quiet intensity.",
+    "imagery": "Rain-soaked London street at night, neon signs reflected in puddles, distant silhouettes, soft fog.",
+    "typography": "Elegant serif for title; clean small caps sans for author; strong thumbnail contrast.",
+    "color_palette": "Charcoal, deep navy, wet asphalt gray, restrained neon teal/amber accents.",
+    "layout_notes": "Large negative space for title; keep focal light source behind upper third.",
+    "avoid": "Literal faces, bright daytime scenes, cluttered signage.",
+    "image_prompt": "Moody rainy city street at night, neon reflections in puddles, cinematic lighting, soft fog, "
+    "shallow depth of field, high contrast, film grain, romantic noir atmosphere, background only, no text",
+}
+
+
+def _request() -> CoverBriefRequest:
+    return CoverBriefRequest(
+        project_id=uuid.uuid4(),
+        title="Rain Over Soho",
+        author="A. Writer",
+        genre="Romance",
+        subgenre="Noir",
+        blurb="Two musicians, one last tour, and a city that never stops raining. " * 4,
+        tone_words=["moody", "intimate", "cinematic"],
+        comps=["Book One", "Book Two", "Book Three"],
+        constraints=["thumbnail readable", "genre-appropriate"],
+    )
+
+
+def test_build_brief_prompt(benchmark):
+    payload = _request()
+    prompt = benchmark(build_brief_prompt, payload)
+    assert payload.title in prompt
+
+
+def test_parse_brief_directions(benchmark):
+    raw_text = json.dumps({"directions": [DIRECTION] * 6})
+    data, directions = benchmark(_parse_brief, raw_text)
+    assert len(directions) == 6
@@ -0,0 +1,43 @@
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from app.routes.cover import _save_images, _stub_images
+from app.services.openai_client import OpenAIClient
+
+
+@pytest.fixture(scope="module")
+def png_bytes() -> bytes:
+    return _stub_images(1, "1024x1536", "BENCH")[0]
+
+
+def test_stub_image_render(benchmark):
+    images = benchmark(_stub_images, 1, "1024x1536", "STUB")
+    assert images[0].startswith(b"\x89PNG")
+
+
+def test_generate_images_b64_decode(benchmark, png_bytes):
+    # the response-handling half of OpenAIClient.generate_images (no network, no SDK client)
+    client = OpenAIClient.__new__(OpenAIClient)
+    b64 = base64.b64encode(png_bytes).decode("ascii")
+    response = SimpleNamespace(data=[SimpleNamespace(b64_json=b64)] * 4, usage=None)
+
+    result = benchmark(client._images_result, "gpt-image-1.5", response, 0)
+    assert result["images"][0] == png_bytes
+
+
+def test_save_image_file_and_row(benchmark, db, project, png_bytes):
+    # blob write + dhash + palette + CoverImage insert + commit, per image
+    call = {"usage": {}, "latency_ms": 0, "cost_usd": None}
+    counter = iter(range(10**9))
+
+    def save():
+        # distinct bytes each round so every call writes a new file and blob row
+        data = png_bytes + next(counter).to_bytes(8, "big")
+        return _save_images(
+            db, [data], call, project_id=project.id, prompt="bench", model="stub-image", size="1024x1536"
+        )
+
+    out = benchmark(save)
+    assert out[0].project_id == project.id
@@ -0,0 +1,119 @@
+"""
+Microbenchmark: ORM + per-row Pydantic serialization vs. projected rows + orjson.
+
+Emulates what GET /projects/{id}/brief-runs and /projects/{id}/images do per
+request, minus the database round trip:
+
+  orm+pydantic : driver decodes JSONB to dicts, FastAPI validates every row into
+                 the response model and serializes it with Pydantic (old path)
+  rows+orjson  : JSONB stays text, rows become dicts, orjson embeds the text
+                 as Fragments (new path)
+
+    python -m benchmarks.bench_list_serialization
+    python -m benchmarks.bench_list_serialization --rows 5000 --repeat 20
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.schemas.brief_runs import BriefRunOut
+from app.schemas.cover_image import CoverImageListOut
+from app.services.fast_json import ORJSONResponse, raw_json
+
+_DIRECTION = {
+    "name": "Midnight Rain",
+    "one_liner": "A moody, cinematic cover built on rain, neon reflections, and quiet intensity.",
+    "imagery": "Rain-soaked London street at night, neon signs reflected in puddles, distant silhouettes, soft fog.",
+    "typography": "Elegant serif for title; clean small caps sans for author; strong thumbnail contrast.",
+    "color_palette": "Charcoal, deep navy, wet asphalt gray, restrained neon teal/amber accents.",
+    "layout_notes": "Large negative space for title; keep focal light source behind upper third.",
+    "avoid": "Literal faces, bright daytime scenes, cluttered signage.",
+    "image_prompt": "Moody rainy city street at night, neon reflections in puddles, cinematic lighting, soft fog, "
+    "shallow depth of field, high contrast, film grain, romantic noir atmosphere, background only, no text",
+}
+
+
+def _brief_rows(n: int) -> list[dict]:
+    project_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    request = {"project_id": str(project_id), "title": "T", "author": "A", "genre": "Romance", "tone_words": ["moody"]}
+    response = {"directions": [_DIRECTION] * 4}
+    return [
+        dict(
+            id=uuid.uuid4(), project_id=project_id, model="gpt-5.2", status="success", error_message=None,
+            created_at=now, prompt_version="brief-v2", input_tokens=1200, cached_tokens=1024, total_tokens=2400,
+            repair_status=None, repair_tokens=None,
+            request_json=json.dumps(request), response_json=json.dumps(response),
+        )
+        for _ in range(n)
+    ]
+
+
+def _image_rows(n: int) -> list[dict]:
+    project_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    palette = json.dumps([{"hex": "#1b2a3a", "weight": 0.42}, {"hex": "#c89b3c", "weight": 0.21}] * 3)
+    return [
+        dict(
+            id=uuid.uuid4(), project_id=project_id, brief_run_id=uuid.uuid4(), direction_index=1,
+            prompt=_DIRECTION["image_prompt"], model="gpt-image-1.5", size="1024x1536", quality=None, tier=None,
+            preview_image_id=None, image_url="/static/blobs/ab/cd/x.png", created_at=now, palette=palette,
+            duplicates=0,
+        )
+        for _ in range(n)
+    ]
+
+
+def _old_path(adapter: TypeAdapter, rows: list[dict], json_fields: tuple[str, ...]) -> bytes:
+    objs = [SimpleNamespace(**{k: json.loads(v) if k in json_fields else v for k, v in r.items()}) for r in rows]
+    return adapter.dump_json(adapter.validate_python(objs, from_attributes=True))
+
+
+def _new_path(rows: list[dict], json_fields: tuple[str, ...]) -> bytes:
+    items = []
+    for r in rows:
+        item = dict(r)
+        for k in json_fields:
+            item[k] = raw_json(item[k])
+        items.append(item)
+    return ORJSONResponse(items).body
+
+
+def _time(fn, repeat: int) -> float:
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    cases = [
+        ("brief-runs", TypeAdapter(list[BriefRunOut]), _brief_rows(args.rows), ("request_json", "response_json")),
+        ("images", TypeAdapter(list[CoverImageListOut]), _image_rows(args.rows), ("palette",)),
+    ]
+    print(f"{args.rows} rows, median of {args.repeat}")
+    for name, adapter, rows, json_fields in cases:
+        # same document either way
+        assert json.loads(_old_path(adapter, rows, json_fields)) == json.loads(_new_path(rows, json_fields))
+
+        old_ms = _time(lambda: _old_path(adapter, rows, json_fields), args.repeat)
+        new_ms = _time(lambda: _new_path(rows, json_fields), args.repeat)
+        print(f"  {name:<11} orm+pydantic {old_ms:8.1f} ms   rows+orjson {new_ms:8.1f} ms   {old_ms / new_ms:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
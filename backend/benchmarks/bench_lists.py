@@ -0,0 +1,47 @@
+import uuid
+
+import pytest
+
+from app.models import BriefRun, CoverImage
+
+from .bench_brief import DIRECTION
+
+ROWS = 500
+
+
+@pytest.fixture
+def populated(db, project):
+    db.add_all(
+        BriefRun(
+            project_id=project.id,
+            request_json={"project_id": str(project.id), "title": project.title, "tone_words": ["moody"]},
+            response_json={"directions": [DIRECTION] * 6},
+            model="stub",
+            status="success",
+        )
+        for _ in range(ROWS)
+    )
+    db.add_all(
+        CoverImage(
+            project_id=project.id,
+            prompt=DIRECTION["image_prompt"],
+            model="stub-image",
+            size="1024x1536",
+            image_path=f"blobs/00/00/{uuid.uuid4().hex}.png",
+            palette=[{"hex": "#1b2a3a", "weight": 0.42}, {"hex": "#c89b3c", "weight": 0.21}],
+            phash=i,
+        )
+        for i in range(ROWS)
+    )
+    db.commit()
+    return project
+
+
+def test_list_brief_runs(benchmark, client, populated):
+    r = benchmark(client.get, f"/projects/{populated.id}/brief-runs")
+    assert r.status_code == 200 and len(r.json()) == ROWS
+
+
+def test_list_project_images(benchmark, client, populated):
+    r = benchmark(client.get, f"/projects/{populated.id}/images")
+    assert r.status_code == 200 and len(r.json()) == ROWS
@@ -0,0 +1,11 @@
+"""
+CPU-side microbenchmarks for the request hot paths (pytest-benchmark).
+Fixtures (database, project, client) come from the top-level conftest.py.
+
+    # record a baseline (stored under ./.benchmarks/, per machine)
+    pytest benchmarks --benchmark-autosave
+
+    # from then on every run is gated (pytest_configure in ../conftest.py): it
+    # fails when any benchmark's median regresses >20% vs the latest baseline
+    pytest benchmarks
+"""
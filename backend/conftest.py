@@ -0,0 +1,122 @@
+"""
+Shared fixtures for tests/ and benchmarks/.
+
+Runs against a throwaway SQLite file by default, or a disposable Postgres via
+TEST_DATABASE_URL (migrated to head and back to base, so brief_runs is
+partitioned as in production; never point it at real data).
+"""
+import os
+import tempfile
+import uuid
+from pathlib import Path
+
+import pytest
+
+_TMP = Path(tempfile.mkdtemp(prefix="cover-test-"))
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{_TMP / 'test.db'}"
+os.environ["STORAGE_DIR"] = str(_TMP / "storage")
+os.environ["USE_REAL_OPENAI"] = "false"
+
+import sqlite3  # noqa: E402
+
+from sqlalchemy import Engine, event  # noqa: E402
+from sqlalchemy.dialects.postgresql import JSONB  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@event.listens_for(Engine, "connect")
+def _c_collation_on_sqlite(dbapi_connection, connection_record):
+    # Postgres' "C" collation is plain byte order, i.e. Python str order
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_collation("C", lambda a, b: (a > b) - (a < b))
+
+
+BENCHMARK_BASELINES = Path(".benchmarks")
+BENCHMARK_FAIL = "median:20%"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """
+    Benchmark regression gate: once a baseline has been saved
+    (pytest benchmarks --benchmark-autosave), every run compares against the
+    latest one and fails when a benchmark's median regresses by more than 20%.
+    Explicit --benchmark-compare/--benchmark-compare-fail flags win.
+    """
+    if not config.pluginmanager.hasplugin("benchmark"):
+        return
+    if config.option.benchmark_compare or config.option.benchmark_compare_fail:
+        return
+    if not any(BENCHMARK_BASELINES.glob("*/*.json")):
+        return
+    from pytest_benchmark.utils import parse_compare_fail
+
+    config.option.benchmark_compare = True
+    config.option.benchmark_compare_fail = [parse_compare_fail(BENCHMARK_FAIL)]
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from app.db import dispose_engine, get_engine
+    from app.models import Base
+
+    eng = get_engine()
+    if eng.dialect.name == "postgresql":
+        from alembic import command
+        from alembic.config import Config
+
+        alembic_cfg = Config(str(Path(__file__).parent / "alembic.ini"))
+        command.upgrade(alembic_cfg, "head")
+        yield eng
+        dispose_engine()
+        command.downgrade(alembic_cfg, "base")
+        return
+
+    Base.metadata.create_all(eng)
+    yield eng
+    Base.metadata.drop_all(eng)
+    dispose_engine()
+
+
+@pytest.fixture
+def postgres(engine):
+    """For tests of Postgres-only behaviour (partitions, COPY, row locks)."""
+    if engine.dialect.name != "postgresql":
+        pytest.skip("needs TEST_DATABASE_URL pointing at Postgres")
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    from app.db import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def project(db):
+    from app.models import Project
+
+    proj = Project(id=uuid.uuid4(), title="Rain Over Soho", author="A. Writer", genre="Romance", subgenre="Noir")
+    db.add(proj)
+    db.commit()
+    return proj
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    from fastapi.testclient import TestClient
+
+    from app.main import create_app
+
+    with TestClient(create_app()) as c:
+        yield c
@@ -0,0 +1,26 @@
+import pytest
+
+from .fake_openai import FakeOpenAI
+
+
+@pytest.fixture(scope="session")
+def fake_openai():
+    server = FakeOpenAI()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def openai_client(fake_openai, monkeypatch):
+    """OpenAIClient talking to fake_openai, one SDK attempt per call."""
+    from app.services.openai_client import OpenAIClient
+    from app.settings import get_settings
+
+    monkeypatch.setenv("OPENAI_BASE_URL", fake_openai.base_url)
+    monkeypatch.setattr(get_settings(), "openai_api_key", "test")
+    monkeypatch.setattr(fake_openai, "latency", {})
+    monkeypatch.setattr(fake_openai, "failing", set())
+    monkeypatch.setattr(fake_openai, "delays", [])
+    client = OpenAIClient()
+    client.client = client.client.with_options(max_retries=0)
+    return client
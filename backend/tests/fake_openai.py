@@ -0,0 +1,80 @@
+"""A local stand-in for the OpenAI API (Responses and Images endpoints), for OpenAIClient tests."""
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.routes.cover import _stub_images
+
+
+class FakeOpenAI:
+    """
+    Serves on 127.0.0.1 until stop(). Per model: `latency` (seconds to wait
+    before answering) and `failing` (answer 500). `delays` are consumed one per
+    request, before the per-model latency, to make individual requests slow.
+    """
+
+    def __init__(self) -> None:
+        self.latency: dict[str, float] = {}
+        self.failing: set[str] = set()
+        self.delays: list[float] = []
+        self.png_b64 = base64.b64encode(_stub_images(1, "64x64", "FAKE")[0]).decode("ascii")
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def stop(self) -> None:
+        self._server.shutdown()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        fake: FakeOpenAI = self.server.fake
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])) or b"{}")
+        model = body.get("model")
+        delay = fake.delays.pop(0) if fake.delays else 0.0
+        time.sleep(delay + fake.latency.get(model, 0.0))
+        if model in fake.failing:
+            self._send(500, {"error": {"message": "unavailable"}})
+        elif self.path.endswith("/responses"):
+            self._send(200, _response(model))
+        else:
+            self._send(200, {"created": 0, "data": [{"b64_json": fake.png_b64}]})
+
+    def _send(self, status: int, doc: dict) -> None:
+        try:
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps(doc).encode())
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client cancelled the call
+
+
+def _response(model: str) -> dict:
+    usage = {
+        "input_tokens": 10,
+        "output_tokens": 5,
+        "total_tokens": 15,
+        "input_tokens_details": {"cached_tokens": 0},
+        "output_tokens_details": {"reasoning_tokens": 0},
+    }
+    content = [{"type": "output_text", "text": "{}", "annotations": []}]
+    return {
+        "id": "resp",
+        "object": "response",
+        "created_at": 0,
+        "model": model,
+        "status": "completed",
+        "output": [{"type": "message", "id": "msg", "role": "assistant", "status": "completed", "content": content}],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": usage,
+    }
@@ -0,0 +1,51 @@
+"""
+GET /analytics/calls (Postgres: percentile_cont): image spend per call and
+per accepted (finalized) cover, grouped like the other columns.
+"""
+import pytest
+
+from app.models import CoverImage
+
+
+def _image(project, model: str, tier: str | None, cost: float) -> CoverImage:
+    return CoverImage(
+        project_id=project.id,
+        prompt="rain",
+        model=model,
+        size="1024x1536",
+        image_path="images/x.png",
+        tier=tier,
+        latency_ms=1000,
+        estimated_cost_usd=cost,
+    )
+
+
+def test_cost_per_accepted_cover(postgres, client, db, project):
+    db.add_all(
+        [
+            _image(project, "img-a", "preview", 0.01),
+            _image(project, "img-a", "preview", 0.01),
+            _image(project, "img-a", "speculative", 0.01),
+            _image(project, "img-a", "final", 0.17),
+            _image(project, "img-b", "preview", 0.02),
+        ]
+    )
+    db.commit()
+
+    r = client.get("/analytics/calls", params={"kind": "image", "group_by": "model", "project_id": str(project.id)})
+    assert r.status_code == 200
+    rows = {row["key"]: row for row in r.json()["rows"]}
+
+    assert rows["img-a"]["calls"] == 4
+    assert rows["img-a"]["accepted_covers"] == 1
+    assert rows["img-a"]["cost_per_accepted_cover_usd"] == pytest.approx(0.20)
+    assert rows["img-a"]["cost_per_call_usd"] == pytest.approx(0.05)
+    # nothing finalized yet: no per-cover cost
+    assert rows["img-b"]["accepted_covers"] == 0
+    assert rows["img-b"]["cost_per_accepted_cover_usd"] is None
+
+
+def test_briefs_have_no_accepted_covers(postgres, client, project):
+    r = client.get("/analytics/calls", params={"kind": "brief", "project_id": str(project.id)})
+    assert r.status_code == 200
+    assert all(row["accepted_covers"] is None for row in r.json()["rows"])
@@ -0,0 +1,33 @@
+"""
+Brief prompt (app.services.brief_prompt): the static prefix leads every
+prompt unchanged and is long enough for the provider's prompt cache.
+"""
+import uuid
+
+from app.schemas.cover_brief import CoverBriefRequest
+from app.services.brief_prompt import BRIEF_PROMPT_PREFIX, build_brief_prompt
+
+# Prompt caching applies from 1024 prompt tokens. English prose runs at about
+# 4 characters per token; 5 keeps the estimate on the safe side.
+CACHE_MIN_TOKENS = 1024
+MAX_CHARS_PER_TOKEN = 5
+
+
+def _payload(**overrides) -> CoverBriefRequest:
+    fields = {"project_id": uuid.uuid4(), "title": "Rain Over Soho", "author": "A. Writer", "genre": "Romance"}
+    return CoverBriefRequest(**(fields | overrides))
+
+
+def test_prefix_is_shared_by_every_prompt():
+    prompts = [
+        build_brief_prompt(_payload()),
+        build_brief_prompt(_payload(title="Salt and Iron", genre="Fantasy", tone_words=["epic"]), count=2),
+        build_brief_prompt(_payload(), count=1, approaches=["a symbolic object or still life"]),
+    ]
+    for prompt in prompts:
+        assert prompt.startswith(BRIEF_PROMPT_PREFIX + "\n\n")
+        assert "Rain Over Soho" not in BRIEF_PROMPT_PREFIX
+
+
+def test_prefix_reaches_the_prompt_cache_minimum():
+    assert len(BRIEF_PROMPT_PREFIX) >= CACHE_MIN_TOKENS * MAX_CHARS_PER_TOKEN
@@ -0,0 +1,75 @@
+"""
+Direction similarity index (app.services.direction_index): sync picks up runs
+that commit after newer ones were indexed, and removed runs stop counting
+towards document frequency.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.models import BriefDirection, BriefRun
+from app.services.direction_index import DirectionIndex
+
+# after every other test's runs, so the index's newest run is one of ours
+T0 = datetime.now(timezone.utc) + timedelta(days=1)
+
+
+def _direction(imagery: str) -> dict:
+    return {
+        "name": "Direction",
+        "one_liner": "",
+        "imagery": imagery,
+        "typography": "",
+        "color_palette": "teal and amber",
+        "layout_notes": "",
+        "avoid": "",
+        "image_prompt": "",
+    }
+
+
+def _save_run(db, project, created_at: datetime, imagery: str) -> uuid.UUID:
+    run = BriefRun(
+        id=uuid.uuid4(),
+        project_id=project.id,
+        request_json={},
+        response_json={"directions": [_direction(imagery)]},
+        model="stub",
+        status="success",
+        created_at=created_at,
+    )
+    db.add(run)
+    db.add(BriefDirection(brief_run_id=run.id, project_id=project.id, position=0, **_direction(imagery)))
+    db.commit()
+    return run.id
+
+
+def test_sync_picks_up_late_committed_runs(db, project):
+    index = DirectionIndex(sync_overlap_s=600)
+    _save_run(db, project, T0, "lighthouse in a storm")
+    index.sync(db)
+
+    # began before the indexed run (created_at is the transaction start), committed after it
+    late = _save_run(db, project, T0 - timedelta(minutes=2), "lighthouse keeper at dawn")
+    too_old = _save_run(db, project, T0 - timedelta(hours=1), "lighthouse ruins")
+    assert index.sync(db) == 1
+
+    runs = {h.brief_run_id for h in index.search("lighthouse", project_id=project.id)}
+    assert late in runs and too_old not in runs
+    # already indexed runs in the window are not added twice
+    assert index.sync(db) == 0
+
+
+def test_removed_runs_leave_document_frequency(project):
+    texts = ["red fox in snow", "red barn at dusk", "fox den under pines", "harbour fog"]
+    index, fresh = DirectionIndex(), DirectionIndex()
+    run_ids = [uuid.uuid4() for _ in texts]
+    for run_id, text in zip(run_ids, texts):
+        index.add_run(run_id, project.id, {"directions": [_direction(text)]})
+    for run_id, text in list(zip(run_ids, texts))[1:]:
+        fresh.add_run(run_id, project.id, {"directions": [_direction(text)]})
+
+    index.remove_runs([run_ids[0]])
+
+    # scoring is as if the removed run had never been indexed
+    for query in ("red fox", "harbour fog", "teal amber barn"):
+        got = [(h.brief_run_id, h.score) for h in index.search(query)]
+        assert got == [(h.brief_run_id, h.score) for h in fresh.search(query)]
@@ -0,0 +1,99 @@
+"""
+Idempotency-Key claims. Run these against Postgres too (TEST_DATABASE_URL):
+the claim relies on INSERT .. ON CONFLICT DO NOTHING .. RETURNING there.
+"""
+import threading
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.db import SessionLocal
+from app.models import IdempotencyKey
+from app.services.idempotency import request_fingerprint, run_idempotent
+
+
+class _Out(BaseModel):
+    value: int
+
+
+def _run(db, key, body, fn):
+    return run_idempotent(db, scope="test", key=key, request_body=body, response_model=_Out, fn=fn)
+
+
+def test_replay_runs_once(db):
+    key, calls = str(uuid.uuid4()), []
+
+    def fn():
+        calls.append(1)
+        return _Out(value=len(calls))
+
+    first, replayed_first = _run(db, key, {"a": 1}, fn)
+    second, replayed_second = _run(db, key, {"a": 1}, fn)
+    assert (first.value, replayed_first) == (1, False)
+    assert (second.value, replayed_second) == (1, True)
+    assert len(calls) == 1
+
+
+def test_reused_key_with_different_body_is_rejected(db):
+    key = str(uuid.uuid4())
+    _run(db, key, {"a": 1}, lambda: _Out(value=1))
+
+    with pytest.raises(HTTPException) as exc:
+        _run(db, key, {"a": 2}, lambda: pytest.fail("must not run"))
+    assert exc.value.status_code == 422
+
+
+def test_in_flight_duplicate_is_rejected(db):
+    key = str(uuid.uuid4())
+    # another process holds the claim for the same request
+    db.add(IdempotencyKey(scope="test", key=key, request_hash=request_fingerprint({"a": 1}), status="in_progress"))
+    db.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        _run(db, key, {"a": 1}, lambda: pytest.fail("must not run"))
+    assert exc.value.status_code == 409
+
+
+def test_concurrent_duplicates_share_one_call(engine):
+    key, calls = str(uuid.uuid4()), []
+    follower_started = threading.Event()
+    results: dict[str, tuple[_Out, bool]] = {}
+
+    def fn():
+        calls.append(threading.current_thread().name)
+        # hold the call open until the duplicate is waiting on it
+        follower_started.wait(5)
+        time.sleep(0.2)
+        return _Out(value=len(calls))
+
+    def request(name: str) -> None:
+        session = SessionLocal()
+        try:
+            if name == "follower":
+                follower_started.set()
+            results[name] = _run(session, key, {"a": 1}, fn)
+        finally:
+            session.close()
+
+    leader = threading.Thread(target=request, args=("leader",), name="leader")
+    leader.start()
+    while not calls:
+        time.sleep(0.01)
+    follower = threading.Thread(target=request, args=("follower",), name="follower")
+    follower.start()
+    leader.join(10)
+    follower.join(10)
+
+    assert calls == ["leader"]
+    assert results["leader"] == (_Out(value=1), False)
+    assert results["follower"] == (_Out(value=1), True)
+
+    session = SessionLocal()
+    try:
+        row = session.get(IdempotencyKey, ("test", key))
+        assert (row.status, row.response_json) == ("completed", {"value": 1})
+    finally:
+        session.close()
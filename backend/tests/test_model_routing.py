@@ -0,0 +1,130 @@
+"""
+Adaptive model routing (app.services.model_routing), on its own with a fake
+clock and end to end through OpenAIClient against a local fake OpenAI server.
+"""
+import uuid
+
+import pytest
+
+from app.services import model_routing
+from app.services.model_routing import ModelRouter
+
+RULES = {"slo_s": 1.0, "max_error_rate": 0.25, "min_samples": 3, "window_s": 60.0}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 1000.0
+
+    def monotonic(self) -> float:
+        return self.t
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(model_routing, "time", c)
+    return c
+
+
+def test_default_until_enough_samples(clock):
+    router = ModelRouter()
+    router.record("a", 5.0, ok=True)
+    route = router.choose("a", ["b"], **RULES)
+    assert (route.model, route.reason) == ("a", "default")
+
+
+def test_falls_back_when_p95_misses_slo(clock):
+    router = ModelRouter()
+    for _ in range(3):
+        router.record("a", 5.0, ok=True)
+    route = router.choose("a", ["b"], **RULES)
+    assert (route.model, route.requested, route.reason) == ("b", "a", "latency")
+
+
+def test_error_rate_trips(clock):
+    router = ModelRouter()
+    for ok in (True, False, False):
+        router.record("a", 0.1, ok=ok)
+    route = router.choose("a", ["b"], **RULES)
+    assert (route.model, route.reason) == ("b", "errors")
+
+
+def test_recovers_once_window_ages_out(clock):
+    router = ModelRouter()
+    for _ in range(3):
+        router.record("a", 5.0, ok=True)
+    assert router.choose("a", ["b"], **RULES).model == "b"
+
+    clock.t += RULES["window_s"] + 1
+    route = router.choose("a", ["b"], **RULES)
+    assert (route.model, route.reason) == ("a", "default")
+
+
+def test_best_effort_when_nothing_meets_slo(clock):
+    router = ModelRouter()
+    for _ in range(3):
+        router.record("a", 5.0, ok=True)
+        router.record("b", 3.0, ok=True)
+    route = router.choose("a", ["b"], **RULES)
+    assert (route.model, route.reason) == ("b", "best_effort")
+
+
+# ---- OpenAIClient against a local fake server ---------------------------------
+
+
+@pytest.fixture
+def routed_client(openai_client, fake_openai, monkeypatch):
+    from app.settings import get_settings
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "openai_route_min_samples", 3)
+    monkeypatch.setattr(settings, "openai_text_latency_slo_s", 0.1)
+    monkeypatch.setattr(settings, "openai_route_window_s", 60.0)
+    # fresh model names per test: the routers are process-wide
+    suffix = uuid.uuid4().hex[:8]
+    models = {name: f"{name}-{suffix}" for name in ("slow", "fast", "img-a", "img-b")}
+    monkeypatch.setattr(settings, "openai_text_model", models["slow"])
+    monkeypatch.setattr(settings, "openai_text_route_models", [models["fast"]])
+    monkeypatch.setattr(settings, "image_model", models["img-a"])
+    monkeypatch.setattr(settings, "openai_image_route_models", [models["img-b"]])
+    fake_openai.latency[models["slow"]] = 0.2
+    fake_openai.failing.add(models["img-a"])
+    # OpenAIClient reads its default models at construction
+    openai_client.text_model, openai_client.image_model = models["slow"], models["img-a"]
+    return openai_client, models
+
+
+def test_text_calls_move_off_a_slow_default(routed_client):
+    client, models = routed_client
+    results = [client.create_text(prompt="x") for _ in range(4)]
+
+    assert [r["model"] for r in results[:3]] == [models["slow"]] * 3
+    assert [r["route_reason"] for r in results[:3]] == ["default"] * 3
+    assert (results[3]["model"], results[3]["requested_model"], results[3]["route_reason"]) == (
+        models["fast"],
+        models["slow"],
+        "latency",
+    )
+
+
+def test_image_calls_move_off_a_failing_default(routed_client):
+    from openai import InternalServerError
+
+    client, models = routed_client
+    for _ in range(3):
+        with pytest.raises(InternalServerError):
+            client.generate_images_result(prompt="x", size="64x64")
+
+    result = client.generate_images_result(prompt="x", size="64x64")
+    assert (result["model"], result["route_reason"]) == (models["img-b"], "errors")
+    assert result["images"]
+
+
+def test_explicit_model_is_never_rerouted(routed_client):
+    client, models = routed_client
+    for _ in range(3):
+        client.create_text(prompt="x")
+
+    result = client.create_text(prompt="x", model=models["slow"])
+    assert (result["model"], result["route_reason"]) == (models["slow"], "pinned")
@@ -0,0 +1,67 @@
+"""
+Request deadlines and cancellation for OpenAI calls: a call the request stops
+waiting for is cancelled, not abandoned, so its slot on the call loop is free
+for the next request at once.
+"""
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.services import openai_client as oc
+from app.services.deadlines import DeadlineExceeded, RequestCancelled, deadline_scope
+
+
+@pytest.fixture
+def call_loop(monkeypatch):
+    """A one-slot call loop: any call left running would block the next one."""
+    loop = oc.CallLoop(max_calls=1)
+    monkeypatch.setattr(oc, "_call_loop", lambda: loop)
+    return loop
+
+
+def _wait_idle(loop: oc.CallLoop, timeout_s: float = 1.0) -> bool:
+    ends = time.monotonic() + timeout_s
+    while loop.in_flight and time.monotonic() < ends:
+        time.sleep(0.01)
+    return loop.in_flight == 0
+
+
+def test_deadline_cancels_the_call_and_frees_its_slot(openai_client, fake_openai, call_loop):
+    slow, fast = f"slow-{uuid.uuid4().hex[:8]}", f"fast-{uuid.uuid4().hex[:8]}"
+    fake_openai.latency[slow] = 3.0
+
+    started = time.monotonic()
+    with deadline_scope(0.3), pytest.raises(DeadlineExceeded):
+        openai_client.create_text(prompt="x", model=slow, hedge=False)
+    assert time.monotonic() - started < 1.5
+    assert _wait_idle(call_loop)
+
+    started = time.monotonic()
+    assert openai_client.create_text(prompt="x", model=fast, hedge=False)["model"] == fast
+    assert time.monotonic() - started < 1.0
+
+
+def test_disconnect_cancels_the_call(openai_client, fake_openai, call_loop):
+    slow = f"slow-{uuid.uuid4().hex[:8]}"
+    fake_openai.latency[slow] = 3.0
+
+    with deadline_scope(None) as deadline, pytest.raises(RequestCancelled):
+        threading.Timer(0.2, deadline.cancelled.set).start()
+        openai_client.create_text(prompt="x", model=slow, hedge=False)
+    assert _wait_idle(call_loop)
+
+
+def test_losing_hedge_is_cancelled(openai_client, fake_openai, monkeypatch):
+    loop = oc.CallLoop(max_calls=2)
+    monkeypatch.setattr(oc, "_call_loop", lambda: loop)
+    monkeypatch.setattr(openai_client.settings, "openai_hedge_min_samples", 1)
+    model = f"hedged-{uuid.uuid4().hex[:8]}"
+    oc.text_latency.add(model, 0.05)
+    # the first request hangs; the hedge sent after the 50 ms p95 answers at once
+    fake_openai.delays = [3.0]
+
+    result = openai_client.create_text(prompt="x", model=model, hedge=True)
+    assert result["hedged"] is True
+    assert _wait_idle(loop)
@@ -0,0 +1,59 @@
+"""
+Print export rendering (app.services.print_export): output size and DPI match
+the spec, and tiling is invisible, i.e. a tiled render matches a single-tile one.
+"""
+import re
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.services.print_export import PrintSpec, render_print_file
+
+SPEC = PrintSpec(trim_width_in=1.25, trim_height_in=2.0, dpi=120, bleed_in=0.125)
+
+
+@pytest.fixture
+def src_path(tmp_path):
+    # smooth gradients plus fine detail, so resampling seams would show
+    y, x = np.mgrid[0:90, 0:60]
+    rng = np.random.default_rng(7)
+    pixels = np.stack([x * 4, y * 2.5, (x + y) * 1.6], axis=-1) + rng.normal(0, 12, (90, 60, 3))
+    path = tmp_path / "src.png"
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(path)
+    return path
+
+
+def test_tiff_has_the_print_size_and_dpi(src_path, tmp_path):
+    out = render_print_file(src_path, tmp_path / "out.tiff", SPEC, "tiff")
+
+    assert (SPEC.width_px, SPEC.height_px) == (180, 270)
+    with Image.open(out) as img:
+        assert img.size == (SPEC.width_px, SPEC.height_px)
+        assert img.mode == "RGB"
+        assert img.info["dpi"] == (SPEC.dpi, SPEC.dpi)
+        img.load()
+
+
+def test_pdf_page_is_the_trim_plus_bleed(src_path, tmp_path):
+    out = render_print_file(src_path, tmp_path / "out.pdf", SPEC, "pdf")
+    data = out.read_bytes()
+
+    assert re.search(rb"/MediaBox \[0 0 108\.000 162\.000\]", data)  # 1.5 x 2.25 in at 72 pt/in
+    assert f"/Width {SPEC.width_px} /Height {SPEC.height_px}".encode() in data
+    stream = data.split(b"/Length 6 0 R >>\nstream\n", 1)[1].split(b"\nendstream", 1)[0]
+    assert len(zlib.decompress(stream)) == SPEC.width_px * SPEC.height_px * 3
+
+
+# 180x270 output: 48 px tiles end in 36x30 remainders; with 64 px tiles the
+# last band (14 rows) is narrower than the overlap
+@pytest.mark.parametrize("tile, overlap", [(48, 8), (64, 16)])
+def test_tiled_render_matches_untiled(src_path, tmp_path, tile, overlap):
+    untiled = render_print_file(src_path, tmp_path / "whole.tiff", SPEC, "tiff", tile=10_000)
+    tiled = render_print_file(src_path, tmp_path / "tiled.tiff", SPEC, "tiff", tile=tile, overlap=overlap)
+
+    with Image.open(untiled) as a, Image.open(tiled) as b:
+        diff = np.abs(np.asarray(a, dtype=np.int16) - np.asarray(b, dtype=np.int16))
+    assert diff.max() <= 2
+    assert diff.mean() < 0.1
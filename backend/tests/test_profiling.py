@@ -0,0 +1,74 @@
+"""
+Request profiler (app.profiling): only threads working for the profiled
+request are sampled, and the middleware only touches selected requests.
+"""
+import contextvars
+import threading
+import time
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.profiling import PROFILES_DIR, ProfiledRoute, ProfilingMiddleware, in_request_thread, profile_request
+
+
+def _spin(seconds: float) -> None:
+    ends = time.perf_counter() + seconds
+    while time.perf_counter() < ends:
+        pass
+
+
+def _request_work(seconds: float) -> None:
+    _spin(seconds)
+
+
+def _unrelated_work(stop: threading.Event) -> None:
+    while not stop.is_set():
+        _spin(0.01)
+
+
+def test_samples_only_the_requests_threads():
+    stop = threading.Event()
+    other = threading.Thread(target=_unrelated_work, args=(stop,))
+    other.start()
+    try:
+        with profile_request("GET", "/test", interval_ms=1) as profile:
+            worker = threading.Thread(
+                target=contextvars.copy_context().run, args=(in_request_thread(_request_work), 0.2)
+            )
+            worker.start()
+            worker.join()
+            # the worker's registration ends with its work
+            assert profile.thread_idents() == [threading.get_ident()]
+    finally:
+        stop.set()
+        other.join()
+
+    stacks = "\n".join(profile.stacks)
+    assert "_request_work" in stacks
+    assert "_unrelated_work" not in stacks
+
+
+def test_middleware_profiles_selected_requests(tmp_path):
+    router = APIRouter(route_class=ProfiledRoute)
+
+    @router.get("/work")
+    def work():
+        _request_work(0.1)
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ProfilingMiddleware, storage_root=tmp_path, interval_ms=1, debug_token="secret")
+
+    with TestClient(app) as client:
+        plain = client.get("/work")
+        assert plain.status_code == 200 and "x-profile-id" not in plain.headers
+        assert client.get("/work", headers={"X-Debug-Profile": "wrong"}).headers.get("x-profile-id") is None
+
+        r = client.get("/work", headers={"X-Debug-Profile": "secret"})
+    profile_id = r.headers["x-profile-id"]
+
+    (folded,) = (tmp_path / PROFILES_DIR).glob(f"*/*{profile_id}.folded")
+    # the sync endpoint's threadpool worker was sampled
+    assert "_request_work" in folded.read_text()
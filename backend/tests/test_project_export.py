@@ -0,0 +1,128 @@
+"""
+GET /projects/{id}/export.zip: archive layout computed from a pinned manifest,
+Range resumes that skip whole entries, and no drift from rows added mid-download.
+"""
+import io
+import os
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from app.models import BriefRun, CoverImage
+from app.services import project_export
+from app.services.project_export import iter_zip_range, take_export_manifest
+from app.settings import get_settings
+
+T0 = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _add_image(db, project, storage_root: Path, i: int) -> CoverImage:
+    rel = f"blobs/ex/{uuid.uuid4().hex}.png"
+    (storage_root / rel).parent.mkdir(parents=True, exist_ok=True)
+    (storage_root / rel).write_bytes(os.urandom(50_000 + i * 1000))
+    image = CoverImage(
+        project_id=project.id,
+        prompt="rain",
+        model="stub-image",
+        size="1024x1536",
+        image_path=rel,
+        created_at=T0 + timedelta(minutes=i),
+    )
+    db.add(image)
+    return image
+
+
+@pytest.fixture
+def exported(db, project):
+    storage_root = Path(get_settings().storage_dir)
+    for i in range(3):
+        db.add(
+            BriefRun(
+                project_id=project.id,
+                request_json={"title": project.title, "i": i},
+                response_json={"directions": [{"name": f"Direction {i}"}]},
+                model="stub",
+                status="success",
+                created_at=T0 + timedelta(seconds=i),
+            )
+        )
+    for i in range(4):
+        _add_image(db, project, storage_root, i)
+    db.commit()
+    project_export._crc_cache.clear()
+    return project, storage_root
+
+
+def test_full_download_is_a_valid_zip(client, exported):
+    project, _ = exported
+    r = client.get(f"/projects/{project.id}/export.zip")
+    assert r.status_code == 200
+    assert int(r.headers["content-length"]) == len(r.content)
+
+    with zipfile.ZipFile(io.BytesIO(r.content)) as zf:
+        assert zf.testzip() is None
+        names = zf.namelist()
+        assert names[0] == "project.json"
+        assert sum(n.startswith("brief_runs/") for n in names) == 3
+        assert sum(n.startswith("images/") for n in names) == 4
+
+
+def test_range_resumes_match_the_full_download(client, exported):
+    project, _ = exported
+    url = f"/projects/{project.id}/export.zip"
+    full = client.get(url)
+    etag = full.headers["etag"]
+
+    size = len(full.content)
+    for start in sorted({1, 100, size // 3, size // 2, size - 200, size - 22, size - 1}):
+        # cold cache: skipped entries' CRCs are recomputed for the central directory
+        project_export._crc_cache.clear()
+        r = client.get(url, headers={"Range": f"bytes={start}-", "If-Range": etag})
+        assert r.status_code == 206
+        assert r.headers["content-range"] == f"bytes {start}-{size - 1}/{size}"
+        assert r.content == full.content[start:], start
+
+    r = client.get(url, headers={"Range": "bytes=10-99"})
+    assert r.content == full.content[10:100]
+
+
+def test_resume_skips_entries_before_the_range(client, exported, monkeypatch):
+    project, _ = exported
+    url = f"/projects/{project.id}/export.zip"
+    full = client.get(url).content
+    last = zipfile.ZipFile(io.BytesIO(full)).infolist()[-1]
+
+    read, file_chunks = [], project_export._file_chunks
+
+    def tracked(entry, pos, stop):
+        read.append(entry.name)
+        return file_chunks(entry, pos, stop)
+
+    monkeypatch.setattr(project_export, "_file_chunks", tracked)
+    r = client.get(url, headers={"Range": f"bytes={last.header_offset}-"})
+    assert r.content == full[last.header_offset :]
+    # only the last image is read; the CRCs of the others come from the first download
+    assert read == [last.filename]
+
+
+def test_stream_is_pinned_to_the_manifest(db, exported):
+    project, storage_root = exported
+    manifest = take_export_manifest(db, storage_root, project.id)
+    db.rollback()
+
+    _add_image(db, project, storage_root, 10)
+    db.commit()
+
+    body = b"".join(iter_zip_range(manifest, 0, manifest.size - 1))
+    assert len(body) == manifest.size
+    with zipfile.ZipFile(io.BytesIO(body)) as zf:
+        assert zf.testzip() is None
+        assert sum(n.startswith("images/") for n in zf.namelist()) == 4
+    assert take_export_manifest(db, storage_root, project.id).etag != manifest.etag
+
+
+def test_missing_project_is_404(client):
+    assert client.get(f"/projects/{uuid.uuid4()}/export.zip").status_code == 404
@@ -0,0 +1,140 @@
+"""
+Bulk project import (app.services.project_import, POST /projects/import):
+valid rows are loaded, invalid ones are reported by line number and skipped,
+through COPY on Postgres and batched INSERTs elsewhere.
+"""
+import json
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Project
+from app.services import project_import
+from app.services.project_import import MAX_REPORTED_REJECTIONS, import_projects
+
+
+@pytest.fixture
+def author():
+    """A unique author per test, to count only the rows it imported."""
+    return f"Importer {uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Which loader each chunk went through."""
+    used = []
+    for name in ("_copy_rows", "_insert_rows"):
+        load = getattr(project_import, name)
+
+        def tracked(db, rows, load=load, name=name):
+            used.append((name, len(rows)))
+            load(db, rows)
+
+        monkeypatch.setattr(project_import, name, tracked)
+    return used
+
+
+def _imported(db, author: str) -> list[Project]:
+    return db.scalars(select(Project).where(Project.author == author).order_by(Project.title)).all()
+
+
+def _csv(author: str) -> str:
+    return "\n".join(
+        [
+            "title,author,genre,subgenre",
+            f"Rain Over Soho,{author},Romance,Noir",  # line 2
+            f"{'x' * 256},{author},Romance,",  # 3: title too long
+            f"No Subgenre,{author},Thriller,",  # 4: empty cell = not set
+            "No Author,,Thriller,",  # 5: author required
+            f"Too Many,{author},Thriller,Noir,extra",  # 6
+            f'"Quoted, Title",{author},Mystery,Cozy',  # 7
+            "",
+        ]
+    )
+
+
+def _jsonl(author: str) -> str:
+    return "\n".join(
+        [
+            json.dumps({"title": "First", "author": author, "genre": "Romance"}),  # line 1
+            "",  # 2: blank lines are skipped but still counted
+            "{not json",  # 3
+            json.dumps(["a", "list"]),  # 4
+            json.dumps({"title": "No Genre", "author": author}),  # 5
+            json.dumps({"title": "Second", "author": author, "genre": "Horror", "subgenre": "Gothic"}),  # 6
+            "",
+        ]
+    )
+
+
+def test_csv_import_reports_rejected_lines(client, db, author):
+    r = client.post("/projects/import", content=_csv(author), headers={"Content-Type": "text/csv"})
+    assert r.status_code == 200
+    report = r.json()
+
+    assert report["inserted"] == 3
+    assert report["rejected_count"] == 3
+    assert [rej["line"] for rej in report["rejected"]] == [3, 5, 6]
+    assert report["rejected"][0]["errors"][0].startswith("title:")
+    assert report["rejected"][1]["errors"][0].startswith("author:")
+    assert report["rejected"][2]["errors"] == ["too many fields"]
+
+    rows = _imported(db, author)
+    assert [(p.title, p.subgenre) for p in rows] == [
+        ("No Subgenre", None),
+        ("Quoted, Title", "Cozy"),
+        ("Rain Over Soho", "Noir"),
+    ]
+
+
+def test_jsonl_import_reports_rejected_lines(client, db, author):
+    r = client.post("/projects/import?format=jsonl", content=_jsonl(author))
+    assert r.status_code == 200
+    report = r.json()
+
+    assert report["inserted"] == 2
+    assert [rej["line"] for rej in report["rejected"]] == [3, 4, 5]
+    assert report["rejected"][0]["errors"][0].startswith("invalid JSON")
+    assert report["rejected"][1]["errors"] == ["expected a JSON object"]
+    assert report["rejected"][2]["errors"][0].startswith("genre:")
+    assert [p.title for p in _imported(db, author)] == ["First", "Second"]
+
+
+def test_unknown_format_is_415(client):
+    assert client.post("/projects/import", content="x", headers={"Content-Type": "text/plain"}).status_code == 415
+
+
+def test_insert_fallback_loads_in_chunks(db, author, loads):
+    lines = _csv(author).splitlines(keepends=True)
+    report = import_projects(db, lines, "csv", chunk_size=2)
+
+    assert report.inserted == 3
+    # off Postgres/psycopg: batched INSERTs, committed per chunk
+    assert loads == [("_insert_rows", 2), ("_insert_rows", 1)]
+    assert len(_imported(db, author)) == 3
+
+
+def test_copy_loads_in_chunks(postgres, db, author, loads):
+    lines = _csv(author).splitlines(keepends=True)
+    report = import_projects(db, lines, "csv", chunk_size=2)
+
+    assert report.inserted == 3
+    assert loads == [("_copy_rows", 2), ("_copy_rows", 1)]
+    assert [(p.title, p.subgenre) for p in _imported(db, author)] == [
+        ("No Subgenre", None),
+        ("Quoted, Title", "Cozy"),
+        ("Rain Over Soho", "Noir"),
+    ]
+
+
+def test_reported_rejections_are_capped(db, author):
+    bad = [json.dumps({"title": f"Bad {i}", "author": author}) for i in range(MAX_REPORTED_REJECTIONS + 5)]
+    good = [json.dumps({"title": "Good", "author": author, "genre": "Romance"})]
+    report = import_projects(db, bad + good, "jsonl")
+
+    assert report.inserted == 1
+    assert report.rejected_count == MAX_REPORTED_REJECTIONS + 5
+    assert len(report.rejected) == MAX_REPORTED_REJECTIONS
+    assert report.rejected[-1]["line"] == MAX_REPORTED_REJECTIONS
+    assert db.scalar(select(func.count()).select_from(Project).where(Project.author == author)) == 1
@@ -0,0 +1,75 @@
+"""
+Speculative previews (app.services.speculative): queued jobs reserve the
+project's spend budget at once, and give it back when cancelled or failed.
+"""
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.services.speculative import SpeculativePreviews
+
+
+@pytest.fixture
+def previews():
+    pool = SpeculativePreviews(max_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+def _wait(predicate, timeout_s: float = 2.0) -> None:
+    ends = time.monotonic() + timeout_s
+    while not predicate():
+        assert time.monotonic() < ends, "timed out"
+        time.sleep(0.005)
+
+
+def test_budget_is_reserved_when_jobs_are_queued(previews):
+    project, release = uuid.uuid4(), threading.Event()
+    started = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(2)
+
+    assert previews.schedule(project, uuid.uuid4(), [blocking, blocking, blocking], budget=5) == 3
+    assert previews.reserved(project) == 3
+    started.wait(2)
+
+    # the next brief cancels the two queued jobs; the running one still holds its slot
+    assert previews.schedule(project, uuid.uuid4(), [blocking] * 4, budget=4) == 3
+    assert previews.reserved(project) == 4
+
+    release.set()
+    _wait(lambda: previews.reserved(project) == 0)
+
+
+def test_cancel_and_failure_release_the_reservation(previews):
+    project, release = uuid.uuid4(), threading.Event()
+    started = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(2)
+
+    def failing():
+        raise RuntimeError("image API down")
+
+    previews.schedule(project, uuid.uuid4(), [blocking, failing, failing], budget=3)
+    started.wait(2)
+    assert previews.cancel(project) == 2
+    assert previews.reserved(project) == 1
+
+    release.set()
+    _wait(lambda: previews.reserved(project) == 0)
+
+    previews.schedule(project, uuid.uuid4(), [failing, failing], budget=3)
+    _wait(lambda: previews.status(project)["failed"] == 2)
+    assert previews.reserved(project) == 0
+
+
+def test_nothing_is_queued_without_budget(previews):
+    project = uuid.uuid4()
+    assert previews.schedule(project, uuid.uuid4(), [lambda: None], budget=0) == 0
+    assert previews.reserved(project) == 0
@@ -0,0 +1,100 @@
+"""
+Storage maintenance (app.services.storage_maintenance): referenced blobs stay,
+unreferenced ones are collected, and writes still in flight are left alone.
+"""
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.models import CoverImage, StorageBlob
+from app.services.blob_store import blob_rel_path, content_hash, store_blob, write_blob_file
+from app.services.storage_maintenance import run_maintenance
+
+GRACE_S = 3600
+
+
+@pytest.fixture
+def storage_root(tmp_path):
+    return tmp_path / "storage"
+
+
+def _age(db, storage_root, sha256: str, rel_path: str) -> None:
+    """Backdate a blob's row and file past the grace period."""
+    old = datetime.now(timezone.utc) - timedelta(seconds=2 * GRACE_S)
+    db.execute(update(StorageBlob).where(StorageBlob.sha256 == sha256).values(created_at=old))
+    db.commit()
+    stamp = time.time() - 2 * GRACE_S
+    os.utime(storage_root / rel_path, (stamp, stamp))
+
+
+def _blob(db, storage_root, data: bytes) -> tuple[str, str]:
+    sha256, rel_path = store_blob(db, storage_root, data)
+    db.commit()
+    return sha256, rel_path
+
+
+def test_referenced_blob_is_kept(db, project, storage_root):
+    data = os.urandom(256)
+    sha256, rel_path = _blob(db, storage_root, data)
+    db.add(
+        CoverImage(
+            project_id=project.id,
+            prompt="rain",
+            model="stub-image",
+            size="1024x1536",
+            image_path=rel_path,
+            content_hash=sha256,
+            image_bytes=len(data),
+        )
+    )
+    db.commit()
+    _age(db, storage_root, sha256, rel_path)
+    # a stale count must not matter: the image row is what protects the blob
+    db.execute(update(StorageBlob).where(StorageBlob.sha256 == sha256).values(ref_count=0))
+    db.commit()
+
+    report = run_maintenance(db, storage_root, apply=True, max_files=None, grace_seconds=GRACE_S)
+
+    assert report.orphans_found == 0
+    assert (storage_root / rel_path).read_bytes() == data
+    assert db.get(StorageBlob, sha256).ref_count == 1
+
+
+def test_unreferenced_blob_is_collected(db, storage_root):
+    # ref_count still says 1, as after a project cascade removed the image
+    sha256, rel_path = _blob(db, storage_root, os.urandom(256))
+    _age(db, storage_root, sha256, rel_path)
+
+    run_maintenance(db, storage_root, apply=False, max_files=None, grace_seconds=GRACE_S)
+    assert (storage_root / rel_path).exists()
+
+    report = run_maintenance(db, storage_root, apply=True, max_files=None, grace_seconds=GRACE_S)
+
+    assert report.blobs_collected >= 1
+    assert not (storage_root / rel_path).exists()
+    db.expire_all()
+    assert db.get(StorageBlob, sha256) is None
+
+
+def test_in_flight_writes_are_not_collected(db, storage_root):
+    # blob row and file written, image row not committed yet
+    sha256, rel_path = _blob(db, storage_root, os.urandom(256))
+    # file written, blob row not committed yet
+    pending = os.urandom(256)
+    pending_path = blob_rel_path(content_hash(pending))
+    write_blob_file(storage_root, pending_path, pending)
+    # an old temp file from an interrupted write is also skipped
+    tmp = storage_root / f"{pending_path}.123.tmp"
+    tmp.write_bytes(pending)
+    os.utime(tmp, (time.time() - 2 * GRACE_S,) * 2)
+
+    report = run_maintenance(db, storage_root, apply=True, max_files=None, grace_seconds=GRACE_S)
+
+    assert report.orphans_found == 0
+    assert (storage_root / rel_path).exists()
+    assert db.get(StorageBlob, sha256) is not None
+    assert (storage_root / pending_path).read_bytes() == pending
+    assert tmp.exists()
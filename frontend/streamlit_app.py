@@ -1,4 +1,5 @@
 import os
+import uuid
 import requests
 import streamlit as st
 from dotenv import load_dotenv
@@ -27,8 +28,30 @@ def api_headers() -> dict:
 def api_get(path: str, *, timeout: int = 30):
     return requests.get(f"{API_BASE}{path}", timeout=timeout, headers=api_headers())
 
-def api_post(path: str, payload: dict, *, timeout: int = 30):
-    return requests.post(f"{API_BASE}{path}", json=payload, timeout=timeout, headers=api_headers())
+def api_post(path: str, payload: dict, *, timeout: int = 30, idempotency_key: str | None = None):
+    headers = api_headers()
+    # the backend stops upstream work we would no longer wait for
+    headers["X-Request-Timeout"] = str(timeout)
+    if idempotency_key:
+        headers["Idempotency-Key"] = idempotency_key
+    return requests.post(f"{API_BASE}{path}", json=payload, timeout=timeout, headers=headers)
+
+def api_delete(path: str, *, timeout: int = 30):
+    return requests.delete(f"{API_BASE}{path}", timeout=timeout, headers=api_headers())
+
+def idempotency_key(action: str) -> str:
+    """
+    One key per logical action, kept across reruns/double clicks so the backend
+    replays (or joins) the first request instead of paying for another model call.
+    Rotated once the action succeeds.
+    """
+    state_key = f"idem_{action}"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = str(uuid.uuid4())
+    return st.session_state[state_key]
+
+def rotate_idempotency_key(action: str) -> None:
+    st.session_state.pop(f"idem_{action}", None)
 
 @st.cache_data(ttl=5)
 def fetch_projects(use_real_openai_flag: bool):
@@ -143,6 +166,12 @@ with col_b:
             format_func=lambda i: labels[i],
         )
         selected_project = projects[selected_idx]
+        if selected_project["id"] != current_id:
+            # moving away: drop previews still queued for the old project's last brief
+            try:
+                api_delete(f"/cover/speculative/{current_id}", timeout=5)
+            except requests.RequestException:
+                pass
         st.session_state.project_id = selected_project["id"]
         st.session_state.selected_project = selected_project
 
@@ -158,6 +187,11 @@ with col_b:
             }
         )
 
+        st.link_button(
+            "Download project export (ZIP)",
+            f"{API_BASE}/projects/{selected_project['id']}/export.zip",
+        )
+
         if st.button("Refresh projects list"):
             refresh_projects_cache()
             st.rerun()
@@ -181,6 +215,17 @@ else:
     comps = st.text_input("Comparable titles (comma-separated)", "")
     constraints = st.text_input("Constraints (comma-separated)", "thumbnail readable, genre-appropriate")
     blurb = st.text_area("Blurb (optional)", "")
+    speculative = st.checkbox(
+        "Pre-generate previews",
+        value=False,
+        help="Start cheap previews for the top directions in the background while you read the brief.",
+    )
+    parallel_calls = st.selectbox(
+        "Parallel calls",
+        [1, 2, 3],
+        index=0,
+        help="Split the six directions over several smaller concurrent requests: faster, slightly more tokens.",
+    )
 
     if st.button("Generate cover directions"):
         payload = {
@@ -193,16 +238,19 @@ else:
             "tone_words": [t.strip() for t in tone.split(",") if t.strip()],
             "comps": [c.strip() for c in comps.split(",") if c.strip()],
             "constraints": [c.strip() for c in constraints.split(",") if c.strip()],
+            "speculative_previews": speculative,
+            "parallel_calls": parallel_calls,
         }
 
         missing = [k for k in ("title", "author", "genre") if not payload[k]]
         if missing:
             st.error(f"Missing required fields: {', '.join(missing)}")
         else:
-            r = api_post("/cover/brief", payload, timeout=180)
+            r = api_post("/cover/brief", payload, timeout=180, idempotency_key=idempotency_key(f"brief_{project_id}"))
             if r.status_code != 200:
                 st.error(f"API error {r.status_code}: {r.text}")
             else:
+                rotate_idempotency_key(f"brief_{project_id}")
                 data = r.json()
                 st.caption(f"Model: {data.get('model')}")
                 st.success("Brief generated (and saved to history).")
@@ -210,6 +258,200 @@ else:
 
 # ---- Brief History + Generate Images --------------------------------------
 
+HISTORY_PAGE_SIZE = 10
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_brief_directions(project_id: str, run_id: str) -> list[dict] | None:
+    # a saved run never changes, so its directions are fetched once per run
+    r = requests.get(f"{API_BASE}/projects/{project_id}/brief-runs/{run_id}/directions", timeout=30)
+    return r.json() if r.status_code == 200 else None
+
+
+def render_directions(project_id: str, run_id: str, directions: list[dict], images: list[dict]) -> None:
+    st.subheader("Directions")
+
+    top_cols = st.columns([1, 1, 1, 2])
+    with top_cols[0]:
+        n_images = st.selectbox(
+            "Images per direction",
+            [1, 2, 3, 4],
+            index=1,
+            key=f"n_{run_id}",
+        )
+    with top_cols[1]:
+        size = st.selectbox(
+            "Size",
+            ["1024x1536", "1024x1024", "1536x1024"],
+            index=0,
+            key=f"size_{run_id}",
+        )
+    with top_cols[2]:
+        preview_mode = st.checkbox(
+            "Preview first",
+            value=True,
+            key=f"preview_{run_id}",
+            help="Fast, low-quality previews; finalize only the ones you like at full size.",
+        )
+    with top_cols[3]:
+        st.caption("Tip: 1024x1536 is a good portrait starting point for cover-ish backgrounds.")
+
+    # previews pre-generated in the background after the brief, by direction
+    # (the run's image thumbnails come with the dashboard page)
+    speculative: dict[int, list[dict]] = {}
+    for img in images:
+        if img.get("tier") == "speculative" and img.get("direction_index") is not None:
+            speculative.setdefault(img["direction_index"], []).append(img)
+
+    for i, d in enumerate(directions):
+        st.markdown(f"### {i + 1}. {d.get('name','(untitled)')}")
+        st.write(d.get("one_liner", ""))
+
+        prompt = d.get("image_prompt", "").strip()
+        if prompt:
+            st.markdown("**Image prompt (background only)**")
+            st.code(prompt)
+
+        btn_cols = st.columns([1, 3])
+        with btn_cols[0]:
+            clicked = st.button(
+                "Generate images",
+                key=f"gen_{run_id}_{i}",
+                disabled=not bool(prompt),
+            )
+        with btn_cols[1]:
+            st.caption("Generates background art and saves it to this project.")
+
+        if clicked:
+            payload = {
+                "project_id": project_id,
+                "brief_run_id": run_id,
+                "direction_index": i,
+                "prompt": prompt,
+                "n": n_images,
+                "preview": preview_mode,
+            }
+            if not preview_mode:
+                payload["size"] = size
+            action = f"image_{run_id}_{i}"
+            resp = api_post("/cover/image", payload, timeout=300, idempotency_key=idempotency_key(action))
+            if resp.status_code != 200:
+                st.error(f"API error {resp.status_code}: {resp.text}")
+            else:
+                rotate_idempotency_key(action)
+                data = resp.json()
+                imgs = data.get("images", [])
+                if not imgs:
+                    st.warning("No images returned.")
+                elif preview_mode:
+                    # kept across reruns so the Finalize buttons below stay usable
+                    st.session_state[f"previews_{run_id}_{i}"] = imgs
+                else:
+                    urls = [f"{API_BASE}{img['image_url']}" for img in imgs]
+                    st.image(urls, width=220)
+                    st.success("Saved. (Images are now in Postgres + local storage.)")
+
+        previews = speculative.get(i, []) + st.session_state.get(f"previews_{run_id}_{i}", [])
+        if previews:
+            st.caption("Previews — finalize the ones worth keeping at full size.")
+            prev_cols = st.columns(len(previews))
+            for col, img in zip(prev_cols, previews):
+                with col:
+                    st.image(f"{API_BASE}{img['image_url']}", width=200)
+                    if st.button("Finalize", key=f"finalize_{img['id']}"):
+                        action = f"finalize_{img['id']}"
+                        resp = api_post(
+                            f"/cover/image/{img['id']}/finalize",
+                            {"size": size},
+                            timeout=300,
+                            idempotency_key=idempotency_key(action),
+                        )
+                        if resp.status_code != 200:
+                            st.error(f"API error {resp.status_code}: {resp.text}")
+                        else:
+                            rotate_idempotency_key(action)
+                            st.image(f"{API_BASE}{resp.json()['image_url']}", width=200)
+                            st.success("Finalized and saved.")
+
+        st.divider()
+
+
+@st.fragment
+def brief_run_fragment(project_id: str, run: dict) -> None:
+    """One run; its widgets rerun only this fragment, not the whole history."""
+    run_id = run["id"]
+    names = run.get("direction_names") or []
+
+    with st.container(border=True):
+        created_at = safe_ts(run.get("created_at"))
+        st.markdown(f"**{created_at} — {run.get('status')} — {run.get('model')}**")
+        if run.get("error_message"):
+            st.error(run["error_message"])
+        if not names:
+            st.caption("No directions stored in this run.")
+            return
+        st.caption(" · ".join(names))
+
+        # st.expander can't report being opened, so a toggle gates the details fetch
+        if not st.toggle(f"Show {len(names)} direction(s)", key=f"open_{run_id}"):
+            return
+
+        directions = fetch_brief_directions(project_id, run_id)
+        if directions is None:
+            st.error("Failed to load this run.")
+            return
+        render_directions(project_id, run_id, directions, run.get("images") or [])
+
+
+def _set_history_page(project_id: str, page: int) -> None:
+    st.session_state[f"history_page_{project_id}"] = page
+
+
+@st.fragment
+def brief_history_fragment(project_id: str) -> None:
+    """A page of run summaries (no direction JSON); paging reruns only this fragment."""
+    page = st.session_state.get(f"history_page_{project_id}", 0)
+    # one round trip: run summaries + each run's image thumbnails
+    r = api_get(
+        f"/projects/{project_id}/dashboard?runs_limit={HISTORY_PAGE_SIZE}&runs_offset={page * HISTORY_PAGE_SIZE}"
+        "&tier=speculative",
+        timeout=30,
+    )
+    if r.status_code != 200:
+        st.error(f"Failed to load brief runs ({r.status_code}): {r.text}")
+        return
+
+    data = r.json()["brief_runs"]
+    total = data["total"]
+    if not total:
+        st.info("No brief runs yet. Generate a brief to start history.")
+        return
+
+    pages = max(1, -(-total // HISTORY_PAGE_SIZE))
+    nav = st.columns([1, 1, 4])
+    with nav[0]:
+        st.button(
+            "◀ Newer",
+            key=f"hist_prev_{project_id}",
+            disabled=page == 0,
+            on_click=_set_history_page,
+            args=(project_id, page - 1),
+        )
+    with nav[1]:
+        st.button(
+            "Older ▶",
+            key=f"hist_next_{project_id}",
+            disabled=page >= pages - 1,
+            on_click=_set_history_page,
+            args=(project_id, page + 1),
+        )
+    with nav[2]:
+        st.caption(f"{total} run(s) — page {page + 1} of {pages}")
+
+    for run in data["runs"]:
+        brief_run_fragment(project_id, run)
+
+
 st.header("Brief history")
 
 project_id = st.session_state.get("project_id")
@@ -217,92 +459,7 @@ project_id = st.session_state.get("project_id")
 if not project_id:
     st.info("Select a project to view brief history.")
 else:
-    r = api_get(f"/projects/{project_id}/brief-runs", timeout=30)
-    if r.status_code != 200:
-        st.error(f"Failed to load brief runs ({r.status_code}): {r.text}")
-    else:
-        runs = r.json()
-        if not runs:
-            st.info("No brief runs yet. Generate a brief to start history.")
-        else:
-            st.caption(f"{len(runs)} run(s)")
-
-            for run in runs:
-                run_id = run["id"]
-                created_at = safe_ts(run.get("created_at"))
-                run_title = f"{created_at} — {run.get('status')} — {run.get('model')}"
-
-                with st.expander(run_title, expanded=False):
-                    if run.get("error_message"):
-                        st.error(run["error_message"])
-
-                    directions = run.get("response_json", {}).get("directions", [])
-                    if not directions:
-                        st.write("No directions stored in this run.")
-                        continue
-
-                    st.subheader("Directions")
-
-                    top_cols = st.columns([1, 1, 2])
-                    with top_cols[0]:
-                        n_images = st.selectbox(
-                            "Images per direction",
-                            [1, 2, 3, 4],
-                            index=1,
-                            key=f"n_{run_id}",
-                        )
-                    with top_cols[1]:
-                        size = st.selectbox(
-                            "Size",
-                            ["1024x1536", "1024x1024", "1536x1024"],
-                            index=0,
-                            key=f"size_{run_id}",
-                        )
-                    with top_cols[2]:
-                        st.caption("Tip: 1024x1536 is a good portrait starting point for cover-ish backgrounds.")
-
-                    for i, d in enumerate(directions):
-                        st.markdown(f"### {i + 1}. {d.get('name','(untitled)')}")
-                        st.write(d.get("one_liner", ""))
-
-                        prompt = d.get("image_prompt", "").strip()
-                        if prompt:
-                            st.markdown("**Image prompt (background only)**")
-                            st.code(prompt)
-
-                        btn_cols = st.columns([1, 3])
-                        with btn_cols[0]:
-                            clicked = st.button(
-                                "Generate images",
-                                key=f"gen_{run_id}_{i}",
-                                disabled=not bool(prompt),
-                            )
-                        with btn_cols[1]:
-                            st.caption("Generates background art and saves it to this project.")
-
-                        if clicked:
-                            payload = {
-                                "project_id": project_id,
-                                "brief_run_id": run_id,
-                                "direction_index": i,
-                                "prompt": prompt,
-                                "n": n_images,
-                                "size": size,
-                            }
-                            resp = api_post("/cover/image", payload, timeout=300)
-                            if resp.status_code != 200:
-                                st.error(f"API error {resp.status_code}: {resp.text}")
-                            else:
-                                data = resp.json()
-                                imgs = data.get("images", [])
-                                if not imgs:
-                                    st.warning("No images returned.")
-                                else:
-                                    urls = [f"{API_BASE}{img['image_url']}" for img in imgs]
-                                    st.image(urls, width=220)
-                                    st.success("Saved. (Images are now in Postgres + local storage.)")
-
-                        st.divider()
+    brief_history_fragment(project_id)
 
 # ---- Project image gallery (v1) -------------------------------------------
 
@@ -312,22 +469,35 @@ project_id = st.session_state.get("project_id")
 if not project_id:
     st.info("Select a project to see its images.")
 else:
-    r = api_get(f"/projects/{project_id}/images", timeout=30)
-    if r.status_code != 200:
+    # One contact sheet (grid of thumbnails rendered server-side) per page,
+    # instead of one request + full-size PNG decode per image.
+    page = int(st.session_state.get(f"sheet_page_{project_id}", 0))
+    r = api_get(f"/projects/{project_id}/contact-sheet?page={page}", timeout=60)
+    if r.status_code == 404 and page > 0:
+        st.session_state[f"sheet_page_{project_id}"] = 0
+        st.rerun()
+    elif r.status_code != 200:
         st.error(f"Failed to load images ({r.status_code}): {r.text}")
     else:
-        images = r.json()
-        if not images:
+        sheet = r.json()
+        if not sheet.get("total"):
             st.write("No images yet.")
         else:
-            cols = st.columns(3)
-            for i, img in enumerate(images):
-                url = f"{API_BASE}{img['image_url']}"
-                created_at = safe_ts(img.get("created_at"))
-                direction = img.get("direction_index")
-                caption_parts = [created_at] if created_at else []
-                if direction is not None:
-                    caption_parts.append(f"Direction {direction + 1}")
-                caption = " - ".join(caption_parts) if caption_parts else None
-                with cols[i % len(cols)]:
-                    st.image(url, caption=caption, width=220)
+            st.caption(f"{sheet['total']} image(s) — page {sheet['page'] + 1} of {sheet['pages']}")
+            if sheet["pages"] > 1:
+                st.number_input(
+                    "Page",
+                    min_value=1,
+                    max_value=sheet["pages"],
+                    value=sheet["page"] + 1,
+                    key=f"sheet_page_input_{project_id}",
+                    on_change=lambda pid=project_id: st.session_state.update(
+                        {f"sheet_page_{pid}": st.session_state[f"sheet_page_input_{pid}"] - 1}
+                    ),
+                )
+            st.image(f"{API_BASE}{sheet['sheet_url']}", width=sheet["width"])
+
+            with st.expander("Image ids on this page", expanded=False):
+                cols_per_row = max(1, sheet["cols"])
+                for i, cell in enumerate(sheet["cells"]):
+                    st.caption(f"Row {i // cols_per_row + 1}, col {i % cols_per_row + 1}: {cell['image_id']}")